@@ -0,0 +1,221 @@
+# =======================================================================
+# ASGI Application
+# =======================================================================
+# The web app for ASGI servers (uvicorn, hypercorn, gunicorn with uvicorn
+# workers):
+#
+#     uvicorn assistant.asgi:app --port 5000
+#     python -m assistant.serve --asgi
+#
+# POST /api/chat is answered natively on the event loop with
+# get_response_async(): dictionary lookups wait on the async HTTP client
+# instead of a thread, so thousands of conversations stuck on a slow
+# dictionary API cost no thread each. Its time is recorded in the same
+# ava_http_request_seconds{route="/api/chat"} histogram as the Flask route.
+# Every other route (the page, /api/chat/batch, /api/tasks, ...) is the
+# Flask app from assistant/web.py, run on a bounded thread pool
+# (AVA_THREADS threads, default 8) through a small WSGI bridge. Streamed
+# responses (NDJSON task lists) stay streamed.
+# =======================================================================
+
+import asyncio  # Event loop: run blocking work on the thread pool
+import io       # Request body as the WSGI input stream
+import json     # /api/chat bodies
+import sys      # wsgi.errors stream
+import time     # /api/chat timing for the metrics
+from concurrent.futures import ThreadPoolExecutor  # Threads for the blocking parts
+
+from assistant import metrics
+from assistant.config import env_int
+from assistant.features.dictionary import close_async_client
+from assistant.web import chat_reply_async, create_app
+
+JSON_HEADERS = [(b"content-type", b"application/json")]
+
+
+# ===============================
+# CLASS: ASGIApp
+# ===============================
+class ASGIApp:
+    """
+    ASGI application serving /api/chat natively and the rest through Flask.
+
+    Args:
+        wsgi_app: The Flask app (see assistant.web.create_app()).
+        threads (int): Size of the thread pool for blocking work.
+    """
+
+    def __init__(self, wsgi_app, threads: int = 8):
+        self.wsgi_app = wsgi_app
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="ava-asgi")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return  # no websockets: the server closes the connection
+
+        body = await _read_body(receive)
+        if scope["method"] == "POST" and scope["path"] == "/api/chat":
+            await self._chat(scope, body, send)
+        else:
+            await self._wsgi(scope, body, send)
+
+    async def _run(self, fn, *args):
+        """Run a blocking call on the thread pool."""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    # ---------- /api/chat ----------
+    async def _chat(self, scope, body: bytes, send):
+        start = time.perf_counter() if metrics.ENABLED else None
+        try:
+            await self._chat_reply(scope, body, send)
+        finally:
+            if start is not None:
+                metrics.HTTP_SECONDS.observe(time.perf_counter() - start, "/api/chat")
+
+    async def _chat_reply(self, scope, body: bytes, send):
+        # Same checks and replies as the Flask route in assistant/web.py
+        content_type = _header(scope, b"content-type").split(";")[0].strip().lower()
+        if content_type != "application/json" and not content_type.endswith("+json"):
+            await _send_json(send, 415, {"error": "Content-Type must be application/json"})
+            return
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            payload = None
+        data, status = await chat_reply_async(payload)
+        await _send_json(send, status, data)
+
+    # ---------- everything else: the Flask app ----------
+    async def _wsgi(self, scope, body: bytes, send):
+        environ = _environ(scope, body)
+        started = {}
+
+        def start_response(status, headers, exc_info=None):
+            started["status"] = int(status.split(" ", 1)[0])
+            started["headers"] = [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers]
+
+        def call():
+            result = self.wsgi_app(environ, start_response)
+            return result, iter(result)
+
+        result, chunks = await self._run(call)
+        try:
+            # The first chunk is produced before the headers are sent, so a
+            # generator that calls start_response lazily still works
+            first = await self._run(next, chunks, None)
+            await send({"type": "http.response.start", "status": started["status"], "headers": started["headers"]})
+            chunk = first
+            while chunk is not None:
+                if chunk:
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+                chunk = await self._run(next, chunks, None)
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            if hasattr(result, "close"):
+                await self._run(result.close)
+
+    # ---------- startup/shutdown ----------
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await close_async_client()
+                self.executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+# ===============================
+# Helpers
+# ===============================
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            break
+    return b"".join(chunks)
+
+
+def _header(scope, name: bytes) -> str:
+    for key, value in scope["headers"]:
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return ""
+
+
+async def _send_json(send, status: int, data: dict):
+    body = json.dumps(data).encode("utf-8")
+    await send({"type": "http.response.start", "status": status, "headers": JSON_HEADERS})
+    await send({"type": "http.response.body", "body": body})
+
+
+def _environ(scope, body: bytes) -> dict:
+    """The WSGI environ (PEP 3333) of an ASGI HTTP request."""
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        # WSGI strings are bytes decoded as latin-1
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": str(server[0]),
+        "SERVER_PORT": str(server[1]),
+        "REMOTE_ADDR": str(client[0]),
+        "SERVER_PROTOCOL": "HTTP/" + scope.get("http_version", "1.1"),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for key, value in scope["headers"]:
+        name = key.decode("latin-1").upper().replace("-", "_")
+        if name not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            name = "HTTP_" + name
+        value = value.decode("latin-1")
+        environ[name] = environ[name] + "," + value if name in environ else value
+    # The whole body has been read already (it may have come chunked)
+    environ["CONTENT_LENGTH"] = str(len(body))
+    return environ
+
+
+# ===============================
+# App factory
+# ===============================
+def create_asgi_app(wsgi_app=None, threads: int = None) -> ASGIApp:
+    """
+    Build the ASGI app.
+
+    Args:
+        wsgi_app: The Flask app to serve the other routes (default: create_app()).
+        threads (int, optional): Thread pool size (default AVA_THREADS or 8).
+    """
+    if wsgi_app is None:
+        wsgi_app = create_app()
+    return ASGIApp(wsgi_app, threads or env_int("AVA_THREADS", 8))
+
+
+_app = None
+
+
+def __getattr__(name):
+    # `assistant.asgi:app` is built on first access, so importing this module
+    # (e.g. from assistant/serve.py) does not start the app's background jobs
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = create_asgi_app()
+        return _app
+    raise AttributeError(name)
@@ -9,15 +9,20 @@
 # - Returning appropriate bot responses
 # =======================================================================
 
-import random  # Used to randomly select a reply from a list of responses
-import re      # Used to define regex patterns and search text
-from difflib import get_close_matches  # Used for typo-tolerance (e.g., "helo" -> "hello")
+import asyncio  # Async pipeline: get_response_async()
+import random   # Used to randomly select a reply from a list of responses
 
 # Import dictionary, calculator and todo features from assistant/features package.
 # These are functions that live in other files and are re-used here.
-from assistant.features.dictionary import get_meaning
+from assistant.features.dictionary import get_meaning, get_meaning_async
 from assistant.features.calculator import evaluate
-from assistant.features.todo import add_task, get_tasks, remove_task, mark_done
+from assistant.features.todo import add_task, format_task, get_tasks_page, page_size, remove_task, mark_done
+from assistant.corpus import IntentWatcher, corpus_path, load_index  # Intents corpus file + hot reload
+from assistant.intent_index import IntentIndex  # Intent matching + typo-tolerance (e.g., "helo" -> "hello")
+from assistant.router import Message, router  # Picks which feature answers a message
+from assistant import metrics  # Per-stage timings and answer counts (AVA_METRICS)
+# Precompiled detectors: normalize text, extract the word / expression / todo command
+from assistant.grammar import calculator_expression, dictionary_word, has_operator, normalize, todo_command
 
 
 # =======================================================================
@@ -27,179 +32,39 @@ from assistant.features.todo import add_task, get_tasks, remove_task, mark_done
 # Each intent has:
 #   - "patterns": example user phrases we want to recognize
 #   - "responses": replies the assistant will randomly pick from
-# NOTE: We keep this data-driven so the matching logic below is generic.
-intents = {
-    # ---------------- Small Talk ----------------
-    "greet": {
-        # patterns -> list of example phrases that signal a greeting intent
-        "patterns": [
-            "hi", "hello", "hey", "good morning", "good evening",
-            "morning", "gm", "good afternoon", "afternoon",
-            "good night", "night", "hiya", "yo", "sup",
-            "hey there", "what’s up", "whats up", "wassup", "wazzup",
-            "long time no see", "nice to meet you", "pleased to meet you",
-            "howdy", "greetings", "salutations",
-            "hola", "bonjour", "namaste", "salaam", "ciao", "aloha",
-            "hiya buddy", "hi assistant", "hello friend", "yo assistant",
-            "are you there", "anyone there", "knock knock", "hi bot",
-            "hello ai", "hello there", "hi there"
-        ],
-        # responses -> possible replies the bot can use for this intent
-        "responses": [
-            "Hello! How can I help you today?",
-            "Hey there!",
-            "Hi, what’s up?",
-            "Hello friend! How are you doing?",
-            "Greetings! How may I help?",
-            "Hi there, nice to see you!",
-            "Hey! I’m here to assist you."
-        ]
-    },
-
-    "goodbye": {
-        # patterns to recognize user saying goodbye
-        "patterns": [
-            "bye", "goodbye", "see you", "see ya", "later",
-            "talk to you later", "catch you later", "farewell",
-            "take care", "see you soon", "bye bye",
-            "good night", "nighty night", "adios", "ciao"
-        ],
-        # possible responses when user says goodbye
-        "responses": [
-            "Goodbye!",
-            "See you later!",
-            "Bye! Take care.",
-            "Catch you later!",
-            "Farewell, friend!",
-            "Bye bye 👋"
-        ]
-    },
-
-    "thanks": {
-        # patterns for gratitude
-        "patterns": [
-            "thanks", "thank you", "thx", "ty", "thanks a lot",
-            "thank you very much", "many thanks", "appreciate it",
-            "thanks so much", "cheers", "much obliged"
-        ],
-        # responses to say when user thanks the bot
-        "responses": [
-            "You're welcome!",
-            "Glad I could help!",
-            "Anytime!",
-            "No problem at all!",
-            "My pleasure!",
-            "Don’t mention it 🙂"
-        ]
-    },
-
-    "how_are_you": {
-        # patterns asking how bot is doing
-        "patterns": [
-            "how are you", "how are you doing", "how’s it going",
-            "how do you do", "you good", "are you okay",
-            "what’s up with you", "how have you been"
-        ],
-        # responses describing bot state
-        "responses": [
-            "I’m doing great! How about you?",
-            "I’m fine, thanks for asking.",
-            "I’m feeling awesome today!",
-            "I’m all good — ready to help you!",
-            "I’m doing well, how are you doing?"
-        ]
-    },
-
-    "who_are_you": {
-        # patterns where user asks identity of the bot
-        "patterns": [
-            "who are you", "what are you", "what is your name",
-            "who am i talking to", "identify yourself"
-        ],
-        # responses telling who the bot is
-        "responses": [
-            "I’m your AI Virtual Assistant 🤖",
-            "I’m Ava, your personal AI helper!",
-            "I’m your assistant, here to chat and help you."
-        ]
-    },
-
-    "feelings": {
-        # patterns where user share feelings or mood
-        "patterns": [
-            "i am sad", "i feel lonely", "i’m happy", "i am excited",
-            "i feel bored", "i’m angry", "i feel nervous",
-            "i feel good", "i feel great"
-        ],
-        # responses that show empathy or encouragement
-        "responses": [
-            "I hear you. Do you want to talk about it?",
-            "That’s great to hear! 🎉",
-            "I’m here for you whenever you need me.",
-            "It’s okay to feel that way sometimes.",
-            "I’m glad you’re sharing your feelings with me."
-        ]
-    },
-
-    "compliment": {
-        # patterns indicating the user complimented the bot
-        "patterns": [
-            "you are smart", "you are nice", "you are awesome",
-            "you are cool", "you are funny", "you are helpful",
-            "good job", "well done"
-        ],
-        # friendly, grateful responses to compliments
-        "responses": [
-            "Aww, thank you! 😊",
-            "That means a lot!",
-            "Glad you think so!",
-            "You’re awesome too!"
-        ]
-    },
-
-    "insult": {
-        # patterns where user insults the bot
-        "patterns": [
-            "you are stupid", "you are dumb", "you are useless",
-            "you are bad", "you are annoying", "you are boring"
-        ],
-        # calm, non-escalating responses to insults
-        "responses": [
-            "That’s not very nice 😔",
-            "I’m still learning, please be patient with me.",
-            "I’m sorry you feel that way."
-        ]
-    },
-}
+# NOTE: The intents live in a corpus file (assistant/data/intents.json by
+# default, see assistant/corpus.py) so they can be edited without a redeploy.
+#
+# The corpus is turned into an IntentIndex (matcher + fuzzy indexes + reverse
+# maps). Every pattern is wrapped with word-boundaries (\b) so "hi" matches
+# "hi" but not "ship", and all patterns are compiled into one combined regex.
+# The built index is cached on disk by corpus hash, so a restart with the
+# same corpus does not rebuild it (see assistant/corpus.py).
+_index = load_index()
+intents = _index.intents
+
+
+def _install_index(new_index: IntentIndex):
+    """
+    Swap in a new intent index with a single assignment.
+    A message being answered right now keeps using the index it grabbed at
+    the start of get_response(), so in-flight requests are never disturbed.
+    """
+    global intents, _index
+    intents, _index = new_index.intents, new_index
 
 
-# =======================================================================
-# Precompile regex patterns for speed
-# =======================================================================
-# Converting simple patterns into compiled regex objects makes matching faster.
-# We wrap each pattern with word-boundaries (\b) so "hi" matches "hi" but not "ship".
-_compiled_intents = {
-    intent: {
-        # For each plain pattern string, create a case-insensitive regex like r"\bhello\b"
-        "patterns": [re.compile(rf"\b{re.escape(p)}\b", re.IGNORECASE) for p in data["patterns"]],
-        # Keep responses as-is
-        "responses": data["responses"]
-    }
-    for intent, data in intents.items()
-}
+def reload_intents(new_intents: dict):
+    """Replace the intents at runtime (hot reload) from a dict."""
+    _install_index(IntentIndex(new_intents))
 
 
-# =======================================================================
-# Build dictionary for typo tolerance
-# =======================================================================
-# This mapping collects single-word patterns and the intent they belong to.
-# It is used later with difflib.get_close_matches to tolerate typos like "helo".
-_single_word_to_intent = {}
-for intent, data in intents.items():
-    for p in data["patterns"]:
-        # Only consider single-word patterns (no spaces) for this simple typo handling
-        if " " not in p:
-            _single_word_to_intent[p] = intent
+def start_intent_watcher(interval: float = 2.0) -> IntentWatcher:
+    """
+    Watch the corpus file in a background thread and hot-reload the intents
+    whenever it changes. Returns the watcher (call .stop() to end it).
+    """
+    return IntentWatcher(corpus_path(), _install_index, interval).start()
 
 
 # =======================================================================
@@ -218,239 +83,265 @@ _fallback_responses = [
 
 
 # =======================================================================
-# Helper Function: Normalize text
+# Built-in features, registered on the message router
 # =======================================================================
-def _normalize(s: str) -> str:
-    """
-    Clean the input text:
-    - Lowercase the string
-    - Remove punctuation and special characters (keeps letters/numbers/spaces)
-    - Trim leading/trailing whitespace
-    Example: "Hello!!" -> "hello"
-    """
-    # re.sub replaces any char not a-z,0-9 or whitespace with empty string
-    return re.sub(r"[^a-z0-9\s]+", "", s.lower()).strip()
+# Priorities keep the original order: intents, dictionary, calculator,
+# todo, then fuzzy matching. Keywords/probes only skip a handler when it
+# could not match the message anyway.
+
+
+@router.route("intents", priority=10)
+def _answer_intent(msg: Message):
+    # Explicit intents first (one scan over the message)
+    intent = msg.index.match(msg.text)
+    if intent:
+        # If matched, return a random response from that intent
+        return random.choice(msg.index.responses(intent))
+    return None
+
+
+async def _answer_dictionary_async(msg: Message):
+    # Same as _answer_dictionary(), but msg.lookup is awaited (non-blocking I/O)
+    word = dictionary_word(msg.normalized)
+    if word:
+        meaning = await msg.lookup(word)
+        return meaning if meaning else f"Sorry, I couldn’t find the meaning of '{word}'."
+    return None
+
+
+@router.route("dictionary", priority=20,
+              probe=lambda msg: "mean" in msg.normalized or "defin" in msg.normalized,
+              async_handler=_answer_dictionary_async)
+def _answer_dictionary(msg: Message):
+    # Dictionary lookup detection (e.g., "meaning of umbrella")
+    word = dictionary_word(msg.normalized)
+    if word:
+        # lookup (normally get_meaning) calls the dictionary feature and returns a string
+        meaning = msg.lookup(word)
+        # If meaning exists return it, otherwise inform user it wasn't found
+        return meaning if meaning else f"Sorry, I couldn’t find the meaning of '{word}'."
+    return None
+
+
+@router.route("calculator", priority=30, probe=lambda msg: has_operator(msg.lower))
+def _answer_calculator(msg: Message):
+    # Calculator detection (e.g., "2 + 2" or "what is 5+7"); needs an operator
+    expr = calculator_expression(msg.lower)
+    if expr:
+        # evaluate runs the safe-eval logic in features/calculator.py
+        result = evaluate(expr)
+        return f"The result is: {result}"
+    return None
+
+
+async def _answer_todo_async(msg: Message):
+    # A todo change writes (and fsyncs) the task store: do it in a worker
+    # thread so the event loop keeps serving other messages meanwhile
+    if todo_command(msg.lower) is None:
+        return None
+    return await asyncio.to_thread(_answer_todo, msg)
+
+
+@router.route("todo", priority=40, keywords=("add", "show", "remove", "mark"),
+              async_handler=_answer_todo_async)
+def _answer_todo(msg: Message):
+    # To-do commands (add/show/remove/mark done)
+    todo_cmd = todo_command(msg.lower)
+    if not todo_cmd:
+        return None
+    cmd, arg = todo_cmd
+    if cmd == "add":
+        # add_task returns a message string (success/error)
+        return add_task(arg)
+    elif cmd == "show":
+        # One page of tasks (long lists are never formatted in full)
+        status, page = arg
+        if page < 1:
+            return "Page numbers start at 1."
+        size = page_size()
+        result = get_tasks_page(status, limit=size, offset=(page - 1) * size)
+        label = f"{status} tasks" if status else "tasks"
+        if not result["tasks"]:
+            return f"No {label} found." if page == 1 else f"No {label} on page {page}."
+        # Format: "1. [Pending] Buy milk"
+        formatted = [format_task(t) for t in result["tasks"]]
+        if result["next"] is not None:
+            formatted.append(f"(more: say \"show {label} page {page + 1}\")")
+        # Join with newline so frontend can display multiple lines
+        return "\n".join(formatted)
+    elif cmd == "remove":
+        # remove_task in features expects an integer id OR the module may accept title;
+        # here we attempt numeric removal first; if arg is not numeric, try removing by title.
+        try:
+            # If arg looks like an integer string, convert and call remove_task(id)
+            task_id = int(arg)
+            return remove_task(task_id)
+        except Exception:
+            # Otherwise try to remove by title (string). Some implementations of remove_task
+            # accept title, but if not, you may need to implement that logic inside features.todo.
+            # For now call remove_task with arg and let the feature handle it or return "Task not found".
+            return remove_task(arg)
+    elif cmd == "done":
+        # Marking done. Try numeric id first.
+        try:
+            task_id = int(arg)
+            return mark_done(task_id)
+        except Exception:
+            # If arg was not numeric, attempt to find by title using tasks API (if supported there)
+            return mark_done(arg)
+    return None
+
+
+@router.route("fuzzy_word", priority=80)
+def _answer_fuzzy_word(msg: Message):
+    # Typos / fuzzy matching (single tokens)
+    for t in msg.normalized.split():
+        # suggest_word finds the nearest known single word for token t
+        suggestion = msg.index.suggest_word(t, 0.80)
+        if suggestion:
+            # If a close match was found, answer with that word's intent
+            word, intent = suggestion
+            return f"(Did you mean **{word}**?)\n{random.choice(msg.index.responses(intent))}"
+    return None
+
+
+@router.route("fuzzy_phrase", priority=90)
+def _answer_fuzzy_phrase(msg: Message):
+    # Typos / fuzzy matching on whole message (helps when multiple words)
+    suggestion = msg.index.suggest_phrase(msg.normalized, 0.75)
+    if suggestion:
+        # The phrase -> intent map tells us which intent owns the best pattern
+        phrase, intent = suggestion
+        return f"(Did you mean **{phrase}**?)\n{random.choice(msg.index.responses(intent))}"
+    return None
+
+
+# Time every stage while metrics are on (AVA_METRICS=1 or metrics.set_enabled())
+metrics.on_toggle(lambda enabled: router.instrument(metrics.observe_stage if enabled else None))
 
 
 # =======================================================================
-# Detect dictionary queries
+# MAIN FUNCTION: get_response()
 # =======================================================================
-def _is_dictionary_query(user_msg: str):
+def get_response(user_msg: str) -> str:
     """
-    Check if the user is asking for a meaning/definition.
-    Examples:
-      - "meaning of apple"
-      - "what does umbrella mean"
-      - "define car"
-      - "definition of computer"
-
-    If matched -> return the extracted word/phrase
-    Else -> return None
+    Main brain of the assistant.
+    Input: user message (string)
+    Output: chatbot reply (string)
     """
-    # regex patterns used to extract the target word/phrase
-    patterns = [
-        r"meaning of (.+)",
-        r"what does (.+) mean",
-        r"define (.+)",
-        r"definition of (.+)"
-    ]
-    for pat in patterns:
-        # search case-insensitively in the raw user_msg
-        match = re.search(pat, user_msg, re.IGNORECASE)
-        if match:
-            # return the captured group (strip extra spaces)
-            return match.group(1).strip()
-    return None
+    # Grab the current intent index once, so a hot reload in the middle of this
+    # message cannot mix two different versions of the intents
+    return _respond(user_msg, _index, get_meaning)
 
 
 # =======================================================================
-# Detect Calculator queries
+# BATCH FUNCTION: get_response_many()
 # =======================================================================
-def _is_calculator_query(user_msg_raw: str):
+def get_response_many(messages) -> list:
     """
-    Detect calculator queries from the raw (lowercased) message so operators remain.
-    Returns a clean math expression string or None.
-
-    Supports forms like:
-      - "what is 5+7"
-      - "calculate 12 * 8"
-      - "2 + 2"
+    Answer many messages in one call (used by the /api/chat/batch route).
+
+    Compared to calling get_response() in a loop, the whole batch:
+    - uses ONE intent index snapshot (a hot reload cannot split the batch)
+    - looks up each dictionary word only once ("define x" twice -> one fetch)
+    - prepares a repeated message (lowercase + normalize) only once
+
+    The handlers still run for every message: replies are picked at random
+    and todo commands change the list, so a repeated message is not simply
+    given the first answer again. Without repeats or dictionary words the
+    batch costs about the same per message as the loop; the speedup of
+    /api/chat/batch comes from making one HTTP request instead of many.
+
+    Input: list of user messages (strings)
+    Output: list of the same length, in the same order. Each item is the reply
+            string, or the Exception raised while answering that message (one
+            bad message never fails the rest of the batch).
     """
-    # Work on a lowercased version to make phrase detection simpler
-    msg = user_msg_raw.lower()
-
-    # 1) Phrasal queries that contain an expression after a verb
-    phrasal = [
-        r"^\s*what\s+is\s+(.+)$",
-        r"^\s*calculate\s+(.+)$",
-        r"^\s*solve\s+(.+)$",
-    ]
-    for pat in phrasal:
-        m = re.search(pat, msg)
-        if m:
-            # group(1) is the expression part after the phrase ("what is", etc.)
-            expr = m.group(1)
-            # Keep only characters that are valid in math expressions:
-            # digits, + - * / % . parentheses and spaces
-            expr = re.sub(r"[^0-9+\-*/%.()\s]", "", expr)
-            expr = expr.strip()
-            # Ensure there's at least one operator so plain numbers are not treated as expressions
-            if re.search(r"[+\-*/%]", expr):
-                return expr
-
-    # 2) If the whole message looks like a math expression (digits + ops + spaces)
-    if re.fullmatch(r"[0-9+\-*/%.()\s]+", msg):
-        # require at least one operator to avoid treating single numbers like "22" as expressions
-        if re.search(r"[+\-*/%]", msg):
-            return msg.strip()
-
-    # Not a calculator query
-    return None
+    index = _index
+    meanings = {}  # word -> meaning, shared by the whole batch
+    prepared = {}  # message text -> its Message (or the reply to an empty one)
+
+    def lookup(word):
+        if word not in meanings:
+            meanings[word] = get_meaning(word)
+        return meanings[word]
+
+    results = []
+    for user_msg in messages:
+        try:
+            message = prepared.get(user_msg)
+            if message is None:
+                message = prepared[user_msg] = _message(user_msg, index, lookup)
+            results.append(message if isinstance(message, str) else _dispatch(message))
+        except Exception as exc:
+            results.append(exc)
+    return results
 
 
 # =======================================================================
-# Detect To-DO queries
+# ASYNC FUNCTION: get_response_async()
 # =======================================================================
-def _is_todo_query(user_msg: str):
+async def get_response_async(user_msg: str) -> str:
     """
-    Returns a tuple (command, arg) if a todo command is detected:
-    - ("add", "buy milk")      for "add task buy milk"
-    - ("show", None)           for "show task" or "show tasks"
-    - ("remove", "brush teeth") for "remove task brush teeth"
-    - ("done", 2)              for "mark done 2" (task id)
+    get_response() for asyncio servers (see assistant/asgi.py).
+
+    The CPU-only stages (intents, calculator, fuzzy matching) run inline.
+    A dictionary lookup awaits the async HTTP client with its own timeout
+    (see get_meaning_async()), and todo changes run in a worker thread, so
+    one slow "define X" never holds up the other conversations.
     """
-    # Work with a normalized lowercase string for consistent checks
-    user_msg = user_msg.strip().lower()
-
-    # If message starts with "add task ", return ("add", <title>)
-    if user_msg.startswith("add task "):
-        return ("add", user_msg[9:].strip())
-
-    # Match "show task" or "show tasks" (question mark in regex is optional s)
-    elif re.match(r"show tasks?", user_msg):
-        return ("show", None)
-
-    # If user wants to remove by name or id: take everything after "remove task "
-    elif user_msg.startswith("remove task "):
-        # Extract substring after the command
-        task_name = user_msg[12:].strip()
-        if task_name:
-            # return the task identifier (string) — removal logic handles both id & title
-            return ("remove", task_name)
-
-    # If message starts with "mark done <number>" treat as numeric id
-    elif user_msg.startswith("mark done "):
-        m = re.match(r"mark done (\d+)", user_msg)
-        if m:
-            return ("done", int(m.group(1)))
-
-    # Not a todo command
-    return None
+    message = _message(user_msg, _index, get_meaning_async)
+    if isinstance(message, str):
+        return message
+    _, reply = await router.dispatch_async(message)
+    return reply if reply is not None else _fallback()
 
 
 # =======================================================================
-# MAIN FUNCTION: get_response()
+# Shared pipeline behind get_response() and get_response_many()
 # =======================================================================
-def get_response(user_msg: str) -> str:
+def _respond(user_msg: str, index: IntentIndex, lookup) -> str:
     """
-    Main brain of the assistant.
-    Input: user message (string)
-    Output: chatbot reply (string)
+    Answer one message with the given intent index.
+    `lookup` is the function used for dictionary meanings (word -> text).
     """
+    message = _message(user_msg, index, lookup)
+    if isinstance(message, str):
+        return message
+    return _dispatch(message)
+
+
+def _dispatch(message: Message) -> str:
+    """Answer a prepared Message (see _message())."""
+    # 3-8. Let the router pick the feature that answers: intents first, then
+    #      dictionary, calculator, todo, and fuzzy matching last (handlers
+    #      that cannot match this message are skipped, see assistant/router.py)
+    _, reply = router.dispatch(message)
+    if reply is not None:
+        return reply
+
+    # 9. Nothing matched -> return a randomized friendly fallback reply
+    return _fallback()
+
+
+def _fallback() -> str:
+    if metrics.ENABLED:
+        metrics.ANSWERS.inc("fallback")
+    return random.choice(_fallback_responses)
+
+
+def _message(user_msg: str, index: IntentIndex, lookup):
+    """Build the Message to dispatch, or return the reply to an empty message (str)."""
 
     # 1. Handle completely empty input (None, empty string, whitespace-only)
     if not user_msg or not user_msg.strip():
         return "Please say something so I can help."
 
     # 2. Keep two forms of the message:
-    #    raw_lower -> full lowercased text (keeps operators and punctuation)
+    #    msg.lower -> full lowercased text (keeps operators and punctuation)
     #    normalized -> cleaned text used for intent matching (no punctuation)
-    raw_lower = user_msg.lower()
-    normalized = _normalize(user_msg)
+    normalized = normalize(user_msg)
     # If normalized is empty (e.g., user typed only symbols like "!!!") respond accordingly
     if not normalized:
         return "Please say something so I can help."
-
-    # 3. Try to match explicit intents first using compiled regex patterns
-    for intent, data in _compiled_intents.items():
-        for pattern in data["patterns"]:
-            # pattern.search checks if the regex appears anywhere in the user message
-            if pattern.search(user_msg):
-                # If matched, return a random response from that intent
-                return random.choice(data["responses"])
-
-    # 4. Dictionary lookup detection (e.g., "meaning of umbrella")
-    word = _is_dictionary_query(normalized)
-    if word:
-        # get_meaning calls the dictionary feature and returns a string
-        meaning = get_meaning(word)
-        # If meaning exists return it, otherwise inform user it wasn't found
-        return meaning if meaning else f"Sorry, I couldn’t find the meaning of '{word}'."
-
-    # 5. Calculator detection (e.g., "2 + 2" or "what is 5+7")
-    expr = _is_calculator_query(raw_lower)
-    if expr:
-        # evaluate runs the safe-eval logic in features/calculator.py
-        result = evaluate(expr)
-        return f"The result is: {result}"
-
-    # 6. To-do commands (add/show/remove/mark done)
-    todo_cmd = _is_todo_query(user_msg)
-    if todo_cmd:
-        cmd, arg = todo_cmd
-        if cmd == "add":
-            # add_task returns a message string (success/error)
-            return add_task(arg)
-        elif cmd == "show":
-            # get_tasks returns a list of task dicts; we format them for display
-            tasks_list = get_tasks()
-            if not tasks_list:
-                return "No tasks found."
-            # Format: "1. [Pending] Buy milk"
-            formatted = [f"{t['id']}. [{'Done' if t['status']=='done' else 'Pending'}] {t['title']}" for t in tasks_list]
-            # Join with newline so frontend can display multiple lines
-            return "\n".join(formatted)
-        elif cmd == "remove":
-            # remove_task in features expects an integer id OR the module may accept title;
-            # here we attempt numeric removal first; if arg is not numeric, try removing by title.
-            try:
-                # If arg looks like an integer string, convert and call remove_task(id)
-                task_id = int(arg)
-                return remove_task(task_id)
-            except Exception:
-                # Otherwise try to remove by title (string). Some implementations of remove_task
-                # accept title, but if not, you may need to implement that logic inside features.todo.
-                # For now call remove_task with arg and let the feature handle it or return "Task not found".
-                return remove_task(arg)
-        elif cmd == "done":
-            # Marking done. Try numeric id first.
-            try:
-                task_id = int(arg)
-                return mark_done(task_id)
-            except Exception:
-                # If arg was not numeric, attempt to find by title using tasks API (if supported there)
-                return mark_done(arg)
-
-    # 7. Typos / fuzzy matching (single tokens)
-    tokens = normalized.split()
-    vocab = list(_single_word_to_intent.keys())  # list of known single-word patterns
-    if tokens:
-        for t in tokens:
-            # get_close_matches finds nearest word from vocab for token t
-            match = get_close_matches(t, vocab, n=1, cutoff=0.80)
-            if match:
-                # If a close match was found, map it back to the intent and respond
-                intent = _single_word_to_intent[match[0]]
-                return f"(Did you mean **{match[0]}**?)\n{random.choice(intents[intent]['responses'])}"
-
-    # 8. Typos / fuzzy matching on whole message (helps when multiple words)
-    all_patterns = [p for data in intents.values() for p in data["patterns"]]
-    match = get_close_matches(normalized, all_patterns, n=1, cutoff=0.75)
-    if match:
-        # Find which intent this best-matching pattern belongs to
-        for intent, data in intents.items():
-            if match[0] in data["patterns"]:
-                return f"(Did you mean **{match[0]}**?)\n{random.choice(data['responses'])}"
-
-    # 9. Nothing matched -> return a randomized friendly fallback reply
-    return random.choice(_fallback_responses)
+    return Message(user_msg, normalized, index, lookup)
@@ -0,0 +1,48 @@
+# =======================================================================
+# Configuration Helpers
+# =======================================================================
+# Small helpers to read settings from environment variables, so every
+# module reads its knobs the same way (AVA_* variables).
+# =======================================================================
+
+import os  # Environment variables and paths
+
+
+def env_str(name: str, default: str = None) -> str:
+    """Return the env var `name`, or `default` if it is unset or empty."""
+    value = os.environ.get(name)
+    return value if value else default
+
+
+def env_float(name: str, default: float) -> float:
+    """Return the env var `name` as a float, or `default` if unset/invalid."""
+    try:
+        return float(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+
+
+def env_int(name: str, default: int) -> int:
+    """Return the env var `name` as an int, or `default` if unset/invalid."""
+    try:
+        return int(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+
+
+def env_bool(name: str, default: bool = False) -> bool:
+    """Return the env var `name` as a bool ("1", "true", "yes", "on"), or `default` if unset."""
+    value = os.environ.get(name)
+    if not value:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def cache_dir() -> str:
+    """Directory for caches and compiled artifacts (AVA_CACHE_DIR or ~/.cache/ava)."""
+    return env_str("AVA_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "ava")
+
+
+def data_dir() -> str:
+    """Directory for user data such as the todo list (AVA_DATA_DIR or the current directory)."""
+    return os.path.abspath(env_str("AVA_DATA_DIR") or os.getcwd())
@@ -0,0 +1,259 @@
+# =======================================================================
+# Intent Corpus Module
+# =======================================================================
+# This module loads the intents (patterns + responses) from a corpus file
+# instead of a dict hardcoded in chatbot.py, so new phrases can be added
+# without touching code.
+#
+# It also takes care of:
+# - Compiled-artifact caching: the built IntentIndex (matcher, fuzzy indexes,
+#   reverse maps) is pickled to disk, keyed by the corpus content hash and
+#   by the source of the modules that build it, so a restart with an
+#   unchanged corpus and unchanged code skips rebuilding everything.
+#   Artifacts are only read back when they belong to the current user and
+#   nobody else can write them (unpickling runs code).
+# - Hot reload: IntentWatcher polls the corpus file and hands a freshly built
+#   index to a callback whenever the file content changes.
+#
+# Configuration (environment variables):
+#   AVA_INTENTS_FILE -> path to the corpus (.json, or .yaml/.yml if PyYAML is installed)
+#   AVA_CACHE_DIR    -> where compiled artifacts are stored (default: ~/.cache/ava)
+# =======================================================================
+
+import hashlib    # Corpus content hash -> artifact cache key
+import json       # Default corpus format
+import logging    # Report reload problems without crashing the server
+import os         # Paths, env vars, atomic file replace
+import pickle     # On-disk compiled artifact
+import sys        # Python version (pickles are tied to it)
+import tempfile   # Write artifacts atomically
+import threading  # Background file watcher
+
+from assistant.config import cache_dir, env_str
+from assistant.intent_index import IntentIndex
+
+log = logging.getLogger(__name__)
+
+# ===============================
+# Constants
+# ===============================
+# Default corpus shipped with the package
+DEFAULT_CORPUS = os.path.join(os.path.dirname(__file__), "data", "intents.json")
+
+# Bump this whenever IntentIndex (or anything it contains) changes layout,
+# so old artifacts are ignored instead of being unpickled into the wrong shape.
+ARTIFACT_VERSION = 1
+
+# Modules whose code decides what the index contains: any edit to them
+# (even without an ARTIFACT_VERSION bump) changes the artifact name
+_INDEX_MODULES = ("intent_index.py", "matcher.py", "fuzzy.py")
+
+
+def corpus_path() -> str:
+    """Return the corpus file in use (AVA_INTENTS_FILE or the bundled default)."""
+    return env_str("AVA_INTENTS_FILE", DEFAULT_CORPUS)
+
+
+# ===============================
+# Reading and validating a corpus
+# ===============================
+def parse_corpus(raw: bytes, path: str) -> dict:
+    """
+    Turn the raw corpus file content into an intents dict and validate it.
+
+    Expected shape (JSON or YAML):
+        {"greet": {"patterns": ["hi", ...], "responses": ["Hello!", ...]}, ...}
+
+    Raises:
+        ValueError: if the file is not a valid corpus.
+    """
+    if path.endswith((".yaml", ".yml")):
+        try:
+            import yaml  # Optional dependency, only needed for YAML corpora
+        except ImportError:
+            raise ValueError("PyYAML is required to load a YAML intent corpus") from None
+        data = yaml.safe_load(raw)
+    else:
+        data = json.loads(raw)
+
+    if not isinstance(data, dict) or not data:
+        raise ValueError(f"{path}: corpus must be a non-empty mapping of intents")
+    for name, intent in data.items():
+        if not isinstance(intent, dict):
+            raise ValueError(f"{path}: intent '{name}' must be a mapping")
+        for key in ("patterns", "responses"):
+            values = intent.get(key)
+            if not isinstance(values, list) or not all(isinstance(v, str) and v for v in values):
+                raise ValueError(f"{path}: intent '{name}' needs a list of non-empty strings in '{key}'")
+        if not intent["responses"]:
+            raise ValueError(f"{path}: intent '{name}' has no responses")
+    return data
+
+
+# ===============================
+# Compiled-artifact cache
+# ===============================
+def _code_digest() -> str:
+    """Hash of the source of the modules that build an IntentIndex."""
+    h = hashlib.sha256()
+    package = os.path.dirname(os.path.abspath(__file__))
+    for name in _INDEX_MODULES:
+        with open(os.path.join(package, name), "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:12]
+
+
+_CODE_DIGEST = _code_digest()
+
+
+def _artifact_path(digest: str) -> str:
+    """Artifact file name = format version + Python version + code hash + corpus hash."""
+    py = f"py{sys.version_info[0]}{sys.version_info[1]}"
+    return os.path.join(cache_dir(), f"intents-v{ARTIFACT_VERSION}-{py}-{_CODE_DIGEST}-{digest}.pickle")
+
+
+def _trusted(st) -> bool:
+    """True if a file with stat result `st` is ours and not writable by others."""
+    if hasattr(os, "getuid") and st.st_uid != os.getuid():
+        return False
+    return not st.st_mode & 0o022
+
+
+def _read_artifact(path: str):
+    """Return the cached IntentIndex, or None if missing/unreadable/untrusted."""
+    try:
+        with open(path, "rb") as f:
+            if not _trusted(os.fstat(f.fileno())):
+                log.warning("Ignoring intent artifact %s: not owned by this user or writable by others", path)
+                return None
+            index = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # Corrupt or incompatible artifact -> just rebuild
+        log.warning("Ignoring unreadable intent artifact %s", path)
+        return None
+    return index if isinstance(index, IntentIndex) else None
+
+
+def _write_artifact(path: str, index: IntentIndex):
+    """Store the index atomically (temp file + rename); failures are not fatal."""
+    try:
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError:
+        log.warning("Could not write intent artifact %s", path)
+
+
+def build_index(raw: bytes, path: str, use_cache: bool = True) -> IntentIndex:
+    """
+    Return the IntentIndex for this corpus content, reusing the on-disk
+    artifact when the content hash matches.
+    """
+    digest = hashlib.sha256(raw).hexdigest()[:32]
+    artifact = _artifact_path(digest)
+
+    if use_cache:
+        index = _read_artifact(artifact)
+        if index is not None:
+            return index
+
+    index = IntentIndex(parse_corpus(raw, path))
+    if use_cache:
+        _write_artifact(artifact, index)
+    return index
+
+
+def load_index(path: str = None, use_cache: bool = True) -> IntentIndex:
+    """Read the corpus file at `path` (default: corpus_path()) and build its index."""
+    path = path or corpus_path()
+    with open(path, "rb") as f:
+        raw = f.read()
+    return build_index(raw, path, use_cache)
+
+
+# ===============================
+# Hot reload
+# ===============================
+class IntentWatcher:
+    """
+    Poll the corpus file and call `on_change(new_index)` when its content changes.
+
+    Polling (instead of inotify & co.) keeps this dependency-free and works on
+    every platform and on network filesystems. A corpus with errors is logged
+    and ignored, so the running index stays in service.
+
+    Args:
+        path (str): Corpus file to watch.
+        on_change (callable): Receives the new IntentIndex.
+        interval (float): Seconds between checks.
+    """
+
+    def __init__(self, path: str, on_change, interval: float = 2.0):
+        self.path = path
+        self.on_change = on_change
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        self._stat = self._current_stat()
+        self._digest = self._current_digest()
+
+    def _current_stat(self):
+        try:
+            st = os.stat(self.path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _current_digest(self):
+        try:
+            with open(self.path, "rb") as f:
+                return hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return None
+
+    def check(self) -> bool:
+        """Check the file once; return True if a new index was installed."""
+        stat = self._current_stat()
+        if stat is None or stat == self._stat:
+            return False
+        self._stat = stat
+
+        try:
+            with open(self.path, "rb") as f:
+                raw = f.read()
+        except OSError:
+            return False
+        digest = hashlib.sha256(raw).hexdigest()
+        if digest == self._digest:
+            return False  # touched but not changed
+
+        try:
+            index = build_index(raw, self.path)
+        except Exception:
+            log.exception("Intent corpus %s is invalid, keeping the current intents", self.path)
+            return False
+
+        self._digest = digest
+        self.on_change(index)
+        log.info("Reloaded intents from %s", self.path)
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def start(self):
+        """Start watching in a daemon thread (does nothing if already running)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="intent-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the background thread."""
+        self._stop.set()
@@ -1,4 +1,246 @@
-import re  # For pattern matching to validate input
+import operator  # Python's own arithmetic, so results match eval() exactly
+import re        # For pattern matching to validate input
+from functools import lru_cache  # Cache parsed expressions by their text
+
+try:
+    import numpy as np  # Optional: vectorized evaluate_many()
+except ImportError:     # Without NumPy, evaluate_many() evaluates one by one
+    np = None
+
+# ===============================
+# Limits
+# ===============================
+# Without limits, inputs like "9**9**9" or "99999999*99999999*..." can pin a
+# CPU for minutes. Anything over these limits is refused up front.
+MAX_DEPTH = 100         # nesting of parentheses / signs / powers
+MAX_OPERATIONS = 1000   # operators in one expression
+MAX_INT_BITS = 10_000   # size of an integer result (~3000 digits)
+
+TOO_LARGE = "Expression is too large to evaluate"
+
+# Only digits, + - * / % . ( ) are allowed (checked after removing spaces)
+_VALID_CHARS = re.compile(r"[0-9+\-*/%.()]+")
+
+# Tokens, longest operators first so "**" is not read as "*" "*"
+# (same rule as Python's tokenizer: "***" -> "**" "*").
+# "..." is Python's Ellipsis literal; it is kept so odd inputs behave as before.
+_TOKEN = re.compile(r"(\d+\.\d*|\.\d+|\d+)|(\*\*|//|\.\.\.|[+\-*/%()])")
+
+
+# ===============================
+# Guarded operators
+# ===============================
+def _mul(a, b):
+    # int * int: refuse results that would be too big (float * float cannot explode)
+    if type(a) is int and type(b) is int and a.bit_length() + b.bit_length() > MAX_INT_BITS:
+        raise _TooLarge
+    return a * b
+
+
+def _pow(a, b):
+    # int ** positive int grows by ~bits(a) * b
+    if type(a) is int and type(b) is int and b > 0 and (abs(a) > 1) and (a.bit_length() - 1) * b > MAX_INT_BITS:
+        raise _TooLarge
+    return a ** b
+
+
+_BINARY = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": _mul,
+    "/": operator.truediv,
+    "//": operator.floordiv,
+    "%": operator.mod,
+    "**": _pow,
+}
+_UNARY = {
+    "neg": operator.neg,
+    "pos": operator.pos,
+}
+
+
+def _call(function, *args):
+    # Numbers, () and Ellipsis are not callable: TypeError, like eval()
+    return function(*args)
+
+
+class _TooLarge(Exception):
+    """Raised when an expression goes over one of the limits."""
+
+
+# ===============================
+# Parser: text -> small program
+# ===============================
+# The expression is parsed once into postfix ("reverse Polish") form:
+#   "2 + 3 * 4"  ->  code = (None, None, None, "*", "+"), consts = (2, 3, 4)
+# where None means "push the next constant". Running it is a short loop over
+# a stack, which is much cheaper than compiling Python bytecode with eval().
+#
+# Grammar (same precedence and associativity as Python):
+#   expr   := term (("+" | "-") term)*
+#   term   := factor (("*" | "/" | "//" | "%") factor)*
+#   factor := ("+" | "-") factor | power
+#   power  := call ["**" factor]            # right-associative, -2**2 == -4
+#   call   := atom ("(" [expr] ")")*        # "2(3)": a call, as in Python
+#   atom   := NUMBER | "(" expr ")" | "(" ")"
+#
+# Calls are kept (instead of being rejected while parsing) because eval()
+# evaluated the callee and the argument before failing on the call itself:
+# "2(1/0)" was "Division by zero is not allowed", "2(3)" "Invalid expression".
+def _tokenize(text: str) -> list:
+    tokens = []
+    pos = 0
+    while pos < len(text):
+        m = _TOKEN.match(text, pos)
+        if m is None:
+            raise SyntaxError(text)  # e.g. a lone "."
+        number, op = m.groups()
+        if number is not None:
+            if "." in number:
+                tokens.append(("num", float(number)))
+            else:
+                # Python forbids leading zeros in integers ("007"), but "00" is fine
+                if number[0] == "0" and number.strip("0"):
+                    raise SyntaxError(number)
+                tokens.append(("num", int(number)))
+        else:
+            tokens.append(("op", op))
+        pos = m.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(self, tokens: list):
+        self.tokens = tokens
+        self.pos = 0
+        self.code = []
+        self.consts = []
+
+    def _peek(self):
+        if self.pos < len(self.tokens):
+            kind, value = self.tokens[self.pos]
+            if kind == "op":
+                return value
+        return None
+
+    def parse(self):
+        self.expr(0)
+        if self.pos != len(self.tokens):
+            # Leftover tokens, e.g. "2)" or "2 3"
+            raise SyntaxError("unexpected token")
+        if len(self.code) - len(self.consts) > MAX_OPERATIONS:
+            raise _TooLarge
+        return tuple(self.code), tuple(self.consts)
+
+    def expr(self, depth):
+        self.term(depth)
+        while self._peek() in ("+", "-"):
+            op = self.tokens[self.pos][1]
+            self.pos += 1
+            self.term(depth)
+            self.code.append(op)
+
+    def term(self, depth):
+        self.factor(depth)
+        while self._peek() in ("*", "/", "//", "%"):
+            op = self.tokens[self.pos][1]
+            self.pos += 1
+            self.factor(depth)
+            self.code.append(op)
+
+    def factor(self, depth):
+        if depth > MAX_DEPTH:
+            raise _TooLarge
+        op = self._peek()
+        if op in ("+", "-"):
+            self.pos += 1
+            self.factor(depth + 1)
+            self.code.append("neg" if op == "-" else "pos")
+        else:
+            self.power(depth)
+
+    def power(self, depth):
+        self.call(depth)
+        if self._peek() == "**":
+            self.pos += 1
+            self.factor(depth + 1)
+            self.code.append("**")
+
+    def call(self, depth):
+        self.atom(depth)
+        while self._peek() == "(":
+            self.pos += 1
+            if self._peek() == ")":
+                self.code.append("call0")
+            else:
+                self.expr(depth + 1)
+                if self._peek() != ")":
+                    raise SyntaxError("missing )")
+                self.code.append("call1")
+            self.pos += 1
+
+    def atom(self, depth):
+        if self.pos >= len(self.tokens):
+            raise SyntaxError("unexpected end")
+        kind, value = self.tokens[self.pos]
+        self.pos += 1
+        if kind == "num":
+            self.code.append(None)
+            self.consts.append(value)
+        elif value == "...":
+            self.code.append(None)
+            self.consts.append(Ellipsis)
+        elif value == "(":
+            if self._peek() == ")":
+                # "()" is an empty tuple in Python; keep it so results stay identical
+                self.pos += 1
+                self.code.append(None)
+                self.consts.append(())
+            else:
+                self.expr(depth + 1)
+                if self._peek() != ")":
+                    raise SyntaxError("missing )")
+                self.pos += 1
+        else:
+            raise SyntaxError(value)
+
+
+@lru_cache(maxsize=1024)
+def _compile(expr: str):
+    """
+    Parse `expr` (already validated, no spaces) into (code, consts).
+    Returns an error message string instead if it cannot be parsed.
+    Cached, so repeated expressions are parsed only once.
+    """
+    try:
+        return _Parser(_tokenize(expr)).parse()
+    except _TooLarge:
+        return TOO_LARGE
+    except Exception:
+        return "Invalid expression"
+
+
+def _run(code, consts):
+    """Execute a parsed program on a small stack and return the result."""
+    stack = []
+    push, pop = stack.append, stack.pop
+    i = 0
+    for op in code:
+        if op is None:
+            push(consts[i])
+            i += 1
+        elif op in _UNARY:
+            push(_UNARY[op](pop()))
+        elif op == "call0":
+            push(_call(pop()))
+        elif op == "call1":
+            arg = pop()
+            push(_call(pop(), arg))
+        else:
+            b = pop()
+            push(_BINARY[op](pop(), b))
+    return stack[0]
+
 
 # ===============================
 # FUNCTION: evaluate()
@@ -13,12 +255,126 @@ def evaluate(expr: str):
         - Parentheses for grouping ()
         - Decimal numbers and spaces
 
+    The expression is parsed by our own small parser (no eval()), and the
+    parsed form is cached. Results and error messages are the same as
+    Python's own arithmetic; expressions over the size limits above return
+    "Expression is too large to evaluate".
+
     Args:
         expr (str): The math expression to evaluate, e.g., "2 + 3 * (4 - 1)"
 
     Returns:
         int/float/str: The evaluated result or an error message
     """
+    program = _prepare(expr)
+    if isinstance(program, str):
+        return program  # invalid characters / parse error message
+    return _execute(*program)
+
+
+# ===============================
+# FUNCTION: evaluate_many()
+# ===============================
+def evaluate_many(exprs) -> list:
+    """
+    Evaluate many expressions at once (for batch jobs).
+
+    Expressions with the same shape, e.g. "2+3*4" and "7+1*9", are parsed
+    only once: they share one program and differ only in their numbers, so
+    each such group is computed with NumPy array operations in one go.
+    The batch is also split into shapes and numbers with NumPy, in a few
+    passes over all of its bytes (not a tokenizer run per expression), and
+    results are converted back to Python numbers a group at a time, so the
+    Python work left per expression is small.
+
+    Elements where NumPy could differ from Python (division by zero,
+    integers that might overflow 64 bits, powers) are recomputed one by one
+    with evaluate()'s own code, so every result and error message is exactly
+    what evaluate() returns for that expression.
+
+    Args:
+        exprs (iterable): Math expression strings.
+
+    Returns:
+        list: One result (int/float/str) per expression, in the same order.
+    """
+    exprs = list(exprs)
+    if np is None or not exprs:
+        return [evaluate(expr) for expr in exprs]
+    results = np.empty(len(exprs), dtype=object)
+
+    # 1. Split the whole batch into shapes and numbers; expressions with the
+    #    same shape share one parse
+    shapes, starts, numbers, unusual = _split_batch(exprs)
+    for i in unusual.tolist():
+        results[i] = evaluate(exprs[i])  # invalid or unusual input
+    ids = {}
+    group_of = np.fromiter((ids.setdefault(shape, len(ids)) for shape in shapes), np.int64, len(shapes))
+    group_of[unusual] = -1
+    order = np.argsort(group_of, kind="stable")
+    bounds = np.searchsorted(group_of[order], np.arange(len(ids) + 1))
+
+    # 2. Evaluate each group (vectorized when it is worth it)
+    for shape, g in ids.items():
+        members = order[bounds[g]:bounds[g + 1]]
+        if not len(members):
+            continue  # only unusual inputs had this shape
+        program = _compile_shape(shape)
+        if isinstance(program, str):
+            results[members] = program  # same parse error for the whole group
+            continue
+
+        # Numbers one column (= one position in the shape) at a time
+        code, template, types = program
+        first = starts[members]
+        if template is not None or len(members) < MIN_VECTOR_GROUP or not _vectorizable(code, types):
+            columns = [numbers.values(first + j, t) for j, t in enumerate(types)]
+            rows = list(zip(*columns)) if columns else [()] * len(members)
+            if template is not None:
+                # "()" in the expression: not plain numbers
+                rows = [_fill(template, row) for row in rows]
+            results[members] = _objects([_execute(code, row) for row in rows])
+            continue
+
+        columns, big = zip(*(numbers.array(first + j, t) for j, t in enumerate(types)))
+        values, fallback = _run_vector(code, types, list(columns), np.logical_or.reduce(big))
+        out = _to_python(values, _result_is_float(code, types))
+        redo = np.flatnonzero(fallback)
+        if len(redo):
+            rows = zip(*(numbers.values(first[redo] + j, t) for j, t in enumerate(types)))
+            out[redo] = _objects([_execute(code, row) for row in rows])
+        results[members] = out
+
+    return results.tolist()
+
+
+def _objects(values: list):
+    """A 1-D object array holding `values` as they are (no NumPy conversion)."""
+    out = np.empty(len(values), dtype=object)
+    out[:] = values
+    return out
+
+
+def _to_python(values, is_float: bool):
+    """
+    NumPy results -> object array of Python numbers, with evaluate()'s
+    "4.0 -> 4" rule applied to float results.
+    """
+    out = _objects(values.tolist())
+    if is_float:
+        integral = np.isfinite(values) & (np.floor(values) == values)
+        small = integral & (np.abs(values) < _INT_SAFE)
+        out[small] = values[small].astype(np.int64).tolist()
+        for k in np.flatnonzero(integral & ~small).tolist():
+            out[k] = int(out[k])  # exact, however large
+    return out
+
+
+# ===============================
+# Helpers shared by evaluate() and evaluate_many()
+# ===============================
+def _prepare(expr):
+    """Validate and parse `expr`. Returns (code, consts) or an error message."""
     try:
         # 1. Remove all spaces to simplify evaluation
         expr = expr.replace(" ", "")
@@ -29,13 +385,19 @@ def evaluate(expr: str):
         # +\-*/% → math operators
         # .() → decimal point and parentheses
         # + → one or more characters
-        if not re.fullmatch(r"[0-9+\-*/%.()]+", expr):
+        if not _VALID_CHARS.fullmatch(expr):
             return "Invalid characters in expression"
 
-        # 3. Evaluate safely using eval()
-        # - {"__builtins__": None} disables built-in functions for safety
-        # - {} provides an empty global environment
-        result = eval(expr, {"__builtins__": None}, {})
+        # 3. Parse (or reuse the cached parse)
+        return _compile(expr)
+    except Exception:
+        return "Invalid expression"
+
+
+def _execute(code, consts):
+    """Run a parsed program. Returns the result or an error message."""
+    try:
+        result = _run(code, consts)
 
         # 4. If the result is a float but looks like an integer (e.g., 4.0), return it as int
         if isinstance(result, float) and result.is_integer():
@@ -47,6 +409,260 @@ def evaluate(expr: str):
     except ZeroDivisionError:
         return "Division by zero is not allowed"
 
-    # 6. Catch any other errors (invalid syntax, etc.)
+    # 6. Over the size limits while running (e.g. 9**9**9)
+    except _TooLarge:
+        return TOO_LARGE
+
+    # 7. Catch any other errors (invalid syntax, etc.)
+    except Exception:
+        return "Invalid expression"
+
+
+# ===============================
+# Shapes: expressions that differ only in their numbers
+# ===============================
+# "2+3.5*4" -> shape "i+f*i" and numbers ["2", "3.5", "4"]
+# (i = integer, f = float). The parser only looks at the kind of each
+# number, so one parse of the shape serves every expression with that shape.
+_SLOT = object()  # stands for "the next number" while parsing a shape
+
+_SHAPE_TOKEN = re.compile(r"([if])|(\*\*|//|[+\-*/%()])")
+MAX_SHAPE_LENGTH = 4000
+_INT64_DIGITS = 18  # integers up to 18 digits are parsed straight into int64
+
+
+def _split_batch(exprs: list):
+    """
+    Split every expression into its shape and its numbers for evaluate_many().
+
+    The expressions are joined into one byte string (one per line) and
+    scanned with NumPy, byte class by byte class, instead of running a
+    tokenizer per expression: a number is a run of digits and dots, an
+    integer run is converted to int64 arithmetically, and each run becomes
+    one "i" or "f" in the shape.
+
+    Returns:
+        tuple: (shapes, starts, numbers, unusual): the shape of each
+        expression, where its numbers start in `numbers` (a _Numbers),
+        and the indexes of the unusual expressions (not a string, invalid
+        characters, "007", "...", a lone ".", "1.2.3", very long), which
+        must go through evaluate() as they are.
+    """
+    n = len(exprs)
+    bad = np.zeros(n, dtype=bool)
+    try:
+        text = "\n".join(exprs)
+    except TypeError:  # not all strings
+        text = None
+    if text is None or text.count("\n") != n - 1:
+        # Rare: non-strings or line breaks inside an expression
+        safe = [type(e) is str and "\n" not in e for e in exprs]
+        bad |= ~np.array(safe)
+        text = "\n".join(e if ok else "" for e, ok in zip(exprs, safe))
+
+    raw = text.replace(" ", "").encode("utf-8")
+    data = np.frombuffer(raw, dtype=np.uint8)
+    newline = data == ord("\n")
+    line = np.cumsum(newline) - newline  # line (= expression) of each byte
+    ends = np.concatenate((np.flatnonzero(newline), [len(data)]))
+    lengths = np.diff(np.concatenate(([-1], ends))) - 1
+    bad |= (lengths == 0) | (lengths > MAX_SHAPE_LENGTH)
+    bad[line[~_ALLOWED[data]]] = True  # invalid characters (and any non-ASCII byte)
+
+    # Numbers: maximal runs of digits and dots
+    numeric = _NUMERIC[data]
+    first = numeric.copy()
+    first[1:] &= ~numeric[:-1]
+    last = numeric.copy()
+    last[:-1] &= ~numeric[1:]
+    run_start = np.flatnonzero(first)
+    run_end = np.flatnonzero(last) + 1
+    run_length = run_end - run_start
+    dots = np.concatenate(([0], np.cumsum(data == ord("."))))
+    run_dots = dots[run_end] - dots[run_start]
+    second = data[np.minimum(run_start + 1, max(len(data) - 1, 0))]
+    weird = (
+        (run_dots > 1)                                      # "...", "1.2.3"
+        | ((run_dots == 1) & (run_length == 1))             # a lone "."
+        | ((data[run_start] == ord("0")) & (run_length > 1) & (second != ord(".")))  # "007", "00"
+    )
+    bad[line[run_start[weird]]] = True
+
+    # Shapes: every run becomes one "i" or "f"
+    is_float = run_dots == 1
+    shape = data.copy()
+    shape[run_start] = np.where(is_float, ord("f"), ord("i"))
+    shapes = shape[~numeric | first].tobytes().decode("utf-8").split("\n")
+    counts = np.bincount(line[run_start], minlength=n)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    numbers = _Numbers(raw, data, run_start, run_end, is_float & ~weird, ~is_float & ~weird)
+    return shapes, starts, numbers, np.flatnonzero(bad)
+
+
+class _Numbers:
+    """
+    The numbers of a batch, parsed once (see _split_batch()).
+
+    Integers of up to 18 digits are computed from their digits with NumPy;
+    longer ones (rare) are flagged `big` and parsed by int() when needed.
+    Floats are parsed by float(), so they are exactly what evaluate() reads.
+    """
+
+    def __init__(self, raw: bytes, data, run_start, run_end, floats, ints):
+        self.raw = raw
+        self.run_start = run_start
+        self.run_end = run_end
+        self.big = ints & (run_end - run_start > _INT64_DIGITS)
+
+        # int64 value of each short integer run: sum of digit * 10**(place)
+        small = ints & ~self.big
+        lengths = run_end - run_start
+        in_run = np.repeat(small, lengths)  # per byte of every run
+        byte_index = np.flatnonzero(_NUMERIC[data])
+        place = np.repeat(run_end, lengths) - byte_index - 1
+        digits = np.where(in_run, data[byte_index].astype(np.int64) - ord("0"), 0)
+        powers = _POWERS_OF_TEN[np.where(in_run, place, 0)]
+        offsets = np.cumsum(lengths) - lengths  # where each run starts among the numeric bytes
+        self.ints = np.add.reduceat(digits * powers, offsets) if len(offsets) else np.zeros(0, np.int64)
+
+        self.floats = np.zeros(len(run_start))
+        index = np.flatnonzero(floats)
+        self.floats[index] = [
+            float(raw[a:b]) for a, b in zip(run_start[index].tolist(), run_end[index].tolist())
+        ]
+
+    def array(self, index, t):
+        """(values, big) for the numbers at `index`: an int64/float64 array and its "too big" flags."""
+        if t is float:
+            return self.floats[index], np.zeros(len(index), dtype=bool)
+        return np.where(self.big[index], 0, self.ints[index]), self.big[index]
+
+    def values(self, index, t) -> list:
+        """The numbers at `index` as Python ints or floats."""
+        if t is float:
+            return self.floats[index].tolist()
+        values = self.ints[index].tolist()
+        for k in np.flatnonzero(self.big[index]).tolist():
+            number = index[k]
+            values[k] = int(self.raw[self.run_start[number]:self.run_end[number]])
+        return values
+
+
+@lru_cache(maxsize=1024)
+def _compile_shape(shape: str):
+    """
+    Parse a shape from _split_batch().
+    Returns (code, template, types), or an error message string. `template`
+    is None when the constants are exactly the numbers, in order; otherwise
+    it holds the constants with _SLOT where the numbers go (see _fill()).
+    """
+    tokens = [("num", _SLOT) if kind else ("op", op) for kind, op in _SHAPE_TOKEN.findall(shape)]
+    try:
+        code, consts = _Parser(tokens).parse()
+    except _TooLarge:
+        return TOO_LARGE
     except Exception:
         return "Invalid expression"
+
+    types = tuple(int if c == "i" else float for c in shape if c in "if")
+    template = None if len(consts) == len(types) else consts
+    return code, template, types
+
+
+def _fill(template, numbers):
+    """Put the numbers into the _SLOT places of a template."""
+    numbers = iter(numbers)
+    return tuple(next(numbers) if c is _SLOT else c for c in template)
+
+
+# ===============================
+# Vectorized evaluation (NumPy)
+# ===============================
+# Groups smaller than this are cheaper to run one by one
+MIN_VECTOR_GROUP = 8
+
+# int64 results are trusted only while |value| <= 2**62 (checked with a
+# float64 "shadow" of each result), and int/int true division only while
+# both sides are exactly representable as float64 (|value| <= 2**53)
+_INT_SAFE = float(2 ** 62)
+_FLOAT_EXACT = 2 ** 53
+
+_VECTOR_OPS = {"+", "-", "*", "/", "//", "%", "neg", "pos", None}
+
+
+def _vectorizable(code, types) -> bool:
+    """Only plain int/float numbers and the operators NumPy matches exactly."""
+    return all(t is int or t is float for t in types) and all(op in _VECTOR_OPS for op in code)
+
+
+def _result_is_float(code, types) -> bool:
+    """Whether the program's result is a float (int only if no float and no "/")."""
+    return float in types or "/" in code
+
+
+def _run_vector(code, types, columns, fallback):
+    """
+    Run one program over many rows of constants with NumPy.
+
+    Args:
+        columns (list): One int64 or float64 array per constant of the program.
+        fallback: Boolean array of the rows already known to need _execute()
+            (integer literals too big for int64).
+
+    Returns:
+        (values, fallback): the results (int64 or float64 array), and a
+        boolean array telling which rows must be recomputed with _execute().
+    """
+    fallback = fallback.copy()
+    stack = []  # (array, is_float)
+    slot = 0
+
+    with np.errstate(all="ignore"):
+        for op in code:
+            if op is None:
+                stack.append((columns[slot], types[slot] is float))
+                slot += 1
+            elif op == "neg":
+                a, a_float = stack.pop()
+                stack.append((-a, a_float))
+            elif op == "pos":
+                pass
+            else:
+                b, b_float = stack.pop()
+                a, a_float = stack.pop()
+                if op in ("/", "//", "%"):
+                    fallback |= b == 0  # Python raises ZeroDivisionError
+                if op == "/" and not (a_float or b_float):
+                    # int / int -> float, exact only for ints that fit a float64
+                    fallback |= (np.abs(a) > _FLOAT_EXACT) | (np.abs(b) > _FLOAT_EXACT)
+                    a, b = a.astype(np.float64), b.astype(np.float64)
+                if a_float or b_float or op == "/":
+                    result = _NUMPY_BINARY[op](a.astype(np.float64), b.astype(np.float64))
+                    stack.append((result, True))
+                else:
+                    result = _NUMPY_BINARY[op](a, b)
+                    if op in ("+", "-", "*"):
+                        # float64 shadow tells whether the int64 result overflowed
+                        shadow = _NUMPY_BINARY[op](a.astype(np.float64), b.astype(np.float64))
+                        fallback |= ~(np.abs(shadow) <= _INT_SAFE)
+                    stack.append((result, False))
+
+    return stack[0][0], fallback
+
+
+if np is not None:
+    # Byte classes for _split_batch()
+    _ALLOWED = np.zeros(256, dtype=bool)
+    _ALLOWED[list(b"0123456789+-*/%.()\n")] = True
+    _NUMERIC = np.zeros(256, dtype=bool)
+    _NUMERIC[list(b"0123456789.")] = True
+    _POWERS_OF_TEN = 10 ** np.arange(_INT64_DIGITS + 1, dtype=np.int64)
+
+    _NUMPY_BINARY = {
+        "+": np.add,
+        "-": np.subtract,
+        "*": np.multiply,
+        "/": np.true_divide,
+        "//": np.floor_divide,
+        "%": np.remainder,
+    }
@@ -1,4 +1,229 @@
-import requests  # Import the 'requests' library to make HTTP requests (like calling an API) and fetch data
+import asyncio    # Async lookups for asyncio servers
+import logging    # Report an unusable offline dictionary
+import os         # To build the default cache file path
+import struct     # (errors from a damaged offline dictionary)
+import threading  # To create the shared cache/session only once
+import weakref    # One async HTTP client per event loop
+
+try:
+    import httpx  # Optional: non-blocking API calls for get_meaning_async()
+except ImportError:  # Without httpx the API call runs in a worker thread
+    httpx = None
+
+from assistant import metrics  # Upstream error counter (AVA_METRICS)
+from assistant.config import cache_dir, env_float, env_int, env_str
+from assistant.features.dictionary_cache import DictionaryCache
+from assistant.features.http_pool import PooledSession  # Keep-alive HTTP connections (via 'requests')
+from assistant.features.offline_dictionary import OfflineDictionary
+from assistant.features.singleflight import AsyncSingleFlight, SingleFlight
+
+log = logging.getLogger(__name__)
+
+# ===============================
+# Constants
+# ===============================
+# API endpoint; {word} is replaced by the looked-up word.
+# AVA_DICTIONARY_API_URL replaces the base URL (scheme, host, port), e.g.
+# to point a server at the stub API of benchmarks/stub_dictionary.py.
+# It is a module variable so tests can point it at a local stub server.
+DEFAULT_API_BASE_URL = "https://api.dictionaryapi.dev"
+API_URL = env_str("AVA_DICTIONARY_API_URL", DEFAULT_API_BASE_URL).rstrip("/") + "/api/v2/entries/en/{word}"
+NOT_FOUND = "Meaning not found."
+
+# ===============================
+# Cache (created on first use)
+# ===============================
+# Settings (environment variables):
+#   AVA_DICTIONARY_CACHE         -> SQLite file ("off" = memory only), default <AVA_CACHE_DIR>/dictionary.sqlite3
+#   AVA_DICTIONARY_TTL           -> seconds a found meaning is kept (default 7 days)
+#   AVA_DICTIONARY_NEGATIVE_TTL  -> seconds a "not found" result is kept (default 1 hour)
+#   AVA_DICTIONARY_MEMORY_SIZE   -> words kept in the in-process LRU (default 1024)
+_cache = None
+_init_lock = threading.Lock()  # First use can happen on several threads at once
+
+
+def get_cache() -> DictionaryCache:
+    """Return the shared dictionary cache, creating it from the environment on first use."""
+    global _cache
+    if _cache is None:
+        with _init_lock:
+            if _cache is None:
+                path = env_str("AVA_DICTIONARY_CACHE", os.path.join(cache_dir(), "dictionary.sqlite3"))
+                _cache = DictionaryCache(
+                    path=None if path == "off" else path,
+                    ttl=env_float("AVA_DICTIONARY_TTL", 7 * 24 * 3600),
+                    negative_ttl=env_float("AVA_DICTIONARY_NEGATIVE_TTL", 3600),
+                    max_memory=env_int("AVA_DICTIONARY_MEMORY_SIZE", 1024),
+                )
+    return _cache
+
+
+def set_cache(cache: DictionaryCache):
+    """Replace the shared cache (e.g. a temporary one in tests)."""
+    global _cache
+    _cache = cache
+
+
+def cache_stats() -> dict:
+    """Hit/miss counters of the shared dictionary cache."""
+    return get_cache().stats()
+
+
+# ===============================
+# Offline dictionary (opened on first use)
+# ===============================
+# A local, memory-mapped dictionary file (see offline_dictionary.py and
+# scripts/build_offline_dictionary.py). Words found there never touch the
+# network, which also makes "define X" work on nodes without internet.
+# Settings (environment variables):
+#   AVA_OFFLINE_DICTIONARY -> .avadict file, default assistant/data/dictionary.avadict
+#                             (used only if the file exists; "off" disables it)
+# A file that cannot be used (corrupt, wrong format version, unreadable) is
+# logged once and the offline tier stays off until the next restart.
+DEFAULT_OFFLINE_DICTIONARY = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "data", "dictionary.avadict"
+)
+_offline = None
+_offline_checked = False
+
+
+def get_offline_dictionary():
+    """Return the local OfflineDictionary, or None if there is none."""
+    global _offline, _offline_checked
+    if not _offline_checked:
+        with _init_lock:
+            if not _offline_checked:
+                path = env_str("AVA_OFFLINE_DICTIONARY", DEFAULT_OFFLINE_DICTIONARY)
+                if path != "off" and os.path.exists(path):
+                    try:
+                        _offline = OfflineDictionary(path)
+                    except (OSError, ValueError) as e:
+                        log.error("Offline dictionary %s disabled: %s", path, e)
+                _offline_checked = True
+    return _offline
+
+
+def set_offline_dictionary(offline):
+    """Replace the local dictionary (an OfflineDictionary, or None to disable it)."""
+    global _offline, _offline_checked
+    _offline, _offline_checked = offline, True
+
+
+# ===============================
+# HTTP session (created on first use)
+# ===============================
+# One pooled keep-alive session for all lookups, instead of a new TCP + TLS
+# connection per requests.get() call.
+# Settings (environment variables):
+#   AVA_HTTP_POOL_SIZE     -> connections kept open to the API (default 10)
+#   AVA_HTTP_MAX_PER_HOST  -> max concurrent API requests (default 8)
+_session = None
+
+
+def get_session() -> PooledSession:
+    """Return the shared pooled HTTP session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _init_lock:
+            if _session is None:
+                _session = PooledSession(
+                    pool_size=env_int("AVA_HTTP_POOL_SIZE", 10),
+                    max_per_host=env_int("AVA_HTTP_MAX_PER_HOST", 8),
+                )
+    return _session
+
+
+def warm_up() -> bool:
+    """Open the connection to the dictionary API ahead of the first lookup."""
+    return get_session().warm_up(API_URL)
+
+
+def pool_stats() -> dict:
+    """Connection pool statistics (connections created/reused, wait time)."""
+    return get_session().stats()
+
+
+# ===============================
+# Async HTTP client (created on first use, per event loop)
+# ===============================
+# get_meaning_async() calls the API with httpx's AsyncClient when httpx is
+# installed, so a slow API only holds a coroutine, not a thread.
+# Settings (environment variables):
+#   AVA_DICTIONARY_ASYNC_TIMEOUT -> seconds get_meaning_async() may spend on
+#                                   one word in total, waiting included (default 3)
+#   AVA_HTTP_ASYNC_CONNECTIONS   -> max concurrent API requests of the async
+#                                   client (default 100); extra lookups wait
+# ASYNC_TIMEOUT is a module variable so tests can shorten it.
+ASYNC_TIMEOUT = env_float("AVA_DICTIONARY_ASYNC_TIMEOUT", 3.0)
+_async_clients = weakref.WeakKeyDictionary()  # event loop -> (httpx.AsyncClient, Semaphore)
+
+
+def get_async_client():
+    """
+    Return (client, slots) for the running event loop: the httpx.AsyncClient
+    (httpx must be installed) and the semaphore that limits concurrent calls.
+    """
+    loop = asyncio.get_running_loop()
+    pair = _async_clients.get(loop)
+    if pair is None:
+        connections = env_int("AVA_HTTP_ASYNC_CONNECTIONS", 100)
+        client = httpx.AsyncClient(
+            timeout=ASYNC_TIMEOUT,
+            limits=httpx.Limits(max_connections=connections, max_keepalive_connections=connections),
+        )
+        # Callers wait on the semaphore, not in httpx's pool: its queue gets
+        # slow (quadratic) with thousands of waiting requests
+        pair = _async_clients[loop] = (client, asyncio.Semaphore(connections))
+    return pair
+
+
+async def close_async_client():
+    """Close the running loop's async client (e.g. at server shutdown)."""
+    pair = _async_clients.pop(asyncio.get_running_loop(), None)
+    if pair is not None:
+        await pair[0].aclose()
+
+
+# ===============================
+# Request coalescing (single-flight)
+# ===============================
+# When many requests ask for the same word at the same moment (a trending
+# word), only the first one calls the API; the others wait for that call and
+# share its answer.
+_flight = SingleFlight()             # threaded workers
+_async_flight = AsyncSingleFlight()  # asyncio servers
+
+
+def flight_stats() -> dict:
+    """How many API lookups ran, and how many callers were coalesced into them."""
+    threaded, async_ = _flight.stats(), _async_flight.stats()
+    return {
+        "threaded_calls": threaded["calls"],
+        "threaded_coalesced": threaded["coalesced"],
+        "async_calls": async_["calls"],
+        "async_coalesced": async_["coalesced"],
+        "coalesced": threaded["coalesced"] + async_["coalesced"],
+    }
+
+
+@metrics.collector
+def _metrics():
+    # Counters the cache and the single-flight groups already keep
+    # (nothing is created just to be scraped)
+    out = []
+    if _cache is not None:
+        stats = _cache.stats()
+        out.append(("ava_dictionary_cache_hits_total", "counter", "Dictionary cache hits, by tier.",
+                    [({"tier": "memory"}, stats["memory_hits"]), ({"tier": "disk"}, stats["disk_hits"])]))
+        out.append(("ava_dictionary_cache_misses_total", "counter", "Dictionary cache misses.",
+                    [({}, stats["misses"])]))
+    flights = flight_stats()
+    out.append(("ava_dictionary_upstream_calls_total", "counter", "Dictionary API lookups started.",
+                [({"mode": "threaded"}, flights["threaded_calls"]), ({"mode": "async"}, flights["async_calls"])]))
+    out.append(("ava_dictionary_coalesced_total", "counter", "Lookups that shared another caller's API call.",
+                [({}, flights["coalesced"])]))
+    return out
+
 
 # ===============================
 # FUNCTION: get_meaning()
@@ -7,38 +232,162 @@ def get_meaning(word: str) -> str:
     """
     Fetch meaning of a given word using the Free Dictionary API.
     API Used: https://api.dictionaryapi.dev/
-    
+
+    Lookup order:
+    1. The local offline dictionary file, if there is one (no network at all)
+    2. The cache (see dictionary_cache.py): found meanings for a long time,
+       "not found" answers for a shorter time
+    3. The API. Network problems are NOT cached, so the next request tries
+       the API again.
+
     Parameters:
         word (str): The word whose meaning you want to fetch.
-    
+
     Returns:
         str: The first meaning of the word if found,
              otherwise returns "Meaning not found."
     """
+    key = word.strip().lower()  # same word in any letter case -> same cache entry
+
+    # 1 + 2. Local offline dictionary, then the cache
+    hit, meaning = _lookup_local(word, key)
+
+    # 3. Ask the API (one shared call per word, however many callers)
+    if not hit:
+        try:
+            meaning = _flight.do(key, _fetch_and_cache, word, key)
+        except Exception:
+            # The API is down / timed out / sent garbage -> answer, but don't cache
+            if metrics.ENABLED:
+                metrics.UPSTREAM_ERRORS.inc()
+            return NOT_FOUND
+    return meaning if meaning is not None else NOT_FOUND
+
+
+# ===============================
+# FUNCTION: get_meaning_async()
+# ===============================
+async def get_meaning_async(word: str) -> str:
+    """
+    Same as get_meaning(), for asyncio code.
+
+    The local dictionary and the cache are checked in a worker thread: the
+    cache's SQLite tier reads from disk under a lock, which must not stall
+    the event loop. Concurrent coroutines asking for the same word share
+    one API call, made with the async client (or, without httpx, in a
+    worker thread and coalesced with threaded callers too). The whole
+    lookup gets at most ASYNC_TIMEOUT seconds; a call that runs late still
+    fills the cache for the next ask.
+    """
+    key = word.strip().lower()
+    hit, meaning = await asyncio.to_thread(_lookup_local, word, key)
+    if not hit:
+        try:
+            meaning = await asyncio.wait_for(
+                _async_flight.do(key, _fetch_and_cache_async, word, key), ASYNC_TIMEOUT
+            )
+        except Exception:
+            # Timed out / API down -> answer, but don't cache
+            if metrics.ENABLED:
+                metrics.UPSTREAM_ERRORS.inc()
+            return NOT_FOUND
+    return meaning if meaning is not None else NOT_FOUND
+
+
+# ===============================
+# Helper: lookups that never touch the network
+# ===============================
+def _lookup_local(word: str, key: str):
+    """
+    Try the offline dictionary, then the cache.
+    Returns (True, meaning_or_None) on a hit, (False, None) otherwise.
+    """
+    offline = get_offline_dictionary()
+    if offline is not None:
+        try:
+            meaning = offline.lookup(word)
+        except (ValueError, IndexError, struct.error) as e:
+            # Damaged records the open-time checks cannot see: stop using the file
+            log.error("Offline dictionary %s disabled: %s", offline.path, e)
+            set_offline_dictionary(None)
+            meaning = None
+        if meaning is not None:
+            return True, meaning
+    return get_cache().get(key)
 
+
+# ===============================
+# Helper: fetch + cache (run once per coalesced group)
+# ===============================
+def _fetch_and_cache(word: str, key: str):
+    """Call the API and remember the answer (None = "not found")."""
+    meaning = _fetch(word)
+    get_cache().put(key, meaning)
+    return meaning
+
+
+async def _fetch_and_cache_async(word: str, key: str):
+    """Async _fetch_and_cache(): the network wait does not hold a thread."""
+    if httpx is None:
+        return await asyncio.to_thread(_flight.do, key, _fetch_and_cache, word, key)
+    meaning = await _fetch_async(word)
+    await asyncio.to_thread(get_cache().put, key, meaning)  # SQLite write: keep it off the loop
+    return meaning
+
+
+# ===============================
+# Helper: call the API
+# ===============================
+def _fetch(word: str):
+    """
+    Call the dictionary API once.
+
+    Returns:
+        str: the first definition, or None if the API does not know the word.
+
+    Raises:
+        Exception: on network errors or server-side (5xx/429) failures.
+    """
     # 1. Construct the API URL dynamically for the word
     # Example: if word="umbrella", the URL becomes:
     # https://api.dictionaryapi.dev/api/v2/entries/en/umbrella
-    url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
+    url = API_URL.format(word=word)
+
+    # 2. Send a GET request to the API through the shared keep-alive session
+    # - timeout=5 means wait at most 5 seconds for a response
+    res = get_session().get(url, timeout=5)
+
+    # 3. 404 is the API's way to say "no such word" -> a real answer, cacheable
+    if res.status_code == 404:
+        return None
+    res.raise_for_status()
+
+    # 4. Extract the first definition from the JSON response
+    return _first_definition(res.json())
+
 
+async def _fetch_async(word: str):
+    """_fetch() with the async client: same answers, same errors."""
+    client, slots = get_async_client()
+    async with slots:
+        res = await client.get(API_URL.format(word=word))
+    if res.status_code == 404:
+        return None
+    res.raise_for_status()
+    return _first_definition(res.json())
+
+
+def _first_definition(data):
+    """
+    The first definition in an API answer, or None.
+
+    The API returns a structured JSON like this:
+    data[0] → First result (there may be multiple results)
+    ["meanings"][0] → First meaning category (like noun, verb, etc.)
+    ["definitions"][0]["definition"] → The actual meaning text
+    """
     try:
-        # 2. Send a GET request to the API
-        # - requests.get() makes an HTTP GET call to the API
-        # - timeout=5 means wait at most 5 seconds for a response
-        # - .json() converts the JSON response from the API into a Python dictionary/list
-        res = requests.get(url, timeout=5).json()
-        
-        # 3. Extract the first definition from the JSON response
-        # The API returns a structured JSON like this:
-        # res[0] → First result (there may be multiple results)
-        # ["meanings"][0] → First meaning category (like noun, verb, etc.)
-        # ["definitions"][0]["definition"] → The actual meaning text
-        return res[0]["meanings"][0]["definitions"][0]["definition"]
-    
-    except Exception:
-        # 4. If:
-        # - The API is down
-        # - The word is not found
-        # - The JSON structure is different/unexpected
-        # Then we safely return this message instead of crashing the program
-        return "Meaning not found."
+        return data[0]["meanings"][0]["definitions"][0]["definition"]
+    except (LookupError, TypeError):
+        # The JSON structure is different/unexpected -> treat as not found
+        return None
@@ -0,0 +1,197 @@
+import logging    # Disk tier problems are logged, never raised
+import os         # Process id (a forked worker must open its own connection)
+import sqlite3    # Persistent on-disk cache
+import threading  # Locks: Flask may answer several requests at once
+import time       # Expiry timestamps
+from collections import OrderedDict  # In-process LRU
+
+log = logging.getLogger(__name__)
+
+
+# ===============================
+# CLASS: DictionaryCache
+# ===============================
+class DictionaryCache:
+    """
+    Two-tier cache for dictionary meanings.
+
+    Tier 1: an in-process LRU (fast, limited to `max_memory` words).
+    Tier 2: an SQLite file shared by every process and kept across restarts.
+
+    Both tiers store a meaning string for found words, or None for words the
+    API does not know ("negative" entries). Negative entries use the shorter
+    `negative_ttl`, so typos stop hitting the API without hiding words that
+    are added to the dictionary later.
+
+    The disk tier is best effort: if the file cannot be opened, read or
+    written (unusable directory, "database is locked", full disk, ...) the
+    lookup counts as a miss and the store keeps the memory tier only. The
+    problem is logged, and never changes an answer.
+
+    Args:
+        path (str, optional): SQLite file. None -> memory tier only.
+        ttl (float): Seconds a found meaning stays valid.
+        negative_ttl (float): Seconds a "not found" result stays valid.
+        max_memory (int): Max words kept in the in-process LRU.
+    """
+
+    def __init__(self, path: str = None, ttl: float = 7 * 24 * 3600,
+                 negative_ttl: float = 3600, max_memory: int = 1024):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_memory = max_memory
+
+        self._memory = OrderedDict()  # word -> (meaning or None, expires_at)
+        self._lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
+
+        # Counters (read them with stats())
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.negative_hits = 0  # hits (either tier) that were "not found" entries
+        self.misses = 0
+        self.stores = 0
+        self.errors = 0  # disk tier failures
+        self._failing = False  # log a failure once, until the disk tier works again
+
+    # ===============================
+    # SQLite connection (opened lazily, once per process)
+    # ===============================
+    def _db(self):
+        if self.path is None:
+            return None
+        if self._conn is None or self._conn_pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # check_same_thread=False: the connection is shared, self._lock serializes it.
+            # timeout=1: a cache that makes a lookup wait longer is worse than a miss
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=1)
+            # WAL: workers sharing the file read while another one writes
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meanings ("
+                " word TEXT PRIMARY KEY,"
+                " meaning TEXT,"            # NULL -> negative entry
+                " expires_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+            self._conn_pid = os.getpid()
+        return self._conn
+
+    # ===============================
+    # Public API
+    # ===============================
+    def get(self, word: str):
+        """
+        Look up `word`.
+
+        Returns:
+            tuple: (True, meaning_or_None) on a hit, (False, None) on a miss.
+        """
+        now = time.time()
+        with self._lock:
+            # 1. Memory tier
+            entry = self._memory.get(word)
+            if entry is not None:
+                if entry[1] > now:
+                    self._memory.move_to_end(word)
+                    self.memory_hits += 1
+                    if entry[0] is None:
+                        self.negative_hits += 1
+                    return True, entry[0]
+                del self._memory[word]
+
+            # 2. Disk tier
+            row = self._disk(
+                lambda db: db.execute("SELECT meaning, expires_at FROM meanings WHERE word = ?", (word,)).fetchone()
+            )
+            if row is not None and row[1] > now:
+                self._remember(word, row[0], row[1])
+                self.disk_hits += 1
+                if row[0] is None:
+                    self.negative_hits += 1
+                return True, row[0]
+
+            self.misses += 1
+            return False, None
+
+    def put(self, word: str, meaning):
+        """Store a meaning (or None for "not found") in both tiers."""
+        expires_at = time.time() + (self.ttl if meaning is not None else self.negative_ttl)
+        with self._lock:
+            self._remember(word, meaning, expires_at)
+            self._disk(lambda db: self._write(
+                db, "INSERT OR REPLACE INTO meanings (word, meaning, expires_at) VALUES (?, ?, ?)",
+                (word, meaning, expires_at),
+            ))
+            self.stores += 1
+
+    def purge_expired(self) -> int:
+        """Delete expired rows from the disk tier; return how many were removed."""
+        with self._lock:
+            removed = self._disk(lambda db: self._write(
+                db, "DELETE FROM meanings WHERE expires_at <= ?", (time.time(),)
+            ))
+            return removed or 0
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and the current memory tier size."""
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "errors": self.errors,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "memory_size": len(self._memory),
+        }
+
+    # ===============================
+    # Helpers
+    # ===============================
+    def _disk(self, operation):
+        """
+        Run `operation(connection)` on the disk tier (caller holds self._lock).
+
+        Returns its result, or None when there is no disk tier or it failed.
+        """
+        if self.path is None:
+            return None
+        try:
+            result = operation(self._db())
+        except (sqlite3.Error, OSError) as e:
+            self.errors += 1
+            if not self._failing:
+                log.warning("Dictionary cache %s unavailable, using memory only: %s", self.path, e)
+                self._failing = True
+            if self._conn is not None:
+                try:
+                    self._conn.close()
+                except sqlite3.Error:
+                    pass
+                self._conn = None  # reopen on the next call (the file may be fixed by then)
+            return None
+        if self._failing:
+            log.info("Dictionary cache %s is available again", self.path)
+            self._failing = False
+        return result
+
+    @staticmethod
+    def _write(db, sql: str, params: tuple) -> int:
+        """Run one write statement and commit; returns the affected row count."""
+        count = db.execute(sql, params).rowcount
+        db.commit()
+        return count
+
+    def _remember(self, word, meaning, expires_at):
+        """Put an entry in the memory tier, evicting the least recently used."""
+        self._memory[word] = (meaning, expires_at)
+        self._memory.move_to_end(word)
+        while len(self._memory) > self.max_memory:
+            self._memory.popitem(last=False)
@@ -0,0 +1,114 @@
+import threading  # Locks and per-host semaphores
+import time       # Measure how long callers wait for a free slot
+from urllib.parse import urlsplit  # Extract "scheme://host:port" from a URL
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# ===============================
+# CLASS: PooledSession
+# ===============================
+class PooledSession:
+    """
+    A shared HTTP session with keep-alive connection pooling.
+
+    requests.get() opens (and closes) a new TCP + TLS connection every call.
+    A Session keeps connections open and reuses them, so only the first
+    request to a host pays for the handshake.
+
+    On top of that:
+    - at most `max_per_host` requests run against one host at the same time
+      (extra callers wait; the wait time is measured)
+    - stats() reports connections created vs. reused
+
+    The session is shared by all threads. urllib3's connection pool is
+    thread-safe, and we never change session state (cookies, headers) after
+    creating it.
+
+    Args:
+        pool_size (int): Connections kept open per host.
+        max_per_host (int): Max concurrent requests per host.
+    """
+
+    def __init__(self, pool_size: int = 10, max_per_host: int = 8):
+        self.pool_size = pool_size
+        self.max_per_host = max_per_host
+
+        self.session = requests.Session()
+        # pool_block=True: never open more than pool_size connections per host
+        self._adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True)
+        self.session.mount("http://", self._adapter)
+        self.session.mount("https://", self._adapter)
+
+        self._lock = threading.Lock()
+        self._host_slots = {}  # "scheme://host:port" -> BoundedSemaphore
+
+        # Counters (read them with stats())
+        self.requests = 0
+        self.waits = 0           # requests that had to wait for a slot
+        self.wait_seconds = 0.0  # total time spent waiting for a slot
+        self.max_wait_seconds = 0.0
+
+    def _slots(self, url: str):
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        with self._lock:
+            slots = self._host_slots.get(host)
+            if slots is None:
+                slots = self._host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return slots
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Same as requests.get(), but through the shared pool and per-host limit."""
+        slots = self._slots(url)
+
+        # Fast path: a slot is free right away
+        if not slots.acquire(blocking=False):
+            start = time.perf_counter()
+            slots.acquire()
+            waited = time.perf_counter() - start
+            with self._lock:
+                self.waits += 1
+                self.wait_seconds += waited
+                self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+        try:
+            with self._lock:
+                self.requests += 1
+            return self.session.get(url, **kwargs)
+        finally:
+            slots.release()
+
+    def warm_up(self, url: str, timeout: float = 5) -> bool:
+        """
+        Open a connection to the host of `url` ahead of time (DNS + TCP + TLS),
+        so the first real lookup does not pay for it. Returns False on failure.
+        """
+        parts = urlsplit(url)
+        try:
+            self.get(f"{parts.scheme}://{parts.netloc}/", timeout=timeout).close()
+            return True
+        except requests.RequestException:
+            return False
+
+    def stats(self) -> dict:
+        """Return pool statistics (connections created/reused, wait times)."""
+        created = 0
+        pooled_requests = 0
+        pools = self._adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                created += pool.num_connections
+                pooled_requests += pool.num_requests
+        return {
+            "requests": self.requests,
+            "connections_created": created,
+            "connections_reused": max(pooled_requests - created, 0),
+            "waits": self.waits,
+            "wait_seconds_total": self.wait_seconds,
+            "wait_seconds_max": self.max_wait_seconds,
+            "pool_size": self.pool_size,
+            "max_per_host": self.max_per_host,
+        }
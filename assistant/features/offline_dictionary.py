@@ -0,0 +1,129 @@
+import mmap    # Map the dictionary file into memory instead of reading it
+import os      # File paths and atomic replace
+import struct  # Read/write the binary header and offsets table
+
+# ===============================
+# File format
+# ===============================
+# A compact, read-only file that is searched in place (memory-mapped):
+#
+#   header   : b"AVADICT1" + uint32 count + uint32 reserved       (16 bytes)
+#   offsets  : (count + 1) x uint64, where record i starts in the file;
+#              the extra last offset is the end of the last record
+#   records  : word (UTF-8) + b"\0" + definition (UTF-8), sorted by word bytes
+#
+# A lookup is a binary search over the offsets table: ~log2(count) record
+# keys are touched, so only a handful of pages are ever read from disk and
+# memory use does not grow with the size of the dictionary.
+MAGIC = b"AVADICT1"
+_HEADER = struct.Struct("<8sII")
+_OFFSET = struct.Struct("<Q")
+
+
+def _key(word: str) -> bytes:
+    """Normalize a word the same way for building and for lookups."""
+    return word.strip().lower().encode("utf-8")
+
+
+# ===============================
+# CLASS: OfflineDictionary
+# ===============================
+class OfflineDictionary:
+    """
+    Memory-mapped, read-only dictionary built by build_offline_dictionary().
+
+    Args:
+        path (str): The .avadict file to open.
+
+    Raises:
+        ValueError: if the file is not a valid dictionary file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            # The mapping stays valid after the file object is closed
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mm) < _HEADER.size:
+            raise ValueError(f"{path}: not an offline dictionary file")
+        magic, self.count, _ = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not an offline dictionary file")
+        # A truncated or inconsistent file must fail here, not in lookup()
+        table_end = _HEADER.size + (self.count + 1) * _OFFSET.size
+        if len(self._mm) < table_end or self._offset(0) != table_end or self._offset(self.count) != len(self._mm):
+            raise ValueError(f"{path}: corrupt offline dictionary file")
+
+    def __len__(self):
+        return self.count
+
+    def _offset(self, i: int) -> int:
+        return _OFFSET.unpack_from(self._mm, _HEADER.size + i * _OFFSET.size)[0]
+
+    def lookup(self, word: str):
+        """Return the definition of `word`, or None if it is not in the file."""
+        key = _key(word)
+        mm = self._mm
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = self._offset(mid)
+            sep = mm.find(b"\0", start)
+            current = mm[start:sep]
+            if current == key:
+                return mm[sep + 1:self._offset(mid + 1)].decode("utf-8")
+            if current < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def close(self):
+        self._mm.close()
+
+
+# ===============================
+# FUNCTION: build_offline_dictionary()
+# ===============================
+def build_offline_dictionary(entries, path: str) -> int:
+    """
+    Write a dictionary file from (word, definition) pairs.
+
+    Words are normalized (trimmed, lowercased); the first definition seen for
+    a word wins. The file is written to a temporary name and renamed, so a
+    running server never maps a half-written file.
+
+    Args:
+        entries (iterable): (word, definition) pairs.
+        path (str): Output file.
+
+    Returns:
+        int: Number of words written.
+    """
+    # 1. Normalize and de-duplicate (keep the first definition)
+    records = {}
+    for word, definition in entries:
+        key = _key(word)
+        if key and b"\0" not in key and definition and key not in records:
+            records[key] = definition.strip().encode("utf-8")
+
+    # 2. Lay out: header, offsets table, then sorted records
+    keys = sorted(records)
+    offsets = []
+    position = _HEADER.size + (len(keys) + 1) * _OFFSET.size
+    for key in keys:
+        offsets.append(position)
+        position += len(key) + 1 + len(records[key])
+    offsets.append(position)
+
+    # 3. Write atomically
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(keys), 0))
+        for offset in offsets:
+            f.write(_OFFSET.pack(offset))
+        for key in keys:
+            f.write(key + b"\0" + records[key])
+    os.replace(tmp, path)
+    return len(keys)
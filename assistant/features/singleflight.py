@@ -0,0 +1,112 @@
+import asyncio    # Async variant for asyncio servers
+import threading  # Thread variant for threaded Flask workers
+
+
+# ===============================
+# CLASS: SingleFlight (threads)
+# ===============================
+class SingleFlight:
+    """
+    Run at most one call per key at a time; concurrent callers with the same
+    key wait for that call and share its result (or its exception).
+
+    Example: 50 threads ask for the meaning of a trending word at once ->
+    one HTTP request, 49 "coalesced" callers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> _Call in progress
+
+        # Counters (read them with stats())
+        self.calls = 0      # calls that actually ran
+        self.coalesced = 0  # callers that shared another caller's call
+
+    def do(self, key, fn, *args):
+        """Return fn(*args), sharing one in-flight call per key."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+
+        # Followers: wait for the leader and reuse its outcome
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        # Leader: run the call, then wake everybody up
+        try:
+            call.result = fn(*args)
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> dict:
+        return {"calls": self.calls, "coalesced": self.coalesced}
+
+
+class _Call:
+    """One in-flight call: followers wait on `done`, then read result/error."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+# ===============================
+# CLASS: AsyncSingleFlight (asyncio)
+# ===============================
+class AsyncSingleFlight:
+    """
+    Same idea as SingleFlight for coroutines: concurrent `await do(key, ...)`
+    with the same key share one task.
+
+    Tasks belong to an event loop, so calls are grouped per running loop
+    (several loops in different threads never share a task).
+    """
+
+    def __init__(self):
+        self._calls = {}  # (loop, key) -> Task in progress
+
+        # Counters (read them with stats())
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key, coro_fn, *args):
+        """Return await coro_fn(*args), sharing one in-flight call per key."""
+        loop = asyncio.get_running_loop()
+        slot = (loop, key)
+
+        task = self._calls.get(slot)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.calls += 1
+            # The call runs in its own task, so cancelling the first caller
+            # does not cancel it for everybody else
+            task = self._calls[slot] = loop.create_task(coro_fn(*args))
+            task.add_done_callback(lambda t: self._finish(slot, t))
+
+        # shield: a cancelled waiter must not cancel the shared task
+        return await asyncio.shield(task)
+
+    def _finish(self, slot, task):
+        self._calls.pop(slot, None)
+        # Mark the exception as retrieved even if every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        return {"calls": self.calls, "coalesced": self.coalesced}
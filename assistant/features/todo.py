@@ -1,33 +1,313 @@
-import json          # To read/write tasks as JSON in a file
+import bisect        # Sorted id lists (pages in id order)
 import os            # To check if the task file exists
+import threading     # Serialize changes to the in-memory store
 from datetime import datetime  # To store timestamps for tasks
 
+from assistant import metrics  # Todo write counters (AVA_METRICS)
+from assistant.config import data_dir, env_float, env_int, env_str
+from assistant.features.todo_journal import TaskJournal  # Append-only change log + snapshot
+from assistant.features.todo_sqlite import MAX_ID, SQLiteTaskBackend
+
 # ===============================
 # Constants
 # ===============================
-TODO_FILE = "tasks.json"  # File to store all tasks
+TODO_FILE = "tasks.ndjson"     # File to store all tasks (json backend), in AVA_DATA_DIR
+LEGACY_TODO_FILE = "tasks.json"  # Older file name/format, migrated on first load
+TODO_DB = "tasks.sqlite3"      # Database file (sqlite backend), in AVA_DATA_DIR
+MAX_PAGE_SIZE = 1000           # Largest page get_tasks_page() returns
+MAX_TASK_ID = MAX_ID           # Largest possible task id (an SQLite INTEGER)
 
 # ===============================
-# Load tasks from file (if it exists)
+# CLASS: TaskStore
 # ===============================
-if os.path.exists(TODO_FILE):
-    with open(TODO_FILE, "r") as f:
-        # Read tasks from JSON file and convert to Python list of dictionaries
-        tasks = json.load(f)
-else:
-    # If file doesn't exist, start with an empty task list
-    tasks = []
+class TaskStore:
+    """
+    All tasks, with indexes so no operation has to scan the whole list:
+
+        by_id     : id -> task dict
+        by_title  : casefolded title -> id (duplicate check)
+        by_status : "pending"/"done" -> sorted list of ids
+        ids       : sorted list of all ids
+
+    Tasks are listed in id order (= the order they were added). Adding a
+    task is an append (new ids are always the largest); removing/marking
+    is a binary search plus a list insert/delete. Filtering by status is
+    O(result), and a page is found with a binary search, whatever the
+    number of tasks.
+
+    Ids are unique and never reused: `next_id` only grows (it is saved
+    with the tasks, see todo_journal.py).
+
+    Args:
+        tasks (list, optional): Task dicts to start with (e.g. from the file).
+        next_id (int): The id sequence's high-water mark.
+    """
+
+    def __init__(self, tasks=None, next_id: int = 1):
+        self.by_id = {}
+        self.by_title = {}
+        self.by_status = {"pending": [], "done": []}
+        self.ids = []
+        self.next_id = next_id
+
+        for task in tasks or []:
+            if task["id"] in self.by_id:
+                # Old files can contain the same id twice (ids used to be
+                # len(tasks) + 1, reused after a removal): give it a new one
+                task["id"] = self.next_id
+            self._index(task)
+
+    def _index(self, task: dict):
+        self.by_id[task["id"]] = task
+        self.by_title.setdefault(task["title"].casefold(), task["id"])
+        _insert_sorted(self.by_status.setdefault(task["status"], []), task["id"])
+        _insert_sorted(self.ids, task["id"])
+        self.next_id = max(self.next_id, task["id"] + 1)
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def get(self, task_id):
+        """Return the task with this id, or None."""
+        return self.by_id.get(task_id)
+
+    def find_title(self, title: str):
+        """Return the task with this title (any letter case), or None."""
+        task_id = self.by_title.get(title.casefold())
+        return None if task_id is None else self.by_id[task_id]
+
+    def add(self, task: dict):
+        """Add a task dict; a new id is assigned if it has none."""
+        if task.get("id") is None:
+            task["id"] = self.next_id
+        elif task["id"] in self.by_id:
+            raise ValueError(f"duplicate task id {task['id']}")
+        self._index(task)
+        return task
+
+    def remove(self, task_id):
+        """Remove and return the task with this id, or None."""
+        task = self.by_id.pop(task_id, None)
+        if task is not None:
+            key = task["title"].casefold()
+            if self.by_title.get(key) == task_id:
+                del self.by_title[key]
+            _remove_sorted(self.by_status[task["status"]], task_id)
+            _remove_sorted(self.ids, task_id)
+        return task
+
+    def set_status(self, task_id, status: str):
+        """Change a task's status; returns the task, or None if there is no such id."""
+        task = self.by_id.get(task_id)
+        if task is not None and task["status"] != status:
+            _remove_sorted(self.by_status[task["status"]], task_id)
+            task["status"] = status
+            _insert_sorted(self.by_status.setdefault(status, []), task_id)
+        return task
+
+    def filter(self, status: str = None) -> list:
+        """All tasks (status=None) or the tasks with one status, in id order."""
+        ids = self.ids if status is None else self.by_status.get(status, ())
+        return [self.by_id[i] for i in ids]
+
+    def page(self, status: str = None, after: int = 0, offset: int = 0, limit: int = 20):
+        """
+        One page of tasks in id order: the tasks with an id greater than
+        `after` (a cursor), skipping `offset` of them, at most `limit`.
+
+        Returns:
+            tuple: (tasks, more) where `more` tells whether tasks follow.
+        """
+        ids = self.ids if status is None else self.by_status.get(status, [])
+        start = bisect.bisect_right(ids, after) + offset
+        chunk = ids[start:start + limit]
+        return [self.by_id[i] for i in chunk], start + limit < len(ids)
+
+    def to_list(self) -> list:
+        return list(self.by_id.values())
+
+
+def _insert_sorted(ids: list, task_id: int):
+    # New ids are always the largest: append without searching
+    if not ids or ids[-1] < task_id:
+        ids.append(task_id)
+    else:
+        bisect.insort(ids, task_id)
+
+
+def _remove_sorted(ids: list, task_id: int):
+    i = bisect.bisect_left(ids, task_id)
+    if i < len(ids) and ids[i] == task_id:
+        del ids[i]
+
 
 # ===============================
-# Helper function: Save tasks to file
+# CLASS: JSONTaskBackend
 # ===============================
-def _save_tasks():
+class JSONTaskBackend:
     """
-    Write the current tasks list to the JSON file.
-    indent=2 makes the file human-readable.
+    Tasks in tasks.ndjson + tasks.ndjson.journal (see todo_journal.py), indexed
+    in memory by a TaskStore. Fast, but each process has its own copy: use
+    it with a single worker process (use the sqlite backend otherwise).
+
+    Args:
+        path (str): The snapshot file.
+        compact_every (int): Journal records before the snapshot is rewritten.
+        window (float): Seconds a commit waits to batch a burst of changes.
+        legacy_path (str, optional): Old tasks.json to migrate from.
     """
-    with open(TODO_FILE, "w") as f:
-        json.dump(tasks, f, indent=2)
+
+    def __init__(self, path: str, compact_every: int = 1000, window: float = 0.005,
+                 legacy_path: str = None):
+        self.journal = TaskJournal(path, compact_every=compact_every, window=window,
+                                   legacy_path=legacy_path)
+        tasks, next_id = self.journal.load()
+        self.store = TaskStore(tasks, next_id)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.store)
+
+    def add(self, title: str, created_at: str):
+        """Add a pending task. Returns the task dict, or None if the title exists."""
+        with self._lock:
+            if self.store.find_title(title) is not None:
+                return None
+            task = self.store.add({
+                "id": None,  # the store assigns the next id of the sequence
+                "title": title,
+                "status": "pending",
+                "created_at": created_at,
+            })
+            seq = self.journal.append({"op": "add", "task": task})
+        self._commit(seq)
+        return task
+
+    def tasks(self, status: str = None) -> list:
+        return self.store.filter(status)
+
+    def page(self, status: str = None, after: int = 0, offset: int = 0, limit: int = 20):
+        return self.store.page(status, after, offset, limit)
+
+    def remove(self, task_id):
+        with self._lock:
+            task = self.store.remove(task_id)
+            if task is None:
+                return None
+            seq = self.journal.append({"op": "remove", "id": task_id})
+        self._commit(seq)
+        return task
+
+    def set_status(self, task_id, status: str):
+        with self._lock:
+            task = self.store.set_status(task_id, status)
+            if task is None:
+                return None
+            seq = self.journal.append({"op": "status", "id": task_id, "status": status})
+        self._commit(seq)
+        return task
+
+    def _commit(self, seq: int):
+        """
+        Wait until the change is on disk (shared with every change made in
+        the same few milliseconds, see TaskJournal.commit()). Now and then
+        the full list is written as a new snapshot.
+        """
+        self.journal.commit(seq)
+        if self.journal.due_for_compaction():
+            with self._lock:  # no new changes while the list is copied
+                if self.journal.due_for_compaction():
+                    self.journal.compact(self.store.to_list(), self.store.next_id)
+
+
+# ===============================
+# Storage backend (created on first use)
+# ===============================
+# Nothing is read at import time: workers that never see a todo command
+# never load the task file.
+# Settings (environment variables):
+#   AVA_TODO_BACKEND        -> "json" (default): tasks.ndjson + journal, one worker process
+#                              "sqlite": an SQLite file shared by all worker processes
+#   AVA_DATA_DIR            -> directory of the files below (default: current directory)
+#   AVA_TODO_FILE           -> json backend file (default <AVA_DATA_DIR>/tasks.ndjson)
+#   AVA_TODO_DB             -> sqlite backend file (default <AVA_DATA_DIR>/tasks.sqlite3)
+#   AVA_TODO_COMPACT_EVERY  -> json backend: journaled changes before the snapshot
+#                              is rewritten (default 1000)
+#   AVA_TODO_COMMIT_WINDOW_MS -> json backend: how long a commit waits to batch
+#                              the changes of a burst into one fsync (default 5)
+_backend = None
+_init_lock = threading.Lock()  # First use can happen on several threads at once
+
+
+def get_backend():
+    """Return the todo storage backend, loading it on first use."""
+    global _backend
+    if _backend is None:
+        with _init_lock:
+            if _backend is None:
+                _backend = _create_backend()
+    return _backend
+
+
+def backend_kind() -> str:
+    """
+    "json" or "sqlite": the kind of the loaded backend, or of the one
+    get_backend() would create (AVA_TODO_BACKEND), without loading it.
+    """
+    backend = _backend
+    if backend is not None:
+        return "sqlite" if isinstance(backend, SQLiteTaskBackend) else "json"
+    return "sqlite" if env_str("AVA_TODO_BACKEND", "json") == "sqlite" else "json"
+
+
+def set_backend(backend):
+    """Replace the storage backend (e.g. a temporary one in tests)."""
+    global _backend
+    _backend = backend
+
+
+@metrics.collector
+def _journal_metrics():
+    # fsyncs of the JSON backend's journal (nothing before the store is loaded)
+    backend = _backend
+    if not isinstance(backend, JSONTaskBackend):
+        return []
+    stats = backend.journal.stats()
+    return [
+        ("ava_todo_journal_records_total", "counter", "Todo changes queued for the journal.",
+         [({}, stats["queued"])]),
+        ("ava_todo_journal_fsyncs_total", "counter", "Journal fsyncs (one per group commit).",
+         [({}, stats["commits"])]),
+    ]
+
+
+def _create_backend():
+    directory = data_dir()
+    json_file = os.path.abspath(env_str("AVA_TODO_FILE", os.path.join(directory, TODO_FILE)))
+    legacy_file = os.path.join(os.path.dirname(json_file), LEGACY_TODO_FILE)
+
+    if env_str("AVA_TODO_BACKEND", "json") == "sqlite":
+        backend = SQLiteTaskBackend(os.path.abspath(env_str("AVA_TODO_DB", os.path.join(directory, TODO_DB))))
+        # First start on SQLite: bring the tasks of the JSON file along, then
+        # rename the JSON files to *.migrated (like TaskJournal._migrate) so
+        # the import runs once - otherwise removing every task and restarting
+        # would bring the removed tasks back
+        if len(backend) == 0 and (os.path.exists(json_file) or os.path.exists(legacy_file)):
+            backend.import_tasks(*TaskJournal(json_file, legacy_path=legacy_file).load())
+            for path in (json_file, json_file + ".journal", legacy_file, legacy_file + ".journal"):
+                try:
+                    os.replace(path, path + ".migrated")
+                except FileNotFoundError:  # not there, or another worker was first
+                    pass
+        return backend
+
+    return JSONTaskBackend(
+        json_file,
+        compact_every=env_int("AVA_TODO_COMPACT_EVERY", 1000),
+        window=env_float("AVA_TODO_COMMIT_WINDOW_MS", 5) / 1000,
+        legacy_path=legacy_file,
+    )
+
 
 # ===============================
 # Add a task
@@ -46,22 +326,12 @@ def add_task(title: str):
     if not title:
         return "Task cannot be empty"
 
-    # Check for duplicates (case-insensitive)
-    for t in tasks:
-        if t["title"].lower() == title.lower():
-            return "Task already exists"
-
-    # Create the task dictionary
-    task = {
-        "id": len(tasks) + 1,           # Simple incremental ID
-        "title": title,
-        "status": "pending",            # Default status
-        "created_at": datetime.now().isoformat()  # Store creation time
-    }
-
-    # Add to list and save to file
-    tasks.append(task)
-    _save_tasks()
+    # Store it; the backend refuses duplicates (case-insensitive)
+    task = get_backend().add(title, datetime.now().isoformat())  # Store creation time
+    if task is None:
+        return "Task already exists"
+    if metrics.ENABLED:
+        metrics.TODO_WRITES.inc("add")
     return f"Task added: {title}"
 
 # ===============================
@@ -79,8 +349,54 @@ def get_tasks(status: str = None):
     """
     if status not in ("pending", "done", None):
         return []
-    # Filter tasks if status is provided
-    return [t for t in tasks if status is None or t["status"] == status]
+    # Filter tasks if status is provided (indexed, no full scan)
+    return get_backend().tasks(status)
+
+# ===============================
+# Get tasks one page at a time
+# ===============================
+def get_tasks_page(status: str = None, after: int = 0, limit: int = None, offset: int = 0) -> dict:
+    """
+    Return one page of tasks, in id order.
+
+    Pass the returned "next" cursor as `after` to get the following page;
+    the cost of a page does not depend on how many tasks there are.
+
+    Args:
+        status (str, optional): "pending", "done" or None for all tasks.
+        after (int): Cursor: only tasks with a larger id (0 = from the start).
+        limit (int, optional): Page size (default AVA_TODO_PAGE_SIZE, 20).
+        offset (int): Tasks to skip after the cursor (for "page N").
+
+    Returns:
+        dict: {"tasks": [...], "next": cursor for the next page or None}
+    """
+    if status not in ("pending", "done", None):
+        return {"tasks": [], "next": None}
+    limit = max(1, min(limit or page_size(), MAX_PAGE_SIZE))
+    tasks, more = get_backend().page(status, max(after, 0), max(offset, 0), limit)
+    return {"tasks": tasks, "next": tasks[-1]["id"] if more and tasks else None}
+
+
+def iter_tasks(status: str = None, after: int = 0, batch: int = 500):
+    """Yield every task (or every task with `status`) after the cursor `after`,
+    page by page, without building one big list."""
+    while True:
+        page = get_tasks_page(status, after=after, limit=batch)
+        yield from page["tasks"]
+        if page["next"] is None:
+            return
+        after = page["next"]
+
+
+def page_size() -> int:
+    """Tasks per page for "show tasks" (AVA_TODO_PAGE_SIZE, default 20)."""
+    return max(1, env_int("AVA_TODO_PAGE_SIZE", 20))
+
+
+def format_task(task: dict) -> str:
+    """One display line for a task, e.g. "1. [Pending] Buy milk"."""
+    return f"{task['id']}. [{'Done' if task['status'] == 'done' else 'Pending'}] {task['title']}"
 
 # ===============================
 # Remove a task
@@ -95,13 +411,12 @@ def remove_task(task_id: int):
     Returns:
         str: Success or error message.
     """
-    global tasks
-    for t in tasks:
-        if t["id"] == task_id:
-            tasks.remove(t)  # Remove from list
-            _save_tasks()    # Save updated list to file
-            return f"Removed task: {t['title']}"
-    return "Task not found"
+    t = get_backend().remove(task_id)
+    if t is None:
+        return "Task not found"
+    if metrics.ENABLED:
+        metrics.TODO_WRITES.inc("remove")
+    return f"Removed task: {t['title']}"
 
 # ===============================
 # Mark a task as done
@@ -116,9 +431,9 @@ def mark_done(task_id: int):
     Returns:
         str: Success or error message.
     """
-    for t in tasks:
-        if t["id"] == task_id:
-            t["status"] = "done"
-            _save_tasks()  # Save the change
-            return f"Marked done: {t['title']}"
-    return "Task not found"
+    t = get_backend().set_status(task_id, "done")
+    if t is None:
+        return "Task not found"
+    if metrics.ENABLED:
+        metrics.TODO_WRITES.inc("status")
+    return f"Marked done: {t['title']}"
@@ -0,0 +1,348 @@
+import json      # Snapshot and journal records
+import logging   # Report a damaged journal without crashing
+import os        # Atomic rename, fsync, truncation
+import tempfile  # Temporary file for the snapshot
+import threading  # Group commit: one leader writes for everybody waiting
+import time       # Commit window
+
+log = logging.getLogger(__name__)
+
+
+# ===============================
+# CLASS: TaskJournal
+# ===============================
+class TaskJournal:
+    """
+    Write-ahead journal for the todo list.
+
+    Files:
+        <path>          snapshot (NDJSON): a {"next_id": 8} header line, then
+                        one task per line. The next id is the id sequence's
+                        high-water mark. Older one-document JSON files are
+                        migrated on load.
+        <path>.journal  one compact JSON record per change since the snapshot:
+                          {"op":"add","task":{...}}
+                          {"op":"remove","id":3}
+                          {"op":"status","id":3,"status":"done"}
+
+    A change costs one short append instead of rewriting the whole file.
+    Loading reads the snapshot and replays the journal. Every
+    `compact_every` changes the snapshot is rewritten (temp file + fsync +
+    rename) and the journal emptied, so replay stays short.
+
+    Group commit: append() only queues a record; commit() makes it durable.
+    The first caller in commit() becomes the leader: it waits `window`
+    seconds so the rest of a burst can queue up, then writes every queued
+    record with one write + fsync and wakes everybody up. A burst of 100
+    "add task" lines costs a handful of fsyncs instead of 100.
+
+    A crash can leave at most a half-written last line in the journal; it
+    is dropped on load. A crash between the snapshot rename and emptying
+    the journal is harmless too: replaying a change that is already in the
+    snapshot gives the same result.
+
+    Args:
+        path (str): The snapshot file (e.g. "tasks.ndjson").
+        compact_every (int): Journal records that trigger a compaction.
+        window (float): Seconds a commit leader waits for more records.
+        legacy_path (str, optional): An old tasks.json to migrate from. It
+            becomes the snapshot when `path` does not exist yet, and is
+            merged into it otherwise; then it is renamed to *.migrated.
+    """
+
+    def __init__(self, path: str, compact_every: int = 1000, window: float = 0.005,
+                 legacy_path: str = None):
+        self.path = path
+        self.legacy_path = legacy_path
+        self.journal_path = path + ".journal"
+        self.compact_every = compact_every
+        self.window = window
+        self.records = 0  # records in the journal file right now
+        self._file = None
+
+        # Group commit state
+        self._cond = threading.Condition()  # guards the fields below
+        self._buffer = []      # encoded records not written yet
+        self._queued = 0       # sequence number of the last queued record
+        self._durable = 0      # sequence number of the last fsynced record
+        self._flushing = False  # a leader is writing right now
+        self._io_lock = threading.Lock()  # file writes vs. compaction
+
+        # Counters (read them with stats())
+        self.commits = 0  # fsyncs of the journal
+
+    # ---------- loading ----------
+    def load(self):
+        """
+        Read the snapshot, replay the journal.
+
+        The snapshot is read line by line, so memory holds the tasks but
+        never the whole file text as well.
+
+        Returns:
+            tuple: (task list, next id). The next id is a high-water mark:
+            it only grows, so the id of a removed task is never handed out
+            again, even after a restart.
+        """
+        legacy_path = self.legacy_path if self.legacy_path and os.path.exists(self.legacy_path) else None
+        if legacy_path and not os.path.exists(self.path):
+            return self._migrate(legacy_path)
+
+        tasks = {}  # id -> task, in list order
+        next_id = 1
+        legacy = False
+        duplicates = []
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                header = _parse_header(f.readline())
+                if header is not None:
+                    next_id = header["next_id"]
+                    rows = (json.loads(line) for line in f if line.strip())
+                else:
+                    # Older formats: one JSON document, either a bare list of
+                    # tasks or {"next_id": ..., "tasks": [...]}
+                    legacy = True
+                    f.seek(0)
+                    snapshot = json.loads(f.read() or "[]")
+                    if isinstance(snapshot, list):
+                        snapshot = {"next_id": 1, "tasks": snapshot}
+                    next_id = snapshot["next_id"]
+                    rows = snapshot["tasks"]
+
+                for task in rows:
+                    if task["id"] in tasks:
+                        duplicates.append(task)
+                    else:
+                        tasks[task["id"]] = task
+
+        if tasks:
+            next_id = max(next_id, max(tasks) + 1)
+        if duplicates:
+            # Old files can contain the same id twice (ids used to be
+            # len(tasks) + 1): give those tasks new ids
+            for task in duplicates:
+                task["id"] = next_id
+                tasks[next_id] = task
+                next_id += 1
+
+        self.records, next_id = self._replay(tasks, next_id)
+        if legacy_path:
+            # An old tasks.json next to an existing snapshot (e.g. copied
+            # back in, or written by an older version): merge it instead
+            # of ignoring it
+            next_id = self._merge(tasks, next_id, legacy_path)
+        if legacy or duplicates or legacy_path:
+            # Migrate right away, so journal records always refer to the
+            # ids (and the id sequence) saved in the snapshot
+            self.compact(list(tasks.values()), next_id)
+        if legacy_path:
+            _retire(legacy_path)
+        return list(tasks.values()), next_id
+
+    def _migrate(self, legacy_path: str):
+        """Move the tasks of an old-style file (+ its journal) into this snapshot."""
+        tasks, next_id = TaskJournal(legacy_path, window=0).load()
+        self.compact(tasks, next_id)
+        _retire(legacy_path)
+        log.info("Migrated %d tasks from %s to %s", len(tasks), legacy_path, self.path)
+        return tasks, next_id
+
+    def _merge(self, tasks: dict, next_id: int, legacy_path: str) -> int:
+        """
+        Add the tasks of an old-style file to `tasks` (id -> task).
+
+        A task whose title is already in the list is skipped (titles are
+        unique, case-insensitively). The others get new ids from `next_id`,
+        so they never take the id of a task that was removed.
+
+        Returns:
+            int: The new next id.
+        """
+        titles = {task["title"].casefold() for task in tasks.values()}
+        merged = 0
+        for task in TaskJournal(legacy_path, window=0).load()[0]:
+            if task["title"].casefold() in titles:
+                continue
+            titles.add(task["title"].casefold())
+            tasks[next_id] = dict(task, id=next_id)
+            next_id += 1
+            merged += 1
+        log.info("Merged %d tasks from %s into %s", merged, legacy_path, self.path)
+        return next_id
+
+    def _replay(self, tasks: dict, next_id: int):
+        """Apply the journal to `tasks`; returns (records replayed, next id)."""
+        if not os.path.exists(self.journal_path):
+            return 0, next_id
+        with open(self.journal_path, "rb") as f:
+            data = f.read()
+
+        # A last line without "\n" is a torn write: cut it off so new
+        # records do not get glued to it
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            log.warning("Dropping incomplete last record of %s", self.journal_path)
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(end)
+
+        count = 0
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            op = record["op"]
+            if op == "add":
+                task = record["task"]
+                next_id = max(next_id, task["id"] + 1)
+                if task["id"] in tasks:
+                    tasks[task["id"]].update(task)  # already in the snapshot
+                else:
+                    tasks[task["id"]] = task
+            elif op == "remove":
+                tasks.pop(record["id"], None)
+            elif op == "status":
+                if record["id"] in tasks:
+                    tasks[record["id"]]["status"] = record["status"]
+            count += 1
+        return count, next_id
+
+    # ---------- writing ----------
+    def append(self, record: dict) -> int:
+        """
+        Queue one change record (not written yet, see commit()).
+
+        Returns:
+            int: The record's sequence number, to pass to commit().
+        """
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+        with self._cond:
+            self._buffer.append(line)
+            self._queued += 1
+            return self._queued
+
+    def commit(self, seq: int):
+        """Return once record `seq` (and every record before it) is on disk."""
+        with self._cond:
+            while self._durable < seq:
+                if not self._flushing:
+                    self._flushing = True  # nobody is writing: lead this group
+                    break
+                self._cond.wait()  # a leader is writing: wait for its commit
+            else:
+                return  # already written by another caller's commit
+
+        last = None
+        try:
+            if self.window > 0:
+                time.sleep(self.window)  # let the rest of the burst queue up
+            with self._io_lock:
+                with self._cond:
+                    lines, self._buffer = self._buffer, []
+                    last = self._queued
+                try:
+                    if lines:
+                        if self._file is None:
+                            _make_parent(self.journal_path)  # AVA_DATA_DIR may not exist yet
+                            self._file = open(self.journal_path, "ab")
+                        self._file.write(b"".join(lines))
+                        self._file.flush()
+                        os.fsync(self._file.fileno())
+                        self.records += len(lines)
+                        self.commits += 1
+                except BaseException:
+                    with self._cond:
+                        self._buffer[:0] = lines  # keep them for the next leader
+                    last = None
+                    raise
+        finally:
+            with self._cond:
+                self._flushing = False
+                if last is not None:
+                    self._durable = max(self._durable, last)
+                self._cond.notify_all()
+
+    def due_for_compaction(self) -> bool:
+        return self.records >= self.compact_every
+
+    def compact(self, tasks: list, next_id: int):
+        """
+        Write `tasks` and the id sequence as the new snapshot and empty the journal.
+
+        The caller must make sure no change is queued while `tasks` is
+        being copied (records queued earlier may still be written after
+        this; replaying them is harmless).
+        """
+        with self._io_lock:
+            directory = _make_parent(self.path)
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(json.dumps({"next_id": next_id}) + "\n")
+                    for task in tasks:
+                        f.write(json.dumps(task, separators=(",", ":")) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+            except BaseException:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                raise
+            _fsync_directory(directory)  # make the rename itself durable
+
+            # Only now is it safe to forget the journal
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            with open(self.journal_path, "wb"):
+                pass
+            self.records = 0
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {"queued": self._queued, "durable": self._durable, "commits": self.commits}
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _parse_header(line: str):
+    """Return the {"next_id": ...} header of an NDJSON snapshot, or None for older formats."""
+    try:
+        header = json.loads(line)
+    except ValueError:
+        return None  # e.g. "[" or "{" of a pretty-printed JSON document
+    if isinstance(header, dict) and "next_id" in header and "tasks" not in header:
+        return header
+    return None
+
+
+def _retire(path: str):
+    """Rename an old-style file and its journal to *.migrated (the old data stays around)."""
+    for name in (path, path + ".journal"):
+        try:
+            os.replace(name, name + ".migrated")
+        except FileNotFoundError:
+            pass
+
+
+def _make_parent(path: str) -> str:
+    """Create the directory of `path` if needed; returns it."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def _fsync_directory(directory: str):
+    """fsync a directory so a rename in it survives a power loss (POSIX only)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return  # e.g. Windows: directories cannot be opened
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
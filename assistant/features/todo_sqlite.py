@@ -0,0 +1,160 @@
+import os         # Process id (a forked worker must open its own connections)
+import sqlite3    # Shared on-disk task database
+import threading  # One connection per thread
+
+# ===============================
+# SQL (constant strings: sqlite3 keeps them prepared per connection)
+# ===============================
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS tasks ("
+    " id INTEGER PRIMARY KEY AUTOINCREMENT,"  # AUTOINCREMENT: ids are never reused
+    " title TEXT NOT NULL,"
+    " title_key TEXT NOT NULL UNIQUE,"        # casefolded title -> duplicate check
+    " status TEXT NOT NULL,"
+    " created_at TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, id)",
+)
+_INSERT = "INSERT INTO tasks (title, title_key, status, created_at) VALUES (?, ?, ?, ?)"
+_IMPORT = "INSERT OR IGNORE INTO tasks (id, title, title_key, status, created_at) VALUES (?, ?, ?, ?, ?)"
+_SELECT_ONE = "SELECT id, title, status, created_at FROM tasks WHERE id = ?"
+_SELECT_ALL = "SELECT id, title, status, created_at FROM tasks ORDER BY id"
+_SELECT_STATUS = "SELECT id, title, status, created_at FROM tasks WHERE status = ? ORDER BY id"
+_PAGE = "SELECT id, title, status, created_at FROM tasks WHERE id > ? ORDER BY id LIMIT ? OFFSET ?"
+_PAGE_STATUS = (
+    "SELECT id, title, status, created_at FROM tasks WHERE status = ? AND id > ? ORDER BY id LIMIT ? OFFSET ?"
+)
+_DELETE = "DELETE FROM tasks WHERE id = ?"
+_UPDATE_STATUS = "UPDATE tasks SET status = ? WHERE id = ?"
+_COUNT = "SELECT COUNT(*) FROM tasks"
+# AUTOINCREMENT keeps its high-water mark in sqlite_sequence; raise it so
+# ids that were used (and removed) before an import are not handed out again
+_RAISE_SEQUENCE = "UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'tasks'"
+_INSERT_SEQUENCE = "INSERT INTO sqlite_sequence (name, seq) SELECT 'tasks', ? WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'tasks')"
+
+# Largest SQLite INTEGER: a bigger Python int raises OverflowError when it
+# is bound, so ids and cursors past it are answered without asking SQLite
+# (no task can have such an id)
+MAX_ID = 2**63 - 1
+
+
+def _row_to_task(row) -> dict:
+    return {"id": row[0], "title": row[1], "status": row[2], "created_at": row[3]}
+
+
+# ===============================
+# CLASS: SQLiteTaskBackend
+# ===============================
+class SQLiteTaskBackend:
+    """
+    Todo storage in an SQLite file, shared safely by every worker process.
+
+    - WAL mode: readers never block the writer and vice versa
+    - `title_key` (casefolded title) is UNIQUE, so two workers adding the
+      same task at once cannot both succeed
+    - `status` is indexed, so filtering by status does not scan the table
+    - one connection per thread (and per process after a fork)
+
+    Args:
+        path (str): The SQLite file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._db()  # create the file and schema right away
+
+    def _db(self):
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # isolation_level=None: we issue BEGIN/COMMIT ourselves
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, cached_statements=64)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")  # durable at each WAL checkpoint, safe against corruption
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            local.conn, local.pid = conn, os.getpid()
+        return local.conn
+
+    def __len__(self):
+        return self._db().execute(_COUNT).fetchone()[0]
+
+    def add(self, title: str, created_at: str):
+        """Insert a pending task. Returns the task dict, or None if the title exists."""
+        try:
+            cursor = self._db().execute(_INSERT, (title, title.casefold(), "pending", created_at))
+        except sqlite3.IntegrityError:
+            return None
+        return {"id": cursor.lastrowid, "title": title, "status": "pending", "created_at": created_at}
+
+    def tasks(self, status: str = None) -> list:
+        """All tasks, or those with one status, in the order they were added."""
+        db = self._db()
+        rows = db.execute(_SELECT_ALL) if status is None else db.execute(_SELECT_STATUS, (status,))
+        return [_row_to_task(row) for row in rows]
+
+    def page(self, status: str = None, after: int = 0, offset: int = 0, limit: int = 20):
+        """One page in id order (see TaskStore.page()). Returns (tasks, more)."""
+        if after >= MAX_ID:
+            return [], False  # no id is greater
+        offset = min(offset, MAX_ID)
+        limit = min(limit, MAX_ID - 1)  # limit + 1 is bound below
+        db = self._db()
+        # Ask for one row more than needed to know whether another page follows
+        if status is None:
+            rows = db.execute(_PAGE, (after, limit + 1, offset)).fetchall()
+        else:
+            rows = db.execute(_PAGE_STATUS, (status, after, limit + 1, offset)).fetchall()
+        return [_row_to_task(row) for row in rows[:limit]], len(rows) > limit
+
+    def remove(self, task_id):
+        """Delete a task. Returns the removed task dict, or None."""
+        return self._change(task_id, _DELETE, (task_id,))
+
+    def set_status(self, task_id, status: str):
+        """Change a task's status. Returns the task dict, or None."""
+        task = self._change(task_id, _UPDATE_STATUS, (status, task_id))
+        if task is not None:
+            task["status"] = status
+        return task
+
+    def _change(self, task_id, sql: str, params: tuple):
+        # Only real ints: SQLite would happily match the text "3" to id 3
+        if type(task_id) is not int or not 0 < task_id <= MAX_ID:
+            return None
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")  # take the write lock before reading
+        try:
+            row = db.execute(_SELECT_ONE, (task_id,)).fetchone()
+            if row is not None:
+                db.execute(sql, params)
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return None if row is None else _row_to_task(row)
+
+    def import_tasks(self, tasks: list, next_id: int = 1) -> int:
+        """
+        Copy existing tasks (e.g. from tasks.json) into the database, keeping
+        their ids. Tasks whose id or title is already there are skipped, so
+        several workers can run this at the same time. New ids continue from
+        `next_id` (or after the highest imported id).
+        """
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            before = db.total_changes
+            db.executemany(_IMPORT, [
+                (t["id"], t["title"], t["title"].casefold(), t["status"], t["created_at"]) for t in tasks
+            ])
+            imported = db.total_changes - before
+            db.execute(_INSERT_SEQUENCE, (next_id - 1,))
+            db.execute(_RAISE_SEQUENCE, (next_id - 1,))
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return imported
@@ -0,0 +1,135 @@
+# =======================================================================
+# Fuzzy Matching Module
+# =======================================================================
+# This module answers "which known word/phrase is closest to this typo?"
+# with the SAME result as difflib.get_close_matches(word, words, n=1, cutoff)
+# but without comparing the typo against the whole vocabulary every time.
+#
+# How it works (built once, when the index is created):
+# - An inverted index: (character, k) -> every word containing that
+#   character at least k times. Example: ("l", 2) -> ["hello", "all", ...]
+#
+# At lookup time:
+# 1. Shared characters: for each character of the typo (say "l" twice) we
+#    count the words listed under ("l", 1) and ("l", 2). The total per word is
+#    the number of characters both strings share, which is exactly what
+#    difflib's quick_ratio() measures. Counting is done by Counter.update,
+#    which runs in C.
+# 2. Filter: real_quick_ratio() (lengths only) and quick_ratio() are upper
+#    bounds of the real ratio(). Words whose bounds are below the cutoff are
+#    dropped without ever running SequenceMatcher on them.
+# 3. Best-first scoring: the survivors are scored with the expensive
+#    SequenceMatcher.ratio() in order of their bound, and we stop as soon as
+#    no remaining word can beat the best score found so far.
+# 4. Results for short queries are memoized, because the same typos
+#    ("helo", "thx") come back again and again. Longer queries are not, so
+#    the cache cannot fill up with whole pasted messages.
+# =======================================================================
+
+from collections import Counter                     # Character counts per word
+from difflib import SequenceMatcher, get_close_matches  # Same scoring as before
+from functools import lru_cache                     # Memoize repeated lookups
+
+# Queries longer than this are scored every time instead of memoized
+MAX_CACHED_LENGTH = 64
+
+
+class FuzzyIndex:
+    """
+    Precomputed index for "Did you mean ...?" suggestions.
+
+    Args:
+        words (iterable): The known words/phrases (duplicates are ignored).
+        cache_size (int): How many lookups to memoize (only queries of up to
+            MAX_CACHED_LENGTH characters are memoized).
+    """
+
+    def __init__(self, words, cache_size: int = 4096):
+        # dict.fromkeys removes duplicates but keeps the original order
+        self.words = list(dict.fromkeys(words))
+
+        # (character, k) -> [words containing `character` at least k times]
+        self._postings = {}
+        for w in self.words:
+            for ch, n in Counter(w).items():
+                for k in range(1, n + 1):
+                    self._postings.setdefault((ch, k), []).append(w)
+
+        # Memoize per index (a new index after a reload starts with a fresh cache)
+        self._cache_size = cache_size
+        self._cached_match = lru_cache(maxsize=cache_size)(self._best_match)
+
+    # ===============================
+    # Pickle support (compiled-artifact cache, see assistant/corpus.py)
+    # ===============================
+    def __getstate__(self):
+        # The memo cache is a wrapped bound method and cannot be pickled
+        state = self.__dict__.copy()
+        del state["_cached_match"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._cached_match = lru_cache(maxsize=self._cache_size)(self._best_match)
+
+    def best_match(self, word: str, cutoff: float):
+        """
+        Return the closest known word with ratio >= cutoff, or None.
+        Short queries are memoized; long ones are scored every time.
+        """
+        if len(word) > MAX_CACHED_LENGTH:
+            return self._best_match(word, cutoff)
+        return self._cached_match(word, cutoff)
+
+    def _best_match(self, word: str, cutoff: float):
+        """
+        Return the closest known word with ratio >= cutoff, or None.
+        Equivalent to: (get_close_matches(word, self.words, n=1, cutoff) or [None])[0]
+        for any cutoff > 0 (words sharing no character at all are never scored).
+        """
+        lb = len(word)
+        if not lb:
+            # Degenerate case (empty query) -> let difflib handle it directly
+            match = get_close_matches(word, self.words, n=1, cutoff=cutoff)
+            return match[0] if match else None
+
+        # 1. Shared characters per word (multiset intersection with `word`)
+        shared = Counter()
+        postings = self._postings
+        for ch, n in Counter(word).items():
+            for k in range(1, n + 1):
+                words = postings.get((ch, k))
+                if not words:
+                    break  # no word has `ch` k times, so none has it k+1 times
+                shared.update(words)
+
+        # 2. Keep (upper bound, word) for every word that may reach the cutoff.
+        #    Both formulas are the same as in SequenceMatcher, so a word that
+        #    difflib would accept is never dropped here.
+        candidates = []
+        for w, matches in shared.items():
+            total = len(w) + lb
+            if 2.0 * min(len(w), lb) / total < cutoff:    # real_quick_ratio()
+                continue
+            bound = 2.0 * matches / total                  # quick_ratio()
+            if bound >= cutoff:
+                candidates.append((bound, w))
+
+        if not candidates:
+            return None
+
+        # 3. Score best-first. Ties are broken like difflib (larger string wins),
+        #    so candidates with the same bound are visited in descending order.
+        candidates.sort(reverse=True)
+        s = SequenceMatcher()
+        s.set_seq2(word)  # difflib caches details about the second sequence
+        best = None
+        for bound, w in candidates:
+            if best is not None and bound < best[0]:
+                break  # nobody left can beat (or tie) the best score
+            s.set_seq1(w)
+            score = s.ratio()
+            if score >= cutoff and (best is None or (score, w) > best):
+                best = (score, w)
+
+        return best[1] if best else None
@@ -0,0 +1,161 @@
+# =======================================================================
+# Query Grammar
+# =======================================================================
+# All the patterns that recognize what a message asks for, compiled once
+# at import time:
+#   - normalize()              "Hello!!" -> "hello"
+#   - dictionary_word()        "meaning of apple" -> "apple"
+#   - calculator_expression()  "what is 5+7" -> "5+7"
+#   - todo_command()           "mark done 2" -> ("done", 2)
+#
+# Calculator and todo are each ONE combined, anchored pattern instead of a
+# loop over several re.search() calls, and the functions take the text
+# already in the form they need (normalized / lowercased), so a message is
+# lowercased and stripped once, not once per detector.
+# See benchmarks/grammar_bench.py for the per-message cost.
+# =======================================================================
+
+import re  # Regular expressions, compiled once below
+
+# ===============================
+# Normalization
+# ===============================
+_NOT_WORD = re.compile(r"[^a-z0-9\s]+")
+
+
+# Not memoized: one lower() + one regex pass is cheap, and a cache would
+# keep thousands of raw messages (of any size) alive
+def normalize(s: str) -> str:
+    """
+    Clean the input text:
+    - Lowercase the string
+    - Remove punctuation and special characters (keeps letters/numbers/spaces)
+    - Trim leading/trailing whitespace
+    Example: "Hello!!" -> "hello"
+    """
+    return _NOT_WORD.sub("", s.lower()).strip()
+
+
+# ===============================
+# Dictionary queries
+# ===============================
+# The four phrasings, in priority order: the FIRST phrasing that appears
+# anywhere wins (not the one that appears first in the text). A single
+# alternation cannot express that priority cheaply (a version with one
+# lookahead per phrasing measured slower than this), so the patterns are
+# compiled once and tried in order.
+_DICTIONARY = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r"meaning of (.+)",
+        r"what does (.+) mean",
+        r"define (.+)",
+        r"definition of (.+)",
+    )
+)
+
+
+def dictionary_word(normalized: str):
+    """
+    Check if the user is asking for a meaning/definition.
+    Examples:
+      - "meaning of apple"
+      - "what does umbrella mean"
+      - "define car"
+      - "definition of computer"
+
+    Args:
+        normalized (str): The message after normalize().
+
+    Returns:
+        str or None: the extracted word/phrase (stripped), or None.
+    """
+    for pattern in _DICTIONARY:
+        m = pattern.search(normalized)
+        if m:
+            return m.group(1).strip()
+    return None
+
+
+# ===============================
+# Calculator queries
+# ===============================
+# "what is ...", "calculate ...", "solve ..." (they start differently, so at
+# most one of them can match a message)
+_CALC_PHRASE = re.compile(r"^\s*(?:what\s+is|calculate|solve)\s+(.+)$")
+_NOT_MATH = re.compile(r"[^0-9+\-*/%.()\s]")
+_ONLY_MATH = re.compile(r"[0-9+\-*/%.()\s]+")
+_OPERATOR = re.compile(r"[+\-*/%]")
+
+
+def has_operator(text: str) -> bool:
+    """True if `text` contains a math operator (+ - * / %)."""
+    return _OPERATOR.search(text) is not None
+
+
+def calculator_expression(lower: str):
+    """
+    Detect calculator queries from the lowercased message so operators remain.
+    Returns a clean math expression string or None.
+
+    Supports forms like:
+      - "what is 5+7"
+      - "calculate 12 * 8"
+      - "2 + 2"
+    """
+    # 1) Phrasal queries that contain an expression after a verb
+    m = _CALC_PHRASE.search(lower)
+    if m:
+        # Keep only characters that are valid in math expressions:
+        # digits, + - * / % . parentheses and spaces
+        expr = _NOT_MATH.sub("", m.group(1)).strip()
+        # Ensure there's at least one operator so plain numbers are not treated as expressions
+        if _OPERATOR.search(expr):
+            return expr
+
+    # 2) If the whole message looks like a math expression (digits + ops + spaces);
+    #    require at least one operator to avoid treating "22" as an expression
+    if _ONLY_MATH.fullmatch(lower) and _OPERATOR.search(lower):
+        return lower.strip()
+
+    # Not a calculator query
+    return None
+
+
+# ===============================
+# To-do commands
+# ===============================
+_TODO = re.compile(
+    r"add task (?P<add>.*)"
+    r"|show (?:(?P<status>pending|done) )?tasks?(?: page (?P<page>\d+)\b)?"
+    r"|remove task (?P<remove>.*)"
+    r"|mark done (?P<done>\d+)",
+    re.DOTALL,
+)
+
+
+def todo_command(lower: str):
+    """
+    Returns a tuple (command, arg) if a todo command is detected:
+    - ("add", "buy milk")      for "add task buy milk"
+    - ("show", (None, 1))      for "show task" or "show tasks"
+    - ("show", ("pending", 2)) for "show pending tasks page 2" (status: pending/done)
+    - ("remove", "brush teeth") for "remove task brush teeth"
+    - ("done", 2)              for "mark done 2" (task id)
+
+    Args:
+        lower (str): The lowercased message.
+    """
+    m = _TODO.match(lower.strip())
+    if m is None:
+        return None
+    kind = m.lastgroup if m.lastgroup in ("add", "remove", "done") else "show"
+    if kind == "add":
+        return ("add", m.group("add").strip())
+    if kind == "show":
+        return ("show", (m.group("status"), int(m.group("page") or 1)))
+    if kind == "remove":
+        # The task identifier (string) — removal logic handles both id & title
+        task_name = m.group("remove").strip()
+        return ("remove", task_name) if task_name else None
+    return ("done", int(m.group("done")))
@@ -0,0 +1,90 @@
+# =======================================================================
+# Intent Index Module
+# =======================================================================
+# One object that holds everything derived from the intents data:
+# - the single-scan regex matcher (assistant/matcher.py)
+# - the fuzzy "Did you mean ...?" indexes (assistant/fuzzy.py)
+# - reverse maps phrase -> intent and word -> intent (O(1) dict lookups)
+#
+# The chatbot, the fuzzy fallback and any future feature query this object
+# instead of walking the raw intents dict.
+#
+# An IntentIndex is never modified after it is built. To hot-reload intents,
+# build a NEW index and swap the reference (see chatbot.reload_intents);
+# requests that already grabbed the old index finish with it unchanged.
+# =======================================================================
+
+from assistant.fuzzy import FuzzyIndex
+from assistant.matcher import IntentMatcher
+
+
+class IntentIndex:
+    """
+    Prebuilt lookup structures for a set of intents.
+
+    Args:
+        intents (dict): {intent_name: {"patterns": [...], "responses": [...]}}
+                        in priority order (first intent wins on ties).
+    """
+
+    def __init__(self, intents: dict):
+        # Private copy so later edits to the source dict cannot desync the maps
+        self.intents = {
+            name: {
+                "patterns": list(data["patterns"]),
+                "responses": list(data["responses"]),
+            }
+            for name, data in intents.items()
+        }
+
+        # phrase -> intent for EVERY pattern.
+        # If two intents share a phrase ("good night"), the first one owns it.
+        self.phrase_to_intent = {}
+        # word -> intent for single-word patterns only (typos like "helo").
+        # If two intents share a word ("ciao"), the last one owns it.
+        self.word_to_intent = {}
+        for name, data in self.intents.items():
+            for p in data["patterns"]:
+                self.phrase_to_intent.setdefault(p, name)
+                if " " not in p:
+                    self.word_to_intent[p] = name
+
+        # Heavy structures, built once per index
+        self.matcher = IntentMatcher(self.intents)
+        self.word_index = FuzzyIndex(self.word_to_intent)
+        self.phrase_index = FuzzyIndex(self.phrase_to_intent)
+
+    # ===============================
+    # Lookups
+    # ===============================
+    def match(self, text: str):
+        """Return the first intent with a pattern inside `text`, or None."""
+        return self.matcher.match(text)
+
+    def responses(self, intent: str) -> list:
+        """Return the list of possible replies for `intent`."""
+        return self.intents[intent]["responses"]
+
+    def intent_for_phrase(self, phrase: str):
+        """Return the intent that owns the exact pattern `phrase`, or None."""
+        return self.phrase_to_intent.get(phrase)
+
+    def intent_for_word(self, word: str):
+        """Return the intent that owns the single-word pattern `word`, or None."""
+        return self.word_to_intent.get(word)
+
+    def suggest_word(self, token: str, cutoff: float = 0.80):
+        """
+        Find the known single word closest to `token`.
+        Returns (word, intent) or None.
+        """
+        match = self.word_index.best_match(token, cutoff)
+        return (match, self.word_to_intent[match]) if match else None
+
+    def suggest_phrase(self, text: str, cutoff: float = 0.75):
+        """
+        Find the known pattern closest to the whole `text`.
+        Returns (phrase, intent) or None.
+        """
+        match = self.phrase_index.best_match(text, cutoff)
+        return (match, self.phrase_to_intent[match]) if match else None
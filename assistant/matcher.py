@@ -0,0 +1,102 @@
+# =======================================================================
+# Intent Matcher Module
+# =======================================================================
+# This module turns the intent patterns into ONE compiled regex so a
+# message is scanned a single time instead of once per pattern.
+#
+# How it works:
+# - Every intent becomes a named group:  (?P<_0>\bh(?:i\b|ello\b)|...)
+#   (patterns of one intent are merged into a prefix tree, see _trie_regex)
+# - All groups are joined into one alternation (in intent order)
+# - The alternation is wrapped in a lookahead (?=...) so the scan tries
+#   every start position without consuming text. This matters because a
+#   match of a later intent ("how are you") must not hide an earlier intent
+#   starting inside it ("are you there").
+# - At each position the regex engine tries the groups left-to-right, so the
+#   group that matches is the highest-priority intent starting there.
+# - We keep the best (lowest) intent rank seen over the whole message, which
+#   gives exactly the same "first intent in dict order wins" result as the
+#   old loop of one regex per pattern.
+# =======================================================================
+
+import re  # Used to build and run the combined pattern
+
+
+# ===============================
+# Helper: prefix-tree regex
+# ===============================
+def _trie_regex(patterns) -> str:
+    """
+    Build a regex that matches any of `patterns` as a whole word, with common
+    prefixes factored out.
+    Example: ["hi", "hiya", "hi there"] -> r"\bhi(?:\b|ya\b|\ there\b)"
+    """
+    # 1. Build a character trie; the "" key marks the end of a pattern
+    trie = {}
+    for p in patterns:
+        node = trie
+        for ch in p:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    # 2. Turn the trie back into a regex (recursively)
+    def to_regex(node) -> str:
+        branches = []
+        for ch, child in node.items():
+            if ch == "":
+                branches.append(r"\b")  # a pattern ends here -> needs a word boundary
+            else:
+                branches.append(re.escape(ch) + to_regex(child))
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+    return r"\b" + to_regex(trie)
+
+
+class IntentMatcher:
+    """
+    Match a message against all intent patterns in one linear scan.
+
+    Args:
+        intents (dict): {intent_name: {"patterns": [...], ...}} in priority order.
+    """
+
+    def __init__(self, intents: dict):
+        # Intent names in priority order; the group "_<rank>" belongs to names[rank]
+        self.names = list(intents)
+
+        groups = []
+        for rank, intent in enumerate(self.names):
+            patterns = intents[intent]["patterns"]
+            if not patterns:
+                continue
+            # Same word-boundary rule as before (r"\bhello\b" per pattern), but the
+            # patterns of one intent share their prefixes so the engine does not
+            # retry "h", "he", "hel"... once per pattern
+            groups.append(f"(?P<_{rank}>{_trie_regex(patterns)})")
+
+        # No patterns at all -> nothing can ever match
+        self._regex = (
+            re.compile(r"\b(?=" + "|".join(groups) + ")", re.IGNORECASE) if groups else None
+        )
+
+    def match(self, text: str):
+        """
+        Return the name of the first intent (in priority order) that has a
+        pattern somewhere in `text`, or None if no intent matches.
+        """
+        if self._regex is None:
+            return None
+
+        best = None
+        for m in self._regex.finditer(text):
+            # lastgroup is the name of the intent group that matched here: "_<rank>"
+            rank = int(m.lastgroup[1:])
+            if best is None or rank < best:
+                best = rank
+                # Rank 0 is the top priority intent, nothing can beat it
+                if best == 0:
+                    break
+
+        return None if best is None else self.names[best]
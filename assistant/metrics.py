@@ -0,0 +1,272 @@
+# =======================================================================
+# Metrics
+# =======================================================================
+# Counters and latency histograms for the chat pipeline, exported in the
+# Prometheus text format on GET /metrics (see assistant/web.py).
+#
+# Off by default; AVA_METRICS=1 turns it on. When off, the pipeline runs
+# exactly the code it runs without this module (the router is only
+# instrumented while metrics are on), so it costs nothing.
+#
+# What is measured:
+#   ava_stage_seconds{stage}        wall time of each pipeline stage (router
+#                                   handler) that ran: intents, dictionary,
+#                                   calculator, todo, fuzzy_word, fuzzy_phrase
+#   ava_answers_total{stage}        which stage answered ("fallback" = none)
+#   ava_http_request_seconds{route} time spent in each HTTP route
+#   ava_dictionary_upstream_errors_total  failed dictionary API calls
+#   ava_todo_writes_total{op}       todo changes (add/remove/status)
+# plus the counters other modules already keep (dictionary cache hits,
+# coalesced lookups, todo fsyncs, ...), read when /metrics is scraped.
+#
+# Each process keeps its own numbers: with several gunicorn workers a
+# scrape sees the worker that answered it.
+# =======================================================================
+
+import threading  # Per-thread shards, merged when scraped
+from bisect import bisect_left  # Find a value's histogram bucket
+
+from assistant.config import env_bool
+
+ENABLED = env_bool("AVA_METRICS")
+
+# Upper bounds (seconds) of the latency buckets: 10 µs .. 10 s
+DEFAULT_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025,
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+_metrics = []     # every Counter/Histogram, in creation order
+_collectors = []  # functions returning metrics computed at scrape time
+_toggles = []     # functions called with the new state by set_enabled()
+
+
+# ===============================
+# Base class: per-thread shards
+# ===============================
+class _Metric:
+    """
+    Storage shared by Counter and Histogram.
+
+    Every thread updates its own shard ({label value: data}), so an update
+    never takes a lock (an uncontended lock costs more than the update
+    itself). A scrape adds up the shards; shards of threads that have
+    ended are merged into `_retired`, so a server that starts a thread per
+    request does not pile them up.
+
+    Subclasses set `kind` and define samples() and _merge(into, shard),
+    which adds one shard's data into another dict.
+    """
+
+    kind = None
+
+    def __init__(self, name: str, help: str, label: str = None):
+        self.name = name
+        self.help = help
+        self.label = label
+        self._local = threading.local()
+        self._shards = []    # (thread, shard) of every live thread that updated this metric
+        self._retired = {}   # merged shards of finished threads
+        self._lock = threading.Lock()  # guards _shards/_retired (not the updates)
+        _metrics.append(self)
+
+    def _new_shard(self) -> dict:
+        shard = self._local.shard = {}
+        with self._lock:
+            self._retire_dead()
+            self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def _retire_dead(self):
+        alive = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                alive.append((thread, shard))
+            else:
+                self._merge(self._retired, shard)
+        self._shards = alive
+
+    def _collect(self) -> list:
+        """[(label value, data)] summed over all threads, sorted by label value."""
+        with self._lock:
+            self._retire_dead()
+            total = {}
+            self._merge(total, self._retired)
+            for _, shard in self._shards:
+                self._merge(total, shard.copy())  # the owner may add a label meanwhile
+        return sorted(total.items(), key=lambda kv: str(kv[0]))
+
+    def render(self) -> str:
+        return _render(self.name, self.kind, self.help, self.samples())
+
+
+# ===============================
+# CLASS: Counter
+# ===============================
+class Counter(_Metric):
+    """
+    A count that only goes up, optionally split by one label.
+
+    Args:
+        name (str): Metric name (e.g. "ava_todo_writes_total").
+        help (str): One-line description.
+        label (str, optional): Label name; inc() then takes its value.
+    """
+
+    kind = "counter"
+
+    def inc(self, label_value=None, amount: float = 1):
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        shard[label_value] = shard.get(label_value, 0) + amount
+
+    def _merge(self, into: dict, shard: dict):
+        for key, value in shard.items():
+            into[key] = into.get(key, 0) + value
+
+    def samples(self) -> list:
+        values = self._collect()
+        if self.label is None and not values:
+            values = [(None, 0)]  # an unlabelled counter is always shown
+        return [(self.name, _labels(self.label, key), value) for key, value in values]
+
+
+# ===============================
+# CLASS: Histogram
+# ===============================
+class Histogram(_Metric):
+    """
+    Distribution of observed values (latencies, in seconds) in fixed
+    buckets, optionally split by one label.
+
+    Args:
+        name (str): Metric name (e.g. "ava_stage_seconds").
+        help (str): One-line description.
+        label (str, optional): Label name; observe() then takes its value.
+        buckets (tuple): Sorted bucket upper bounds.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, label: str = None, buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, help, label)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, label_value=None):
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        series = shard.get(label_value)
+        if series is None:
+            # [count per bucket..., +Inf count, sum]
+            series = shard[label_value] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1  # first bucket with bound >= value
+        series[-1] += value
+
+    def _merge(self, into: dict, shard: dict):
+        for key, series in shard.items():
+            if key in into:
+                into[key] = [a + b for a, b in zip(into[key], series)]
+            else:
+                into[key] = list(series)
+
+    def samples(self) -> list:
+        out = []
+        for key, counts in self._collect():
+            total = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                total += count  # Prometheus buckets are cumulative
+                out.append((self.name + "_bucket", _labels(self.label, key, le=_number(bound)), total))
+            out.append((self.name + "_sum", _labels(self.label, key), counts[-1]))
+            out.append((self.name + "_count", _labels(self.label, key), total))
+        return out
+
+
+# ===============================
+# The pipeline's metrics
+# ===============================
+STAGE_SECONDS = Histogram("ava_stage_seconds", "Wall time of each get_response() stage.", "stage")
+ANSWERS = Counter("ava_answers_total", "Messages answered, by the stage that answered.", "stage")
+HTTP_SECONDS = Histogram("ava_http_request_seconds", "Time spent in each HTTP route.", "route")
+UPSTREAM_ERRORS = Counter("ava_dictionary_upstream_errors_total", "Dictionary API calls that failed or timed out.")
+TODO_WRITES = Counter("ava_todo_writes_total", "Todo changes written, by operation.", "op")
+
+
+def observe_stage(name: str, seconds: float, answered: bool):
+    """Router observer (see Router.instrument()): time one stage, count its answer."""
+    STAGE_SECONDS.observe(seconds, name)
+    if answered:
+        ANSWERS.inc(name)
+
+
+# ===============================
+# On/off switch
+# ===============================
+def set_enabled(enabled: bool):
+    """Turn metrics on or off at runtime (the default comes from AVA_METRICS)."""
+    global ENABLED
+    ENABLED = bool(enabled)
+    for toggle in _toggles:
+        toggle(ENABLED)
+
+
+def on_toggle(fn):
+    """Call fn(enabled) now and whenever metrics are turned on or off."""
+    _toggles.append(fn)
+    fn(ENABLED)
+    return fn
+
+
+# ===============================
+# Scrape-time metrics
+# ===============================
+def collector(fn):
+    """
+    Register fn() -> list of (name, type, help, [(labels dict, value), ...]),
+    called on every scrape. For numbers a module already keeps (cache hit
+    counters, ...): they cost nothing until somebody scrapes.
+    """
+    _collectors.append(fn)
+    return fn
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    parts = [metric.render() for metric in _metrics]
+    for fn in _collectors:
+        for name, kind, help, values in fn():
+            samples = [(name, _labels(None, None, **labels), value) for labels, value in values]
+            parts.append(_render(name, kind, help, samples))
+    return "".join(parts)
+
+
+# ===============================
+# Helpers: text format
+# ===============================
+def _labels(label, value, **extra) -> str:
+    pairs = []
+    if label is not None:
+        pairs.append((label, value))
+    pairs.extend(extra.items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _render(name: str, kind: str, help: str, samples: list) -> str:
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+    lines.extend(f"{sample}{labels} {_number(value)}" for sample, labels, value in samples)
+    return "\n".join(lines) + "\n"
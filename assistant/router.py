@@ -0,0 +1,195 @@
+# =======================================================================
+# Message Router
+# =======================================================================
+# Decides which feature answers a message, without trying every feature in
+# turn. Each handler is registered with:
+#   - a priority: lower runs first (this is the old if/elif order)
+#   - optional leading keywords: the handler is only a candidate when the
+#     message starts with one of them ("add", "show", ... for todo)
+#   - an optional probe: a cheap check that must be true for the handler to
+#     possibly match (e.g. "has an operator character" for the calculator)
+#
+# Candidates for a message come from a table keyed by its first word, so a
+# "mark done 3" goes straight to the todo handler (after the intents, which
+# always run first), and "hello there" never runs the todo or calculator
+# detectors. A probe must never be false when its handler would answer,
+# otherwise precedence would change.
+#
+# Plugins register their own handlers:
+#
+#     from assistant.router import router
+#
+#     @router.route("weather", priority=45, keywords=("weather",))
+#     def weather(msg):
+#         return "Sunny!" if "today" in msg.normalized else None
+#
+# Asyncio code calls dispatch_async(). A handler that waits on I/O can
+# register a coroutine version (async_handler=...) that dispatch_async()
+# awaits instead; handlers without one run inline.
+#
+# instrument(observe) times every handler that runs (see assistant/metrics.py).
+# =======================================================================
+
+from time import perf_counter  # Handler timing (only while instrumented)
+
+
+# ===============================
+# CLASS: Message
+# ===============================
+class Message:
+    """
+    One incoming message, with the forms handlers need computed once.
+
+    Attributes:
+        text (str): The message as received.
+        lower (str): Lowercased text (keeps operators and punctuation).
+        normalized (str): Lowercase, punctuation removed, trimmed.
+        first_word (str): First word of the stripped lowercased text ("" if none).
+        index: The IntentIndex snapshot used for this message.
+        lookup: Dictionary lookup function (word -> meaning); a coroutine
+            function when the message goes through dispatch_async().
+    """
+
+    __slots__ = ("text", "lower", "normalized", "first_word", "index", "lookup")
+
+    def __init__(self, text: str, normalized: str, index, lookup):
+        self.text = text
+        self.lower = text.lower()
+        self.normalized = normalized
+        words = self.lower.split(None, 1)
+        self.first_word = words[0] if words else ""
+        self.index = index
+        self.lookup = lookup
+
+
+# ===============================
+# CLASS: Router
+# ===============================
+class Router:
+    """Registry of message handlers, dispatched by leading keyword and probes."""
+
+    def __init__(self):
+        self._handlers = []   # (priority, order, name, handler, keywords, probe, async_handler)
+        self._by_keyword = {}  # first word -> candidate handlers, in priority order
+        self._default = ()     # candidates for any other first word
+        self._observe = None   # see instrument()
+
+    def register(self, name: str, handler, priority: int = 100, keywords=None, probe=None,
+                 async_handler=None):
+        """
+        Add a handler.
+
+        Args:
+            name (str): Handler name (unique; registering it again replaces it).
+            handler (callable): handler(msg) -> reply string, or None to pass.
+            priority (int): Lower runs first.
+            keywords (iterable, optional): Leading words the message must start with.
+            probe (callable, optional): probe(msg) -> bool, a cheap precondition.
+            async_handler (coroutine function, optional): Used instead of
+                `handler` by dispatch_async().
+        """
+        self._handlers = [h for h in self._handlers if h[2] != name]
+        keywords = frozenset(keywords) if keywords else None
+        self._handlers.append((priority, len(self._handlers), name, handler, keywords, probe, async_handler))
+        self._handlers.sort(key=lambda h: (h[0], h[1]))
+        self._rebuild()
+
+    def route(self, name: str, priority: int = 100, keywords=None, probe=None, async_handler=None):
+        """Decorator form of register()."""
+        def decorator(handler):
+            self.register(name, handler, priority, keywords, probe, async_handler)
+            return handler
+        return decorator
+
+    def unregister(self, name: str):
+        self._handlers = [h for h in self._handlers if h[2] != name]
+        self._rebuild()
+
+    def names(self) -> list:
+        """Handler names in the order they are tried."""
+        return [h[2] for h in self._handlers]
+
+    def _rebuild(self):
+        # Precompute the candidate list of every keyword, so dispatch does a
+        # single dict lookup instead of filtering all handlers per message
+        words = set()
+        for h in self._handlers:
+            if h[4]:
+                words |= h[4]
+        self._default = tuple((h[2], h[3], h[5], h[6]) for h in self._handlers if h[4] is None)
+        self._by_keyword = {
+            word: tuple((h[2], h[3], h[5], h[6]) for h in self._handlers if h[4] is None or word in h[4])
+            for word in words
+        }
+
+    def instrument(self, observe):
+        """
+        Time the handlers: observe(name, seconds, answered) is called after
+        each handler that runs. observe=None turns it off again.
+        """
+        self._observe = observe
+        # Swap the methods themselves: an uninstrumented router does not
+        # even check whether it is instrumented
+        if observe is None:
+            self.__dict__.pop("dispatch", None)
+            self.__dict__.pop("dispatch_async", None)
+        else:
+            self.dispatch = self._dispatch_observed
+            self.dispatch_async = self._dispatch_async_observed
+
+    def candidates(self, msg: Message) -> tuple:
+        """(name, handler, probe, async_handler) of the handlers that may answer `msg`, in order."""
+        return self._by_keyword.get(msg.first_word, self._default)
+
+    def dispatch(self, msg: Message):
+        """
+        Run the candidate handlers in order.
+
+        Returns:
+            tuple: (handler name, reply), or (None, None) if nobody answered.
+        """
+        for name, handler, probe, _ in self.candidates(msg):
+            if probe is not None and not probe(msg):
+                continue
+            reply = handler(msg)
+            if reply is not None:
+                return name, reply
+        return None, None
+
+    async def dispatch_async(self, msg: Message):
+        """dispatch() for asyncio code: awaits the handlers' async versions."""
+        for name, handler, probe, async_handler in self.candidates(msg):
+            if probe is not None and not probe(msg):
+                continue
+            reply = handler(msg) if async_handler is None else await async_handler(msg)
+            if reply is not None:
+                return name, reply
+        return None, None
+
+    def _dispatch_observed(self, msg: Message):
+        observe = self._observe
+        for name, handler, probe, _ in self.candidates(msg):
+            if probe is not None and not probe(msg):
+                continue
+            start = perf_counter()
+            reply = handler(msg)
+            observe(name, perf_counter() - start, reply is not None)
+            if reply is not None:
+                return name, reply
+        return None, None
+
+    async def _dispatch_async_observed(self, msg: Message):
+        observe = self._observe
+        for name, handler, probe, async_handler in self.candidates(msg):
+            if probe is not None and not probe(msg):
+                continue
+            start = perf_counter()
+            reply = handler(msg) if async_handler is None else await async_handler(msg)
+            observe(name, perf_counter() - start, reply is not None)
+            if reply is not None:
+                return name, reply
+        return None, None
+
+
+# The application's router; chatbot.py registers the built-in features on it
+router = Router()
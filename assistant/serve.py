@@ -0,0 +1,207 @@
+# =======================================================================
+# Production Server
+# =======================================================================
+# Usage:
+#   python -m assistant.serve                         (127.0.0.1:5000)
+#   python -m assistant.serve --host 0.0.0.0 --workers 4 --threads 8
+#   python -m assistant.serve --asgi                  (ASGI app, see asgi.py)
+#
+# Settings (flags win over environment variables):
+#   --host     AVA_HOST     address to listen on (default 127.0.0.1)
+#   --port     AVA_PORT     port (default 5000)
+#   --workers  AVA_WORKERS  worker processes (default 1)
+#   --threads  AVA_THREADS  threads per worker (default 8)
+#   --server   AVA_SERVER   auto | gunicorn | werkzeug | uvicorn (default auto)
+#   --debug    AVA_DEBUG    Flask debug mode (default off; never in production)
+#
+# Servers:
+#   - gunicorn (if installed): `workers` processes with `threads` threads
+#     each (gthread workers, or uvicorn workers with --asgi)
+#   - otherwise Werkzeug's threaded server (one process) for WSGI, or
+#     uvicorn (one process) for --asgi
+#
+# Preloading: everything that is expensive to load and safe to share is
+# loaded ONCE in the parent process, before the workers are forked, so the
+# workers start instantly and share those pages copy-on-write:
+#   - the intent index (plain Python objects, read-only)
+#   - the dictionary cache's memory tier and the offline dictionary (mmap);
+#     the cache's SQLite connection is opened again in each process
+#   - the SQLite todo store (it opens one connection per process)
+# The JSON todo store belongs to a single process, so more than one worker
+# requires AVA_TODO_BACKEND=sqlite. It is loaded (to fail early on a bad
+# file) but not kept in a parent that forks: gunicorn forks a replacement
+# for a dead worker from the parent, which would start with the tasks as
+# they were at startup. The worker loads it on first use instead.
+# Per worker, after the fork: the intents watcher thread and the dictionary
+# API keep-alive connections (threads and sockets must not cross a fork).
+# =======================================================================
+
+import argparse  # Command line options
+import logging   # Startup messages
+
+from assistant.config import env_bool, env_int, env_str
+
+log = logging.getLogger("assistant.serve")
+
+
+# ===============================
+# Preloading
+# ===============================
+def preload(forks: bool = False) -> dict:
+    """
+    Load the shared state in this process (call it before forking workers).
+
+    Args:
+        forks (bool): Workers are forked from this process. A JSON todo
+            store is then dropped again after loading, so that every worker
+            (including one forked later to replace a dead one) reads the
+            current files itself.
+
+    Returns:
+        dict: What was loaded (intent count, task count, backend name).
+    """
+    from assistant import chatbot  # importing it loads the intent index
+    from assistant.features import dictionary, todo
+
+    dictionary.get_cache()
+    dictionary.get_offline_dictionary()
+    backend = todo.get_backend()
+    if forks and isinstance(backend, todo.JSONTaskBackend):
+        backend.journal.close()
+        todo.set_backend(None)
+    return {
+        "intents": len(chatbot.intents),
+        "tasks": len(backend),
+        "todo_backend": type(backend).__name__,
+    }
+
+
+def check_workers(workers: int):
+    """Refuse settings that would lose data: several processes on the JSON todo store."""
+    from assistant.features import todo
+
+    # Decided from the setting: the store itself is not loaded for this
+    if workers > 1 and todo.backend_kind() == "json":
+        raise SystemExit(
+            "The JSON todo store can only be used by one process; "
+            "set AVA_TODO_BACKEND=sqlite to run several workers."
+        )
+
+
+# ===============================
+# Servers
+# ===============================
+def _run_gunicorn(app, options: dict):
+    from gunicorn.app.base import BaseApplication
+
+    class Server(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return app  # already loaded: gunicorn forks the workers from this process
+
+    Server().run()
+
+
+def _run_uvicorn(app, host: str, port: int):
+    import uvicorn
+
+    uvicorn.run(app, host=host, port=port)
+
+
+def _run_werkzeug(app, host: str, port: int, threads: int, debug: bool):
+    from werkzeug.serving import run_simple
+
+    # Werkzeug starts one thread per request (it has no pool), so `threads`
+    # only decides between threaded and single-threaded here
+    run_simple(host, port, app, threaded=threads > 1, use_debugger=debug, use_reloader=debug)
+
+
+def _installed(module: str) -> bool:
+    try:
+        __import__(module)
+    except ImportError:
+        return False
+    return True
+
+
+def serve(host: str = "127.0.0.1", port: int = 5000, workers: int = 1, threads: int = 8,
+          server: str = "auto", asgi: bool = False, debug: bool = False):
+    """
+    Preload the shared state, then run the app.
+
+    Args:
+        host (str): Address to listen on.
+        port (int): Port.
+        workers (int): Worker processes (gunicorn only).
+        threads (int): Threads per worker.
+        server (str): "auto", "gunicorn", "werkzeug" or "uvicorn".
+        asgi (bool): Serve the ASGI app (assistant/asgi.py) instead of WSGI.
+        debug (bool): Flask debug mode (development only).
+    """
+    from assistant.web import create_app, start_background
+
+    if server == "auto":
+        if _installed("gunicorn") and (not asgi or _installed("uvicorn")):
+            server = "gunicorn"
+        else:
+            server = "uvicorn" if asgi else "werkzeug"
+    if server == "werkzeug" and asgi:
+        raise SystemExit("--asgi needs uvicorn (pip install uvicorn)")
+    for module in {server, "uvicorn" if asgi else "werkzeug"}:
+        if not _installed(module):
+            raise SystemExit(f"{module} is not installed (pip install {module})")
+    if server == "uvicorn" and not asgi:
+        raise SystemExit("uvicorn serves the ASGI app: add --asgi")
+    forks = server == "gunicorn"
+    if not forks and workers > 1:
+        log.warning("%s runs one process (install gunicorn for more); ignoring workers=%d", server, workers)
+        workers = 1
+
+    check_workers(workers)
+    loaded = preload(forks)
+    log.info("Preloaded %(intents)d intents and %(tasks)d tasks (%(todo_backend)s)", loaded)
+
+    # Background jobs are started in each worker after the fork
+    flask_app = create_app({"DEBUG": debug, "START_BACKGROUND": not forks})
+    app = flask_app
+    if asgi:
+        from assistant.asgi import create_asgi_app
+        app = create_asgi_app(flask_app, threads)
+
+    log.info("Serving on http://%s:%d (%s, %d worker(s), %d thread(s))", host, port, server, workers, threads)
+    if server == "gunicorn":
+        _run_gunicorn(app, {
+            "bind": f"{host}:{port}",
+            "workers": workers,
+            "threads": threads,
+            "worker_class": "uvicorn.workers.UvicornWorker" if asgi else "gthread",
+            "preload_app": True,
+            "post_fork": lambda arbiter, worker: start_background(flask_app),
+        })
+    elif server == "uvicorn":
+        _run_uvicorn(app, host, port)
+    else:
+        _run_werkzeug(app, host, port, threads, debug)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the A.V.A web app")
+    parser.add_argument("--host", default=env_str("AVA_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=env_int("AVA_PORT", 5000))
+    parser.add_argument("--workers", type=int, default=env_int("AVA_WORKERS", 1))
+    parser.add_argument("--threads", type=int, default=env_int("AVA_THREADS", 8))
+    parser.add_argument("--server", choices=("auto", "gunicorn", "werkzeug", "uvicorn"),
+                        default=env_str("AVA_SERVER", "auto"))
+    parser.add_argument("--asgi", action="store_true", help="serve the ASGI app (needs uvicorn)")
+    parser.add_argument("--debug", action="store_true", default=env_bool("AVA_DEBUG"))
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    serve(args.host, args.port, max(1, args.workers), max(1, args.threads), args.server, args.asgi, args.debug)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+# =======================================================================
+# Web Application (Flask app factory)
+# =======================================================================
+# create_app(config) builds the Flask app with all the routes. It is used by:
+#   - app.py                  `python app.py` / `flask --app app run` (development)
+#   - assistant/serve.py      `python -m assistant.serve` (production: several
+#                             worker processes and threads, see that file)
+#   - assistant/asgi.py       the same app behind an ASGI server
+#
+# Config keys (pass a dict to create_app(); defaults come from the environment):
+#   DEBUG               -> Flask debug mode, AVA_DEBUG=1 (default: off)
+#   WATCH_INTENTS       -> hot-reload the intents corpus in a background thread (default: on)
+#   WARM_UP_DICTIONARY  -> open the dictionary API connection at startup (default: on)
+#   MAX_BATCH_SIZE      -> largest /api/chat/batch request (default 1000)
+#   START_BACKGROUND    -> start the two jobs above in create_app() (default: on)
+#
+# The background jobs are per process: a server that forks workers creates
+# the app with START_BACKGROUND off and calls start_background() in each
+# worker after the fork (threads and sockets do not survive a fork).
+# =======================================================================
+
+# ===============================
+# Import All Necessary Libraries
+# ===============================
+import json       # To parse/produce NDJSON (one JSON value per line) for the batch route
+import os         # To find the templates/ and static/ folders
+import threading  # To warm up the dictionary connection without blocking startup
+import time       # Route timings for the metrics
+
+from flask import Blueprint, Flask, Response, current_app, g, render_template, request, jsonify
+# Flask -> main web framework to create server and handle routes
+# Blueprint -> the routes below, registered on the app by create_app()
+# render_template -> loads HTML files like 'index.html' for the frontend
+# request -> handles data sent from frontend (like user messages)
+# jsonify -> sends data back to frontend in JSON format
+# Response -> raw HTTP response (used for NDJSON output)
+# current_app -> the app handling the request (to read its config)
+# g -> per-request scratch space (request start time)
+
+# ===============================
+# Import our custom backend modules
+# ===============================
+from assistant.chatbot import get_response, get_response_async, get_response_many, start_intent_watcher
+# get_response() -> our chatbot function that processes user messages
+# It includes both greeting handling and dictionary lookups
+# get_response_async() -> same, for async servers (non-blocking dictionary lookups)
+# get_response_many() -> same, for a whole list of messages at once
+# start_intent_watcher() -> reloads the intents when their corpus file is edited
+from assistant import metrics
+# metrics.render() -> counters and latency histograms for GET /metrics
+from assistant.config import env_bool
+from assistant.features import dictionary
+# dictionary.warm_up() -> opens the dictionary API connection ahead of time
+from assistant.features import todo
+# todo.get_tasks_page() / todo.iter_tasks() -> the task list, page by page
+
+# The project root holds templates/ and static/
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+bp = Blueprint("ava", __name__)
+
+
+# ===============================
+# App factory
+# ===============================
+def default_config() -> dict:
+    """The config create_app() starts from (overridden by its argument)."""
+    return {
+        "DEBUG": env_bool("AVA_DEBUG"),
+        "WATCH_INTENTS": True,
+        "WARM_UP_DICTIONARY": True,
+        "MAX_BATCH_SIZE": MAX_BATCH_SIZE,
+        "START_BACKGROUND": True,
+    }
+
+
+def create_app(config: dict = None) -> Flask:
+    """
+    Build the Flask application.
+
+    Args:
+        config (dict, optional): Flask config values, on top of default_config().
+
+    Returns:
+        Flask: The app, with the routes registered and (if START_BACKGROUND)
+        the background jobs started.
+    """
+    app = Flask(
+        __name__,
+        template_folder=os.path.join(PROJECT_ROOT, "templates"),
+        static_folder=os.path.join(PROJECT_ROOT, "static"),
+    )
+    app.config.update(default_config())
+    app.config.update(config or {})
+    app.register_blueprint(bp)
+    if app.config["START_BACKGROUND"]:
+        start_background(app)
+    return app
+
+
+def start_background(app: Flask):
+    """
+    Start the background jobs the app's config asks for:
+      - the intents watcher: a thread that watches assistant/data/intents.json
+        (or AVA_INTENTS_FILE) and swaps in new intents without a restart
+      - the dictionary warm-up: opens the keep-alive connection to the API in
+        the background, so the first "define X" does not pay for the TLS
+        handshake (and startup never waits on the network)
+    """
+    if app.config["WATCH_INTENTS"]:
+        start_intent_watcher()
+    if app.config["WARM_UP_DICTIONARY"]:
+        threading.Thread(target=dictionary.warm_up, name="dictionary-warm-up", daemon=True).start()
+
+
+# ===============================
+# ROUTES (URLs for our app)
+# ===============================
+
+# -------------------------------------------
+# Homepage Route
+# -------------------------------------------
+@bp.route("/")
+# The URL route "/" is the homepage
+def home():
+    # Loads the frontend UI (index.html) and sends it to the browser
+    return render_template("index.html")
+
+# -------------------------------------------
+# Chatbot API Route
+# -------------------------------------------
+def chat_reply(payload) -> tuple:
+    """
+    Answer a /api/chat body (the parsed JSON, or None if it did not parse).
+
+    Returns:
+        tuple: (response dict, HTTP status), e.g. ({"reply": "Hello!"}, 200).
+    """
+    user_msg = _chat_message(payload)
+    if not user_msg:
+        # If user message is empty, return an error with HTTP status 400 (Bad Request)
+        return {"error": "Field 'message' cannot be empty"}, 400
+    try:
+        # Process the message using our chatbot logic
+        # get_response() takes the user message and returns the chatbot reply
+        return {"reply": get_response(user_msg)}, 200
+    except Exception:
+        # If the chatbot logic crashes, return a safe error message
+        return {"error": "Internal error while generating reply"}, 500
+
+
+async def chat_reply_async(payload) -> tuple:
+    """
+    chat_reply() for async servers: answers with get_response_async().
+
+    Framework-neutral, so any async app can expose it, e.g. with Quart:
+
+        @app.post("/api/chat")
+        async def chat():
+            return await chat_reply_async(await request.get_json(silent=True))
+
+    (assistant/asgi.py serves it without any framework.)
+    """
+    user_msg = _chat_message(payload)
+    if not user_msg:
+        return {"error": "Field 'message' cannot be empty"}, 400
+    try:
+        return {"reply": await get_response_async(user_msg)}, 200
+    except Exception:
+        return {"error": "Internal error while generating reply"}, 500
+
+
+def _chat_message(payload) -> str:
+    """The "message" field of a /api/chat body, stripped ("" if missing or not text)."""
+    # Example payload from frontend: {"message": "hello"}
+    message = payload.get("message") if isinstance(payload, dict) else None
+    return message.strip() if isinstance(message, str) else ""
+
+
+@bp.route("/api/chat", methods=["POST"])
+# This route is called when frontend sends a user message
+# methods=["POST"] means this route only accepts POST requests (sending data)
+def chat_api():
+    # 1. Ensure the request is JSON
+    # Frontend must send "Content-Type: application/json"
+    if not request.is_json:
+        # If not JSON, return an error with HTTP status 415 (Unsupported Media Type)
+        return jsonify({"error": "Content-Type must be application/json"}), 415
+
+    # 2. Parse incoming JSON safely (get_json(silent=True) returns None if
+    #    parsing fails), validate the message and answer it
+    # Example reply: {"reply": "Hello! How can I help you?"}
+    body, status = chat_reply(request.get_json(silent=True))
+    return jsonify(body), status
+
+# -------------------------------------------
+# Batch Chatbot API Route
+# -------------------------------------------
+# Default maximum number of messages accepted in one batch request
+# (config key MAX_BATCH_SIZE)
+MAX_BATCH_SIZE = 1000
+NDJSON = "application/x-ndjson"
+# Placeholder for an NDJSON line that could not be parsed
+_INVALID_LINE = object()
+
+
+@bp.route("/api/chat/batch", methods=["POST"])
+# Answers many messages in ONE HTTP round-trip (e.g. replaying conversation logs)
+# Accepted bodies:
+#   - JSON:   {"messages": ["hi", "2+2", ...]}   (or just the list itself)
+#   - NDJSON: one message per line, either "hi" or {"message": "hi"}
+# Reply: one item per message, in the same order, each either
+#   {"reply": "..."} or {"error": "..."}
+# JSON in -> {"replies": [...]} out; NDJSON in -> NDJSON out (one item per line)
+def chat_batch_api():
+    # 1. Read the list of messages from the body
+    is_ndjson = request.mimetype == NDJSON
+    if is_ndjson:
+        # Each non-empty line is its own JSON value; a broken line only fails that item
+        items = []
+        for line in request.get_data(as_text=True).splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError:
+                items.append(_INVALID_LINE)
+    elif request.is_json:
+        payload = request.get_json(silent=True)
+        items = payload.get("messages") if isinstance(payload, dict) else payload
+        if not isinstance(items, list):
+            return jsonify({"error": "Body must be a list of messages or {\"messages\": [...]}"}), 400
+    else:
+        return jsonify({"error": f"Content-Type must be application/json or {NDJSON}"}), 415
+
+    # 2. Validate the batch size
+    if not items:
+        return jsonify({"error": "Batch cannot be empty"}), 400
+    max_batch = current_app.config["MAX_BATCH_SIZE"]
+    if len(items) > max_batch:
+        return jsonify({"error": f"Batch cannot contain more than {max_batch} messages"}), 413
+
+    # 3. Validate each item the same way /api/chat does; invalid items get an error
+    #    slot in the output and are not sent to the chatbot
+    results = [None] * len(items)
+    valid = []  # (position, message)
+    for i, item in enumerate(items):
+        if item is _INVALID_LINE:
+            results[i] = {"error": "Line is not valid JSON"}
+            continue
+        msg = item.get("message") if isinstance(item, dict) else item
+        msg = msg.strip() if isinstance(msg, str) else ""
+        if msg:
+            valid.append((i, msg))
+        else:
+            results[i] = {"error": "Field 'message' cannot be empty"}
+
+    # 4. Answer all valid messages in one batched call
+    replies = get_response_many([msg for _, msg in valid])
+    for (i, _), reply in zip(valid, replies):
+        if isinstance(reply, Exception):
+            results[i] = {"error": "Internal error while generating reply"}
+        else:
+            results[i] = {"reply": reply}
+
+    # 5. Send the replies back in the same format the request used
+    if is_ndjson:
+        body = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in results)
+        return Response(body, mimetype=NDJSON)
+    return jsonify({"replies": results})
+
+# -------------------------------------------
+# Tasks API Route
+# -------------------------------------------
+@bp.route("/api/tasks", methods=["GET"])
+# Lists the todo tasks, in id order.
+# Query parameters:
+#   status=pending|done   only tasks with this status (default: all)
+#   after=<id>            cursor: tasks after this id (use "next" from the previous page)
+#   limit=<n>             page size (default 20, at most todo.MAX_PAGE_SIZE)
+#   format=ndjson         stream EVERY matching task, one JSON object per line
+#                         (also chosen by "Accept: application/x-ndjson")
+# Page reply: {"tasks": [...], "next": <cursor or null>}
+# Each task also carries "text", the line the chatbot shows ("1. [Pending] Buy milk").
+def tasks_api():
+    # 1. Validate the parameters
+    status = request.args.get("status") or None
+    if status not in ("pending", "done", None):
+        return jsonify({"error": "status must be 'pending' or 'done'"}), 400
+    try:
+        after = int(request.args.get("after", 0))
+        limit = int(request.args["limit"]) if "limit" in request.args else None
+    except ValueError:
+        return jsonify({"error": "after and limit must be integers"}), 400
+    if not 0 <= after <= todo.MAX_TASK_ID:
+        return jsonify({"error": f"after must be between 0 and {todo.MAX_TASK_ID}"}), 400
+    if limit is not None and limit <= 0:
+        return jsonify({"error": "limit must be 1 or more"}), 400
+
+    # 2. Streaming mode: rows are produced and sent a batch at a time, so the
+    #    first byte goes out at once and memory does not grow with the list
+    if request.args.get("format") == "ndjson" or request.accept_mimetypes.best == NDJSON:
+        def rows():
+            for task in todo.iter_tasks(status, after=after):
+                yield json.dumps(dict(task, text=todo.format_task(task)), ensure_ascii=False) + "\n"
+        return Response(rows(), mimetype=NDJSON)
+
+    # 3. One page
+    page = todo.get_tasks_page(status, after=after, limit=limit)
+    page["tasks"] = [dict(t, text=todo.format_task(t)) for t in page["tasks"]]
+    return jsonify(page)
+
+# -------------------------------------------
+# Metrics Route
+# -------------------------------------------
+@bp.route("/metrics", methods=["GET"])
+# Prometheus scrape endpoint (text exposition format). 404 unless metrics
+# are on (AVA_METRICS=1), see assistant/metrics.py for what is measured.
+def metrics_api():
+    if not metrics.ENABLED:
+        return jsonify({"error": "Metrics are disabled (set AVA_METRICS=1)"}), 404
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
+@bp.before_app_request
+def _start_timer():
+    if metrics.ENABLED:
+        g.metrics_start = time.perf_counter()
+
+
+@bp.after_app_request
+def _record_time(response):
+    start = g.pop("metrics_start", None)
+    if start is not None:
+        route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        metrics.HTTP_SECONDS.observe(time.perf_counter() - start, route)
+    return response
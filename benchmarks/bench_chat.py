@@ -0,0 +1,75 @@
+# =======================================================================
+# End-to-end: get_response() by message category, and /api/chat
+# =======================================================================
+# Dictionary lookups go to a local stub server (stub_dictionary.py), the
+# todo list lives in a temporary directory, and the offline dictionary is
+# off, so results do not depend on the network or on local files.
+# =======================================================================
+
+import os        # Paths
+import random    # Reproducible message mix
+import shutil    # Remove the temporary todo store
+import tempfile  # Todo store for the benchmark
+
+from harness import Case, load_fixture, suite
+from stub_dictionary import StubDictionary
+
+from assistant import chatbot
+from assistant.features import dictionary, todo
+from assistant.features.dictionary_cache import DictionaryCache
+
+# Share of each category in the "mixed" workload
+MIX = {"greetings": 40, "misses": 25, "calculator": 15, "todo": 10, "dictionary": 10}
+MIXED_SIZE = 200
+
+
+def mixed_messages(corpus: dict, size: int = MIXED_SIZE, seed: int = 42) -> list:
+    """A reproducible mix of the fixture messages, weighted by MIX."""
+    rng = random.Random(seed)
+    categories = list(MIX)
+    picks = rng.choices(categories, weights=[MIX[c] for c in categories], k=size)
+    return [rng.choice(corpus[c]) for c in picks]
+
+
+@suite("chat")
+def chat(quick: bool):
+    corpus = load_fixture("messages.json")
+    directory = tempfile.mkdtemp(prefix="ava-bench-chat-")
+    saved = (dictionary.API_URL, dictionary._cache, todo._backend)
+    stub = StubDictionary().start()
+    try:
+        dictionary.API_URL = stub.api_url
+        dictionary.set_offline_dictionary(None)
+        dictionary.set_cache(DictionaryCache(None))  # memory tier only
+        todo.set_backend(todo.JSONTaskBackend(os.path.join(directory, "tasks.ndjson"), window=0))
+
+        for category, messages in corpus.items():
+            yield Case(f"get_response[{category}]",
+                       lambda messages=messages: [chatbot.get_response(m) for m in messages],
+                       ops=len(messages))
+
+        # Dictionary lookups that always reach the (stub) API: no cache at all
+        words = corpus["dictionary"]
+        dictionary.set_cache(DictionaryCache(None, max_memory=0))
+        yield Case("get_response[dictionary.upstream]",
+                   lambda: [chatbot.get_response(m) for m in words], ops=len(words))
+        dictionary.set_cache(DictionaryCache(None))
+
+        mixed = mixed_messages(corpus)
+        yield Case("get_response[mixed]", lambda: [chatbot.get_response(m) for m in mixed], ops=len(mixed))
+        yield Case("get_response_many[mixed]", lambda: chatbot.get_response_many(mixed), ops=len(mixed))
+
+        # Through Flask (routing, JSON in/out), without a socket
+        from assistant.web import create_app
+        client = create_app({"START_BACKGROUND": False}).test_client()
+        yield Case("http.api_chat[mixed]",
+                   lambda: [client.post("/api/chat", json={"message": m}) for m in mixed], ops=len(mixed))
+        batch = {"messages": mixed}
+        yield Case("http.api_chat_batch[mixed]", lambda: client.post("/api/chat/batch", json=batch),
+                   ops=len(mixed))
+    finally:
+        stub.stop()
+        dictionary.API_URL = saved[0]
+        dictionary.set_cache(saved[1])
+        todo.set_backend(saved[2])
+        shutil.rmtree(directory, ignore_errors=True)
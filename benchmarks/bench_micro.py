@@ -0,0 +1,36 @@
+# =======================================================================
+# Microbenchmarks: text normalization and the calculator
+# =======================================================================
+
+import itertools  # Endless supply of distinct expressions
+
+from harness import Case, load_fixture, suite
+
+from assistant import grammar
+from assistant.features import calculator
+
+
+@suite("micro")
+def micro(quick: bool):
+    corpus = load_fixture("messages.json")
+    messages = [m for group in corpus.values() for m in group]
+
+    # normalize()
+    yield Case("normalize", lambda: [grammar.normalize(m) for m in messages], ops=len(messages))
+
+    # evaluate(): expressions seen before (parse cache hit) and new ones
+    exprs = [e for e in map(grammar.calculator_expression, (m.lower() for m in corpus["calculator"])) if e]
+    yield Case("evaluate.cached", lambda: [calculator.evaluate(e) for e in exprs], ops=len(exprs))
+
+    counter = itertools.count()
+
+    def fresh():
+        n = next(counter)
+        for template in ("{0} + {0} * 3", "({0} - 7) / 2", "{0} * {0} % 97"):
+            calculator.evaluate(template.format(n))
+
+    yield Case("evaluate.uncached", fresh, ops=3)
+
+    # evaluate_many(): a batch of same-shaped expressions (the vectorized path)
+    batch = [f"{i} * 3 + {i % 17}" for i in range(1000)]
+    yield Case("evaluate_many[1k]", lambda: calculator.evaluate_many(batch), ops=len(batch))
@@ -0,0 +1,80 @@
+# =======================================================================
+# Todo operations at 10 / 1k / 100k tasks, for both storage backends
+# =======================================================================
+# Every store is built directly (snapshot file / bulk import), then each
+# operation goes through the public functions of assistant.features.todo,
+# like the chatbot uses them. The JSON backend commits with window=0: one
+# fsync per change, the cost of a single user (a burst would share it).
+# =======================================================================
+
+import itertools  # Unique task titles
+import os         # Paths
+import shutil     # Remove the temporary stores
+import tempfile   # Stores live in a temporary directory
+
+from harness import Case, suite
+
+from assistant.features import todo
+from assistant.features.todo_journal import TaskJournal
+from assistant.features.todo_sqlite import SQLiteTaskBackend
+
+SIZES = {"10": 10, "1k": 1000, "100k": 100000}
+
+
+def _tasks(count: int) -> list:
+    return [
+        {"id": i, "title": f"task number {i}", "status": "done" if i % 3 == 0 else "pending",
+         "created_at": "2025-01-01T00:00:00"}
+        for i in range(1, count + 1)
+    ]
+
+
+def _open(kind: str, directory: str, tasks: list):
+    """Create a store holding `tasks`; returns a function that opens it."""
+    if kind == "json":
+        path = os.path.join(directory, "tasks.ndjson")
+        TaskJournal(path).compact(tasks, len(tasks) + 1)
+        return lambda: todo.JSONTaskBackend(path, window=0)
+    path = os.path.join(directory, "tasks.sqlite3")
+    SQLiteTaskBackend(path).import_tasks(tasks, len(tasks) + 1)
+    return lambda: SQLiteTaskBackend(path)
+
+
+@suite("todo")
+def todo_ops(quick: bool):
+    previous = todo._backend  # restored afterwards (None: load lazily again)
+    sizes = {k: v for k, v in SIZES.items() if not (quick and v > 1000)}
+    for kind in ("json", "sqlite"):
+        for label, count in sizes.items():
+            directory = tempfile.mkdtemp(prefix="ava-bench-todo-")
+            try:
+                yield from _cases(kind, label, count, directory)
+            finally:
+                todo.set_backend(previous)
+                shutil.rmtree(directory, ignore_errors=True)
+
+
+def _cases(kind: str, label: str, count: int, directory: str):
+    opener = _open(kind, directory, _tasks(count))
+    name = f"todo.{kind}.{{}}[{label}]"
+
+    # Loading the store (a worker's first todo command)
+    yield Case(name.format("load"), opener)
+
+    backend = opener()
+    todo.set_backend(backend)
+    titles = (f"new task {i}" for i in itertools.count())
+    ids = itertools.cycle(range(1, count + 1))
+
+    yield Case(name.format("add"), lambda: todo.add_task(next(titles)))
+    yield Case(name.format("show_first_page"), lambda: todo.get_tasks_page(limit=20))
+    yield Case(name.format("show_last_page"),
+               lambda: todo.get_tasks_page(limit=20, offset=max(0, count - 20)))
+    yield Case(name.format("show_pending_page"), lambda: todo.get_tasks_page("pending", limit=20))
+    yield Case(name.format("mark_done"), lambda: todo.mark_done(next(ids)))
+
+    # remove: every timed call removes a task that setup() just added
+    added = []
+    yield Case(name.format("remove"),
+               lambda: todo.remove_task(added.pop()),
+               setup=lambda: added.append(backend.add(next(titles), "2025-01-01T00:00:00")["id"]))
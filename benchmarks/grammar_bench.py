@@ -0,0 +1,158 @@
+# =======================================================================
+# Microbenchmark: query detectors (assistant/grammar.py)
+# =======================================================================
+# Usage (from the project root):
+#   python benchmarks/grammar_bench.py
+#   python benchmarks/grammar_bench.py --repeat 10 --number 2000
+#
+# Measures the per-message cost of recognizing a message (normalize +
+# dictionary + calculator + todo detection) with:
+#   before : the detectors of the original chatbot.py (raw pattern strings
+#            passed to re.search/re.sub/re.fullmatch on every call, the
+#            text lowercased/stripped again by each detector), kept below
+#            verbatim apart from comments
+#   after  : assistant.grammar (patterns compiled once, text prepared once)
+# The todo grammar has grown since then: "show [pending|done] tasks
+# [page N]" is new, and the original detector does not parse a status or
+# a page. So "before" does slightly less todo work than "after", and the
+# answers are compared in the original detector's terms (see as_before()).
+# =======================================================================
+
+import argparse  # Command line options
+import os        # Make the project importable when run as a script
+import re        # The baseline detectors use the re module directly
+import sys
+import timeit    # Timing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from assistant import grammar  # noqa: E402
+
+# A mix of what the detectors see: greetings, misses, dictionary,
+# calculator and todo messages
+MESSAGES = [
+    "hello", "hi there!", "how are you doing today?", "thanks a lot",
+    "what is your name", "tell me a joke", "asdkjh qwe", "good night :)",
+    "meaning of serendipity", "what does ephemeral mean", "define umbrella",
+    "definition of computer", "what is 5+7", "calculate 12 * 8", "2 + 2",
+    "solve (3 + 4) * 2", "add task buy milk", "show tasks", "show pending tasks page 2",
+    "remove task 3", "mark done 2", "what is the weather like", "I mean it",
+]
+
+
+# ===============================
+# Baseline: the detectors before assistant/grammar.py
+# ===============================
+def old_normalize(s):
+    return re.sub(r"[^a-z0-9\s]+", "", s.lower()).strip()
+
+
+def old_dictionary(user_msg):
+    patterns = [
+        r"meaning of (.+)",
+        r"what does (.+) mean",
+        r"define (.+)",
+        r"definition of (.+)"
+    ]
+    for pat in patterns:
+        match = re.search(pat, user_msg, re.IGNORECASE)
+        if match:
+            return match.group(1).strip()
+    return None
+
+
+def old_calculator(user_msg_raw):
+    msg = user_msg_raw.lower()
+    phrasal = [
+        r"^\s*what\s+is\s+(.+)$",
+        r"^\s*calculate\s+(.+)$",
+        r"^\s*solve\s+(.+)$",
+    ]
+    for pat in phrasal:
+        m = re.search(pat, msg)
+        if m:
+            expr = m.group(1)
+            expr = re.sub(r"[^0-9+\-*/%.()\s]", "", expr)
+            expr = expr.strip()
+            if re.search(r"[+\-*/%]", expr):
+                return expr
+    if re.fullmatch(r"[0-9+\-*/%.()\s]+", msg):
+        if re.search(r"[+\-*/%]", msg):
+            return msg.strip()
+    return None
+
+
+def old_todo(user_msg):
+    user_msg = user_msg.strip().lower()
+    if user_msg.startswith("add task "):
+        return ("add", user_msg[9:].strip())
+    elif re.match(r"show tasks?", user_msg):
+        return ("show", None)
+    elif user_msg.startswith("remove task "):
+        task_name = user_msg[12:].strip()
+        if task_name:
+            return ("remove", task_name)
+    elif user_msg.startswith("mark done "):
+        m = re.match(r"mark done (\d+)", user_msg)
+        if m:
+            return ("done", int(m.group(1)))
+        if m:
+            return ("done", int(m.group(1)))
+    return None
+
+
+def before(message):
+    normalized = old_normalize(message)
+    return old_dictionary(normalized), old_calculator(message.lower()), old_todo(message)
+
+
+def after(message):
+    normalized = grammar.normalize(message)
+    lower = message.lower()
+    return grammar.dictionary_word(normalized), grammar.calculator_expression(lower), grammar.todo_command(lower)
+
+
+def as_before(answers):
+    """after()'s answers as the original detectors give them: "show tasks
+    [page N]" -> ("show", None), and no "show pending/done tasks"."""
+    dictionary, calculator, todo = answers
+    if todo is not None and todo[0] == "show":
+        todo = ("show", None) if todo[1][0] is None else None
+    return dictionary, calculator, todo
+
+
+# ===============================
+# Benchmark
+# ===============================
+def per_message(fn, number: int, repeat: int) -> float:
+    """Best time, in nanoseconds per message, of running fn over MESSAGES."""
+    def run():
+        for message in MESSAGES:
+            fn(message)
+    best = min(timeit.repeat(run, number=number, repeat=repeat))
+    return best / (number * len(MESSAGES)) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-message cost of the query detectors")
+    parser.add_argument("--number", type=int, default=1000, help="passes over the messages per timing")
+    parser.add_argument("--repeat", type=int, default=5, help="timings (the best one is reported)")
+    args = parser.parse_args()
+
+    # Same answers first: a faster wrong detector is not an improvement
+    for message in MESSAGES:
+        assert before(message) == as_before(after(message)), message
+
+    # Warm up re's pattern cache for the baseline (its best case)
+    per_message(before, 10, 1)
+
+    old = per_message(before, args.number, args.repeat)
+    new = per_message(after, args.number, args.repeat)
+    print(f"messages : {len(MESSAGES)}")
+    print(f"before   : {old:8.0f} ns/message")
+    print(f"after    : {new:8.0f} ns/message")
+    print(f"speedup  : {old / new:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
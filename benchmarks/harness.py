@@ -0,0 +1,178 @@
+# =======================================================================
+# Benchmark harness
+# =======================================================================
+# The pieces shared by the benchmark suites (see run.py):
+#   - Case: one timed operation
+#   - @suite("name"): registers a generator of Cases. Setup goes before the
+#     first `yield`, cleanup after the last one (or in a `finally`), so big
+#     fixtures are only built when their suite is selected.
+#   - measure(): times a Case and reports the median of several samples
+#     (steadier than the mean, and unlike the minimum it includes the
+#     usual GC pauses and cache misses)
+#   - save()/load()/compare(): JSON results and the comparison with a
+#     saved baseline
+# =======================================================================
+
+import json       # Results files
+import os         # Paths
+import platform   # Machine description in the results
+import statistics  # Median
+import subprocess  # Current git commit, for the results metadata
+import sys
+import time       # Timing
+from datetime import datetime, timezone
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+SUITES = {}  # name -> generator function(quick) yielding Cases
+
+
+# ===============================
+# CLASS: Case
+# ===============================
+class Case:
+    """
+    One benchmark.
+
+    Args:
+        name (str): Unique name, e.g. "todo.add[1k]".
+        run (callable): Does `ops` operations per call.
+        ops (int): Operations per run() call (results are per operation).
+        setup (callable, optional): Called before every timed run() (not timed),
+            e.g. to re-create tasks that run() removes.
+    """
+
+    def __init__(self, name: str, run, ops: int = 1, setup=None):
+        self.name = name
+        self.run = run
+        self.ops = ops
+        self.setup = setup
+
+
+def suite(name: str):
+    """Decorator: register a suite (a generator function taking `quick`)."""
+    def decorator(fn):
+        SUITES[name] = fn
+        return fn
+    return decorator
+
+
+def load_fixture(name: str):
+    with open(os.path.join(FIXTURES, name), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ===============================
+# Timing
+# ===============================
+def measure(case: Case, repeat: int = 7, min_time: float = 0.2) -> dict:
+    """
+    Time a case: one warm-up run, then `repeat` samples. A sample calls
+    run() as many times as fit in about `min_time` seconds (calibrated on
+    the warm-up), so fast operations are not lost in timer noise.
+
+    Returns:
+        dict: per-operation times in microseconds (median/min/max) and the
+        throughput derived from the median.
+    """
+    if case.setup:
+        case.setup()
+    start = time.perf_counter()
+    case.run()
+    elapsed = time.perf_counter() - start
+    loops = max(1, int(min_time / elapsed)) if elapsed > 0 else 1000
+    if case.setup:
+        # setup must run before every call: take more one-call samples instead
+        repeat = max(repeat, min(200, loops))
+        loops = 1
+
+    samples = []
+    for _ in range(repeat):
+        total = 0.0
+        for _ in range(loops):
+            if case.setup:
+                case.setup()
+            start = time.perf_counter()
+            case.run()
+            total += time.perf_counter() - start
+        samples.append(total / (loops * case.ops) * 1e6)
+
+    median = statistics.median(samples)
+    return {
+        "unit": "us",
+        "median": round(median, 4),
+        "min": round(min(samples), 4),
+        "max": round(max(samples), 4),
+        "ops_per_sec": round(1e6 / median, 1) if median else None,
+        "repeat": repeat,
+        "ops": case.ops * loops,
+    }
+
+
+# ===============================
+# Results files
+# ===============================
+def metadata(quick: bool) -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+            capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "quick": quick,
+    }
+
+
+def save(path: str, results: dict, meta: dict):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(results: dict, baseline: dict, threshold: float = 10.0) -> list:
+    """
+    Print each benchmark's median against the baseline's.
+
+    Args:
+        results (dict): name -> measurement (this run).
+        baseline (dict): A loaded results file.
+        threshold (float): Percent slowdown that counts as a regression.
+
+    Returns:
+        list: Names of the benchmarks that regressed.
+    """
+    base = baseline.get("results", {})
+    regressions = []
+    width = max((len(name) for name in results), default=10)
+    print(f"\n{'benchmark':<{width}}  {'baseline':>12}  {'current':>12}  {'change':>8}")
+    for name in sorted(results):
+        current = results[name]["median"]
+        if name not in base:
+            print(f"{name:<{width}}  {'-':>12}  {current:>10.2f}us  {'new':>8}")
+            continue
+        before = base[name]["median"]
+        change = (current - before) / before * 100 if before else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif change < -threshold:
+            flag = "  faster"
+        print(f"{name:<{width}}  {before:>10.2f}us  {current:>10.2f}us  {change:>+7.1f}%{flag}")
+    skipped = len(set(base) - set(results))
+    if skipped:
+        print(f"({skipped} baseline benchmark(s) not run)")
+    return regressions
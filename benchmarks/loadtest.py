@@ -0,0 +1,439 @@
+# =======================================================================
+# Load test for /api/chat
+# =======================================================================
+# Usage (from the project root):
+#   python benchmarks/loadtest.py --rps 50 --duration 30        against http://127.0.0.1:5000
+#   python benchmarks/loadtest.py --url http://10.0.0.5:8000 --rps 200 --mix dictionary=1
+#   python benchmarks/loadtest.py --start-server --stub-latency 0.05 --stub-error-rate 0.01 \
+#       --server-args "--workers 4 --threads 8" --rps 300 -o load.json
+#
+# Open loop: requests are sent on a fixed schedule (Poisson arrivals at
+# --rps by default), whether or not the earlier ones were answered, like
+# users who do not wait for each other. Latency is measured from the
+# SCHEDULED send time, so a server that falls behind shows up as latency
+# (and as a lower achieved throughput) instead of quietly slowing the
+# test down, as it would with N clients each waiting for its answer.
+#
+# Messages come from fixtures/messages.json; --mix sets the share of each
+# category (default: the mixed workload of bench_chat.py). The report
+# gives, per category, the requests sent, the failures (non-200 answers,
+# timeouts, connection errors), p50/p95/p99/max latency of the successful
+# ones and the achieved throughput. The first --warmup seconds are sent
+# but not counted.
+#
+# --start-server runs the whole setup locally: the stub dictionary API
+# (stub_dictionary.py, with --stub-latency and --stub-error-rate) and the
+# app (python -m assistant.serve, with --server-args), pointed at the
+# stub through AVA_DICTIONARY_API_URL, with scratch cache and data
+# directories. Without it, start the stub and the server yourself:
+#   python benchmarks/stub_dictionary.py --port 8001 --latency 0.05
+#   AVA_DICTIONARY_API_URL=http://127.0.0.1:8001 python -m assistant.serve
+#
+# The dictionary category asks for the same few words, which the server
+# caches after the first lookup; --fresh-words asks for a new word every
+# time, so every dictionary request reaches the (stub) API.
+#
+# The client is a small HTTP/1.1 client on asyncio streams (keep-alive,
+# at most --connections connections): no dependency, and a cost per
+# request that stays flat with thousands of requests waiting. If the
+# "send lag" line of the report grows, the load generator itself is the
+# bottleneck: lower --rps or run it on another machine.
+# =======================================================================
+
+import argparse    # Command line options
+import asyncio     # Open-loop scheduling and the HTTP client
+import json        # Request bodies, results file
+import math        # Percentiles
+import os          # Paths, environment of the started server
+import random      # Arrivals and message mix
+import shlex       # --server-args
+import shutil      # Remove the scratch directory
+import signal      # Stop the stub (it prints its counters)
+import socket      # Free ports, waiting for the server
+import subprocess  # --start-server
+import sys         # Import paths, exit code
+import tempfile    # Scratch directory for the started server
+import time        # Waiting for the server
+from urllib.parse import urlsplit
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+import harness  # noqa: E402  (fixtures, results metadata)
+
+# Default share of each category (the "mixed" workload of bench_chat.py)
+DEFAULT_MIX = {"greetings": 40, "misses": 25, "calculator": 15, "todo": 10, "dictionary": 10}
+PERCENTILES = (50, 95, 99)
+
+
+# ===============================
+# Workload
+# ===============================
+def parse_mix(text: str, categories) -> dict:
+    """Parse "greetings=40,dictionary=10" into {category: weight}."""
+    mix = {}
+    for part in filter(None, (p.strip() for p in text.split(","))):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in categories:
+            raise SystemExit(f"unknown category {name!r} (known: {', '.join(sorted(categories))})")
+        try:
+            mix[name] = float(weight) if weight else 1.0
+        except ValueError:
+            raise SystemExit(f"invalid weight in {part!r}")
+    if not mix or sum(mix.values()) <= 0:
+        raise SystemExit("the mix needs at least one category with a positive weight")
+    return mix
+
+
+def _fresh_word(n: int) -> str:
+    """A new letters-only word per number: "ltb", "ltc", ..."""
+    letters = ""
+    n += 1
+    while n:
+        n, rest = divmod(n, 26)
+        letters = "abcdefghijklmnopqrstuvwxyz"[rest] + letters
+    return "lt" + letters
+
+
+def schedule(corpus: dict, mix: dict, rps: float, duration: float, arrivals: str = "poisson",
+             fresh_words: bool = False, seed: int = 42):
+    """
+    Yield (send_offset, category, message) for `duration` seconds at `rps`.
+
+    Args:
+        corpus (dict): category -> messages (fixtures/messages.json).
+        mix (dict): category -> weight.
+        arrivals (str): "poisson" (random gaps, like independent users)
+            or "uniform" (one request every 1/rps seconds).
+        fresh_words (bool): Replace dictionary messages with lookups of
+            words never asked before (no server-side cache hits).
+    """
+    rng = random.Random(seed)
+    categories = list(mix)
+    weights = [mix[c] for c in categories]
+    offset = 0.0
+    count = 0
+    while True:
+        offset += rng.expovariate(rps) if arrivals == "poisson" else 1.0 / rps
+        if offset >= duration:
+            return
+        category = rng.choices(categories, weights)[0]
+        if fresh_words and category == "dictionary":
+            message = f"define {_fresh_word(count)}"
+        else:
+            message = rng.choice(corpus[category])
+        count += 1
+        yield offset, category, message
+
+
+# ===============================
+# CLASS: HTTPClient
+# ===============================
+class HTTPClient:
+    """
+    Minimal keep-alive HTTP/1.1 client for JSON POSTs on asyncio streams.
+
+    Args:
+        host (str): Server address.
+        port (int): Server port.
+        connections (int): Maximum open connections (requests beyond that wait).
+    """
+
+    def __init__(self, host: str, port: int, connections: int = 100):
+        self.host = host
+        self.port = port
+        self._idle = []  # open connections: (reader, writer)
+        self._slots = asyncio.Semaphore(connections)
+
+    async def post_json(self, path: str, data) -> int:
+        """POST `data` as JSON; returns the status code (the body is read and dropped)."""
+        body = json.dumps(data).encode("utf-8")
+        request = (
+            f"POST {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+        ).encode("latin-1") + body
+        async with self._slots:
+            while True:
+                reused = bool(self._idle)
+                reader, writer = self._idle.pop() if reused else await asyncio.open_connection(self.host, self.port)
+                try:
+                    status, keep_alive = await self._exchange(reader, writer, request)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    writer.close()
+                    if reused:
+                        continue  # the server closed an idle connection: try the next one
+                    raise
+                except BaseException:
+                    writer.close()  # timeout/cancellation: the answer may still come, drop the connection
+                    raise
+                if keep_alive:
+                    self._idle.append((reader, writer))
+                else:
+                    writer.close()
+                return status
+
+    @staticmethod
+    async def _exchange(reader, writer, request: bytes) -> tuple:
+        writer.write(request)
+        await writer.drain()
+        head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        version, status = head[0].split(" ", 2)[:2]
+        headers = {}
+        for line in head[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip().lower()
+
+        if "content-length" in headers:
+            await reader.readexactly(int(headers["content-length"]))
+        elif headers.get("transfer-encoding") == "chunked":
+            while True:
+                size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                await reader.readexactly(size + 2)  # chunk + CRLF
+                if size == 0:
+                    break
+        else:
+            await reader.read()  # body until the server closes
+            return int(status), False
+
+        connection = headers.get("connection", "")
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        return int(status), keep_alive
+
+    def close(self):
+        for _, writer in self._idle:
+            writer.close()
+        self._idle.clear()
+
+
+# ===============================
+# Running the load
+# ===============================
+async def run_load(url: str, plan, warmup: float, timeout: float, connections: int) -> dict:
+    """
+    Send the scheduled requests (open loop) and collect the measurements.
+
+    Returns:
+        dict: "records" (category, latency or None, outcome, finish time),
+        "lags" (send lag per measured request) and "start" of the measured
+        window, all times in seconds on the event loop clock.
+    """
+    parts = urlsplit(url)
+    client = HTTPClient(parts.hostname or "127.0.0.1", parts.port or 80, connections)
+    path = (parts.path.rstrip("/") or "") + "/api/chat"
+    loop = asyncio.get_running_loop()
+    records, lags, pending = [], [], set()
+
+    async def one(category: str, message: str, scheduled: float, measured: bool):
+        if measured:
+            lags.append(loop.time() - scheduled)
+        try:
+            status = await asyncio.wait_for(client.post_json(path, {"message": message}), timeout)
+            outcome = "ok" if status == 200 else f"HTTP {status}"
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+        except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+            outcome = type(e).__name__
+        finished = loop.time()
+        if measured:
+            records.append((category, finished - scheduled if outcome == "ok" else None, outcome, finished))
+
+    start = loop.time()
+    for offset, category, message in plan:
+        delay = start + offset - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        task = asyncio.create_task(one(category, message, start + offset, offset >= warmup))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+    if pending:
+        await asyncio.wait(pending)
+    client.close()
+    return {"records": records, "lags": lags, "start": start + warmup}
+
+
+def percentile(sorted_values: list, p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
+
+
+def summarize(run: dict, duration: float) -> dict:
+    """
+    Per category (and "all"): counts, failures by kind, latency
+    percentiles in milliseconds and throughput in requests per second.
+
+    Throughput is the successful answers divided by the measured window,
+    which runs from the end of the warm-up to the last answer (so answers
+    still arriving after the last send are not counted as free).
+    """
+    records = run["records"]
+    window = max((r[3] for r in records), default=run["start"]) - run["start"]
+    window = max(window, duration)
+    groups = {}
+    for record in records:
+        groups.setdefault(record[0], []).append(record)
+    groups["all"] = records
+
+    summary = {}
+    for category, rows in groups.items():
+        latencies = sorted(r[1] * 1000 for r in rows if r[1] is not None)
+        failures = {}
+        for r in rows:
+            if r[2] != "ok":
+                failures[r[2]] = failures.get(r[2], 0) + 1
+        entry = {
+            "sent": len(rows),
+            "ok": len(latencies),
+            "failed": len(rows) - len(latencies),
+            "failures": failures,
+            "throughput": round(len(latencies) / window, 2) if window > 0 else None,
+        }
+        if latencies:
+            for p in PERCENTILES:
+                entry[f"p{p}"] = round(percentile(latencies, p), 2)
+            entry["max"] = round(latencies[-1], 2)
+            entry["mean"] = round(sum(latencies) / len(latencies), 2)
+        summary[category] = entry
+    return summary
+
+
+def print_report(summary: dict, run: dict, rps: float, duration: float):
+    print(f"\n{'category':<12} {'sent':>7} {'ok':>7} {'failed':>7} {'req/s':>8} "
+          f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for category in sorted(summary, key=lambda c: (c == "all", c)):
+        s = summary[category]
+        cells = "".join(f" {s[k]:>9.1f}" if k in s else f" {'-':>9}" for k in ("p50", "p95", "p99", "max"))
+        print(f"{category:<12} {s['sent']:>7} {s['ok']:>7} {s['failed']:>7} {s['throughput'] or 0:>8.1f}{cells}")
+
+    failures = summary.get("all", {}).get("failures")
+    if failures:
+        print("failures: " + ", ".join(f"{k} x{v}" for k, v in sorted(failures.items())))
+    print(f"offered {rps:g} req/s for {duration:g}s")
+    lags = sorted(run["lags"])
+    if lags:
+        print(f"send lag: p99 {percentile(lags, 99) * 1000:.1f} ms, max {lags[-1] * 1000:.1f} ms "
+              "(high values: the load generator could not keep up)")
+
+
+# ===============================
+# --start-server
+# ===============================
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for_port(port: int, process, seconds: float = 30.0):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"the server exited during startup (code {process.returncode})")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise SystemExit(f"nothing listening on port {port} after {seconds:g}s")
+
+
+def start_local(args) -> tuple:
+    """Start the stub API and the app; returns (url, [processes], scratch dir)."""
+    scratch = tempfile.mkdtemp(prefix="ava-loadtest-")
+    stub_port, app_port = _free_port(), _free_port()
+    stub = subprocess.Popen(
+        [sys.executable, os.path.join(BENCH_DIR, "stub_dictionary.py"), "--port", str(stub_port),
+         "--latency", str(args.stub_latency), "--error-rate", str(args.stub_error_rate)],
+        stdout=subprocess.PIPE, text=True,
+    )
+    env = dict(os.environ,
+               AVA_DICTIONARY_API_URL=f"http://127.0.0.1:{stub_port}",
+               AVA_CACHE_DIR=os.path.join(scratch, "cache"),
+               AVA_DATA_DIR=os.path.join(scratch, "data"),
+               AVA_OFFLINE_DICTIONARY="off")
+    app = subprocess.Popen(
+        [sys.executable, "-m", "assistant.serve", "--port", str(app_port), *shlex.split(args.server_args)],
+        cwd=harness.PROJECT_ROOT, env=env,
+    )
+    processes = [stub, app]
+    try:
+        _wait_for_port(stub_port, stub)
+        _wait_for_port(app_port, app)
+    except BaseException:
+        stop_local(processes, scratch)
+        raise
+    return f"http://127.0.0.1:{app_port}", processes, scratch
+
+
+def stop_local(processes: list, scratch: str):
+    stub, app = processes
+    app.terminate()
+    stub.send_signal(signal.SIGINT)  # the stub prints its counters on Ctrl-C
+    for process in (app, stub):
+        try:
+            process.wait(10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    lines = stub.stdout.read().strip().splitlines()
+    if lines:
+        print(f"stub dictionary API: {lines[-1]}")
+    shutil.rmtree(scratch, ignore_errors=True)
+
+
+# ===============================
+# Main
+# ===============================
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Open-loop load test for /api/chat")
+    parser.add_argument("--url", default="http://127.0.0.1:5000", help="server base URL (default %(default)s)")
+    parser.add_argument("--rps", type=float, default=20.0, help="requests per second to send (default 20)")
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds (default 30)")
+    parser.add_argument("--warmup", type=float, default=2.0, help="seconds sent before measuring (default 2)")
+    parser.add_argument("--mix", help="category weights, e.g. greetings=40,dictionary=10 (default: mixed)")
+    parser.add_argument("--arrivals", choices=("poisson", "uniform"), default="poisson")
+    parser.add_argument("--fresh-words", action="store_true", help="never repeat a dictionary word")
+    parser.add_argument("--timeout", type=float, default=10.0, help="seconds per request (default 10)")
+    parser.add_argument("--connections", type=int, default=100, help="max open connections (default 100)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("-o", "--output", help="write the results to this JSON file")
+    local = parser.add_argument_group("local setup (--start-server)")
+    local.add_argument("--start-server", action="store_true",
+                       help="start the stub dictionary API and the app, and test them")
+    local.add_argument("--server-args", default="", help='options for assistant.serve, e.g. "--workers 4"')
+    local.add_argument("--stub-latency", type=float, default=0.05, help="stub API seconds per answer (default 0.05)")
+    local.add_argument("--stub-error-rate", type=float, default=0.0, help="stub API share of 503 answers (0..1)")
+    args = parser.parse_args(argv)
+    if args.rps <= 0 or args.duration <= 0:
+        parser.error("--rps and --duration must be positive")
+
+    corpus = harness.load_fixture("messages.json")
+    mix = parse_mix(args.mix, corpus) if args.mix else DEFAULT_MIX
+    plan = schedule(corpus, mix, args.rps, args.warmup + args.duration, args.arrivals, args.fresh_words, args.seed)
+
+    url, processes, scratch = args.url, None, None
+    if args.start_server:
+        url, processes, scratch = start_local(args)
+    try:
+        print(f"Sending {args.rps:g} req/s to {url}/api/chat for {args.warmup:g}s warm-up "
+              f"+ {args.duration:g}s ({args.arrivals} arrivals)", flush=True)
+        run = asyncio.run(run_load(url, plan, args.warmup, args.timeout, args.connections))
+    finally:
+        if processes:
+            stop_local(processes, scratch)
+
+    summary = summarize(run, args.duration)
+    print_report(summary, run, args.rps, args.duration)
+    if args.output:
+        meta = harness.metadata(False)
+        meta.pop("quick")
+        meta.update(url=url, rps=args.rps, duration=args.duration, warmup=args.warmup, mix=mix,
+                    arrivals=args.arrivals, fresh_words=args.fresh_words, server_args=args.server_args or None,
+                    stub_latency=args.stub_latency if args.start_server else None,
+                    stub_error_rate=args.stub_error_rate if args.start_server else None)
+        harness.save(args.output, summary, meta)
+        print(f"\nSaved the results to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
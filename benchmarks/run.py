@@ -0,0 +1,92 @@
+# =======================================================================
+# Benchmark runner
+# =======================================================================
+# Usage (from the project root):
+#   python benchmarks/run.py                            all suites, table on stdout
+#   python benchmarks/run.py --quick                    fewer samples, no 100k-task stores
+#   python benchmarks/run.py --suite todo --only add    one suite, cases containing "add"
+#   python benchmarks/run.py -o baseline.json           save the results as JSON
+#   python benchmarks/run.py --compare baseline.json    compare with saved results
+#                                                       (exit code 1 on a regression)
+#   python benchmarks/run.py --list                     list the suites
+#
+# Suites:
+#   micro  normalize(), evaluate(), evaluate_many()            (bench_micro.py)
+#   todo   each todo operation at 10/1k/100k tasks, json+sqlite (bench_todo.py)
+#   chat   get_response() per message category, mixed workload,
+#          and /api/chat through the Flask test client          (bench_chat.py)
+# Messages come from fixtures/messages.json. Times are per operation
+# (one message, one expression, one todo command).
+#
+# Compare results from the same machine only; use --threshold to set the
+# slowdown (in percent) that counts as a regression (default 10).
+# =======================================================================
+
+import argparse  # Command line options
+import atexit    # Remove the scratch directory at the end
+import os        # Environment for an isolated run
+import shutil    # (scratch directory)
+import sys       # Import paths, exit code
+import tempfile  # Scratch directory for caches and data
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))  # the project (assistant package)
+sys.path.insert(0, BENCH_DIR)                   # harness.py and the suites
+
+# Isolate the run before anything from `assistant` is imported: no user
+# caches, no user task list, no offline dictionary file, no metrics
+_SCRATCH = tempfile.mkdtemp(prefix="ava-bench-")
+atexit.register(shutil.rmtree, _SCRATCH, True)
+os.environ["AVA_CACHE_DIR"] = os.path.join(_SCRATCH, "cache")
+os.environ["AVA_DATA_DIR"] = os.path.join(_SCRATCH, "data")
+os.environ["AVA_OFFLINE_DICTIONARY"] = "off"
+os.environ.pop("AVA_METRICS", None)
+
+import harness  # noqa: E402
+import bench_chat  # noqa: E402,F401  (registers its suite)
+import bench_micro  # noqa: E402,F401
+import bench_todo  # noqa: E402,F401
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the A.V.A benchmarks")
+    parser.add_argument("--suite", action="append", choices=sorted(harness.SUITES),
+                        help="suite to run (repeatable; default: all)")
+    parser.add_argument("--only", help="run only the cases whose name contains this text")
+    parser.add_argument("--quick", action="store_true", help="fewer samples, smaller stores")
+    parser.add_argument("--repeat", type=int, help="samples per case (default 7, 3 with --quick)")
+    parser.add_argument("-o", "--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare with a saved results file")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="slowdown in percent that counts as a regression (default 10)")
+    parser.add_argument("--list", action="store_true", help="list the suites and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(sorted(harness.SUITES)))
+        return 0
+
+    repeat = args.repeat or (3 if args.quick else 7)
+    min_time = 0.05 if args.quick else 0.2
+    results = {}
+    for name in args.suite or sorted(harness.SUITES):
+        for case in harness.SUITES[name](args.quick):
+            if args.only and args.only not in case.name:
+                continue
+            result = results[case.name] = harness.measure(case, repeat, min_time)
+            print(f"{case.name:<45} {result['median']:>12.2f} us/op  {result['ops_per_sec']:>12,.0f} ops/s",
+                  flush=True)
+
+    if args.output:
+        harness.save(args.output, results, harness.metadata(args.quick))
+        print(f"\nSaved {len(results)} results to {args.output}")
+    if args.compare:
+        regressions = harness.compare(results, harness.load(args.compare), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:g}%")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+# =======================================================================
+# Local stand-in for the Free Dictionary API
+# =======================================================================
+# Answers GET /api/v2/entries/en/<word> like https://api.dictionaryapi.dev
+# does, so benchmarks never touch the network:
+#   - 200 with [{"word": ..., "meanings": [{"definitions": [{"definition": ...}]}]}]
+#   - 404 for words starting with "zz" (the "no such word" answer)
+#   - 503 for a random `error_rate` share of the requests (an overloaded API)
+#
+# In-process (benchmarks):
+#     with StubDictionary(latency=0.02) as stub:
+#         dictionary.API_URL = stub.api_url
+#         ...
+#
+# Standalone (load tests, see loadtest.py), then start the server with
+# the printed AVA_DICTIONARY_API_URL:
+#     python benchmarks/stub_dictionary.py --port 8001 --latency 0.05 --error-rate 0.01
+# =======================================================================
+
+import argparse   # Command line options (standalone mode)
+import json       # Response bodies
+import random     # Error injection
+import threading  # The server runs in a background thread
+import time       # Simulated latency
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PATH_PREFIX = "/api/v2/entries/en/"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    disable_nagle_algorithm = True  # headers and body are separate writes: no 40 ms delayed-ACK stall
+
+    def do_GET(self):
+        stub = self.server.stub
+        failed = stub._count()
+        if stub.latency:
+            time.sleep(stub.latency)
+        if failed:
+            self._send(503, {"title": "Service Unavailable"})
+            return
+        if not self.path.startswith(PATH_PREFIX):
+            self._send(404, {"title": "Not Found"})
+            return
+        word = self.path[len(PATH_PREFIX):]
+        if word.startswith("zz"):
+            self._send(404, {"title": "No Definitions Found"})
+            return
+        self._send(200, [{
+            "word": word,
+            "meanings": [{"partOfSpeech": "noun", "definitions": [{"definition": f"A stub definition of {word}."}]}],
+        }])
+
+    def _send(self, status: int, data):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass  # no access log on stderr
+
+
+# ===============================
+# CLASS: StubDictionary
+# ===============================
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # listen backlog: a load test opens many connections at once
+
+
+class StubDictionary:
+    """
+    A stub dictionary API server, in a background thread.
+
+    Args:
+        latency (float): Seconds each answer is delayed.
+        port (int): Port to listen on (0 = any free port).
+        error_rate (float): Share of the requests (0..1) answered with 503.
+        host (str): Address to listen on.
+        seed: Seed for the error injection (None = random).
+    """
+
+    def __init__(self, latency: float = 0.0, port: int = 0, error_rate: float = 0.0,
+                 host: str = "127.0.0.1", seed=None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), _Handler)
+        self._server.stub = self
+        self._thread = None
+
+    def _count(self) -> bool:
+        """Count a request; True if it must fail (error injection)."""
+        with self._lock:
+            self.requests += 1
+            failed = self.error_rate > 0 and self._random.random() < self.error_rate
+            self.errors += failed
+            return failed
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    @property
+    def base_url(self) -> str:
+        """Base URL for the AVA_DICTIONARY_API_URL setting."""
+        host = self._server.server_address[0]
+        return f"http://{'127.0.0.1' if host in ('', '0.0.0.0') else host}:{self.port}"
+
+    @property
+    def api_url(self) -> str:
+        """URL template for assistant.features.dictionary.API_URL."""
+        return f"{self.base_url}{PATH_PREFIX}{{word}}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-dictionary", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a stub dictionary API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per answer (default 0)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of 503 answers, 0..1 (default 0)")
+    parser.add_argument("--seed", type=int, help="seed for the error injection")
+    args = parser.parse_args(argv)
+
+    stub = StubDictionary(args.latency, args.port, args.error_rate, args.host, args.seed)
+    print(f"AVA_DICTIONARY_API_URL={stub.base_url}", flush=True)
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub._server.server_close()
+        print(f"{stub.requests} requests, {stub.errors} errors", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# =======================================================================
+# Build an offline dictionary file for assistant/features/dictionary.py
+# =======================================================================
+# Usage (from the project root):
+#   python scripts/build_offline_dictionary.py --json words.json
+#   python scripts/build_offline_dictionary.py --wordnet
+#   python scripts/build_offline_dictionary.py --json words.json -o /srv/ava/dictionary.avadict
+#
+# Supported sources:
+#   --json     a JSON file that is either
+#                - a mapping:  {"umbrella": "A canopy ...", ...}
+#                - a list of Free Dictionary API entries:
+#                  [{"word": "umbrella", "meanings": [{"definitions": [{"definition": "..."}]}]}, ...]
+#   --wordnet  NLTK's WordNet corpus (pip install nltk; python -m nltk.downloader wordnet)
+#
+# The default output is assistant/data/dictionary.avadict, which get_meaning()
+# picks up automatically (or point AVA_OFFLINE_DICTIONARY at another file).
+# =======================================================================
+
+import argparse  # Command line options
+import json      # Read JSON dumps
+import os        # Paths
+import sys       # Make the project importable when run as a script
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from assistant.features.dictionary import DEFAULT_OFFLINE_DICTIONARY  # noqa: E402
+from assistant.features.offline_dictionary import build_offline_dictionary  # noqa: E402
+
+
+def json_entries(path: str):
+    """Yield (word, definition) pairs from a JSON dump (mapping or API-style list)."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    if isinstance(data, dict):
+        for word, definition in data.items():
+            if isinstance(definition, str):
+                yield word, definition
+        return
+
+    for entry in data:
+        try:
+            yield entry["word"], entry["meanings"][0]["definitions"][0]["definition"]
+        except (LookupError, TypeError):
+            continue  # skip entries without a definition
+
+
+def wordnet_entries():
+    """Yield (word, definition) pairs from NLTK's WordNet (most common sense per word)."""
+    try:
+        from nltk.corpus import wordnet
+    except ImportError:
+        sys.exit("nltk is required for --wordnet (pip install nltk)")
+
+    for name in wordnet.all_lemma_names():
+        synsets = wordnet.synsets(name)  # ordered from most to least common sense
+        if synsets:
+            yield name.replace("_", " "), synsets[0].definition()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build an offline dictionary file (.avadict)")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--json", help="JSON dump (mapping or Free Dictionary API entries)")
+    source.add_argument("--wordnet", action="store_true", help="use NLTK's WordNet corpus")
+    parser.add_argument("-o", "--output", default=DEFAULT_OFFLINE_DICTIONARY, help="output file")
+    args = parser.parse_args()
+
+    entries = wordnet_entries() if args.wordnet else json_entries(args.json)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    count = build_offline_dictionary(entries, args.output)
+    print(f"Wrote {count} words to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# =======================================================================
+# Calculator: the parser must answer exactly like the old eval() code
+# =======================================================================
+# A seeded fuzz run compares evaluate() (and evaluate_many()) with the
+# eval()-based evaluate() it replaced, on random character soup and on
+# random well-formed expressions. Only inputs over the size limits may
+# differ ("Expression is too large to evaluate").
+# =======================================================================
+
+import random
+import re
+import unittest
+import warnings
+
+from assistant.features import calculator
+
+FUZZ_CASES = 200_000
+
+
+def eval_reference(expr: str):
+    """evaluate() as it was before the parser (eval() on the validated text)."""
+    try:
+        expr = expr.replace(" ", "")
+        if not re.fullmatch(r"[0-9+\-*/%.()]+", expr):
+            return "Invalid characters in expression"
+        result = eval(expr, {"__builtins__": None}, {})
+        if isinstance(result, float) and result.is_integer():
+            return int(result)
+        return result
+    except ZeroDivisionError:
+        return "Division by zero is not allowed"
+    except Exception:
+        return "Invalid expression"
+
+
+def _soup(rng: random.Random) -> str:
+    while True:
+        text = "".join(rng.choice("0123456789+-*/%.() ") for _ in range(rng.randint(1, 12)))
+        if text.replace(" ", "").count("**") < 2:
+            return text  # no power towers: eval() could run for minutes on "(9**9**9)(1)"
+
+
+def _number(rng: random.Random) -> str:
+    kind = rng.random()
+    if kind < 0.5:
+        return str(rng.randint(0, 99))
+    if kind < 0.6:
+        return rng.choice(["0", "00", "007", "10", "1000000007", "99999999999999999999"])
+    if kind < 0.9:
+        return rng.choice(["{}.{}", "{}.", ".{}"]).format(rng.randint(0, 99), rng.randint(0, 99))
+    return rng.choice(["()", "...", "."])
+
+
+def _expression(rng: random.Random, depth: int = 0) -> str:
+    if depth > 3 or rng.random() < 0.3:
+        return _number(rng)
+    form = rng.random()
+    if form < 0.6:
+        op = rng.choice(["+", "-", "*", "/", "//", "%", "**", "*", "/"])
+        right = _expression(rng, depth + 1)
+        if op == "**":
+            right = str(rng.randint(-3, 12))  # keep eval() fast
+        return f"{_expression(rng, depth + 1)} {op} {right}"
+    if form < 0.75:
+        return f"({_expression(rng, depth + 1)})"
+    if form < 0.9:
+        return rng.choice(["-", "+", "--", "-+"]) + _expression(rng, depth + 1)
+    return f"{_expression(rng, depth + 1)}({rng.choice(['', _expression(rng, depth + 1)])})"
+
+
+def _same(a, b) -> bool:
+    return type(a) is type(b) and repr(a) == repr(b)
+
+
+class CalculatorMatchesEvalTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(20240610)
+        half = FUZZ_CASES // 2
+        cls.exprs = [_soup(rng) for _ in range(half)] + [_expression(rng) for _ in range(half)]
+        cls.results = [calculator.evaluate(e) for e in cls.exprs]
+
+    def test_fuzz_matches_eval(self):
+        mismatches = []
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", SyntaxWarning)  # "'int' object is not callable"
+            for expr, got in zip(self.exprs, self.results):
+                if got == calculator.TOO_LARGE:
+                    continue  # over the limits: eval() might run for minutes
+                expected = eval_reference(expr)
+                if not _same(got, expected):
+                    mismatches.append((expr, got, expected))
+        self.assertEqual(mismatches[:10], [], f"{len(mismatches)} of {len(self.exprs)} differ")
+
+    def test_evaluate_many_matches_evaluate(self):
+        batch = calculator.evaluate_many(self.exprs)
+        mismatches = [(e, b, r) for e, b, r in zip(self.exprs, batch, self.results) if not _same(b, r)]
+        self.assertEqual(mismatches[:10], [])
+
+    def test_evaluate_many_vectorized_groups(self):
+        # Large same-shaped groups take the NumPy path: overflow, zero
+        # divisors, huge literals and float rounding must still match
+        rng = random.Random(7)
+        shapes = ["{} * {} + {}", "({} - {}) / {}", "{} // {} % {}", "-{} * {}.5 - {}", "{} / {} * {}"]
+        exprs = []
+        for shape in shapes:
+            for _ in range(500):
+                numbers = [rng.choice([0, 1, 7, rng.randint(0, 10 ** 6), rng.randint(0, 10 ** 19), 2 ** 62])
+                           for _ in range(3)]
+                exprs.append(shape.format(*numbers))
+        batch = calculator.evaluate_many(exprs)
+        mismatches = [(e, b) for e, b in zip(exprs, batch) if not _same(b, calculator.evaluate(e))]
+        self.assertEqual(mismatches[:10], [])
+
+    def test_error_order(self):
+        # eval() evaluated the callee and the argument before failing on the call
+        self.assertEqual(calculator.evaluate("2(1/0)"), "Division by zero is not allowed")
+        self.assertEqual(calculator.evaluate("2(3)"), "Invalid expression")
+        self.assertEqual(calculator.evaluate("2(3)(1/0)"), "Invalid expression")
+
+    def test_limits(self):
+        self.assertEqual(calculator.evaluate("9**9**9"), calculator.TOO_LARGE)
+        self.assertEqual(calculator.evaluate("(" * 200 + "1" + ")" * 200), calculator.TOO_LARGE)
+        self.assertEqual(calculator.evaluate("*".join(["99999999999"] * 2000)), calculator.TOO_LARGE)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+# =======================================================================
+# DictionaryCache: TTLs, the disk tier, and falling back to memory
+# =======================================================================
+# Time is a fake clock (Clock below), so expiry is tested without sleeping.
+# =======================================================================
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from assistant.features import dictionary_cache
+from assistant.features.dictionary_cache import DictionaryCache
+
+
+class Clock:
+    """Stands in for the time module: time() returns `now`."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+class DictionaryCacheTests(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._dir.name, "cache", "dictionary.sqlite3")
+        self.clock = Clock()
+        patcher = mock.patch.object(dictionary_cache, "time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def test_found_meaning_lives_for_ttl(self):
+        cache = DictionaryCache(None, ttl=100, negative_ttl=10)
+        self.assertEqual(cache.get("apple"), (False, None))
+        cache.put("apple", "a fruit")
+
+        self.clock.now += 99
+        self.assertEqual(cache.get("apple"), (True, "a fruit"))
+        self.clock.now += 1
+        self.assertEqual(cache.get("apple"), (False, None))
+        self.assertEqual(cache.stats()["memory_size"], 0)  # the expired entry is dropped
+
+    def test_not_found_uses_the_shorter_negative_ttl(self):
+        cache = DictionaryCache(None, ttl=100, negative_ttl=10)
+        cache.put("asdfgh", None)
+
+        self.clock.now += 9
+        self.assertEqual(cache.get("asdfgh"), (True, None))
+        self.assertEqual(cache.stats()["negative_hits"], 1)
+        self.clock.now += 1
+        self.assertEqual(cache.get("asdfgh"), (False, None))
+
+    def test_memory_tier_evicts_least_recently_used(self):
+        cache = DictionaryCache(None, max_memory=2)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        cache.get("a")       # "b" is now the least recently used
+        cache.put("c", "3")
+        self.assertEqual([cache.get(w)[0] for w in ("a", "b", "c")], [True, False, True])
+
+    def test_disk_tier_is_shared_and_expires(self):
+        DictionaryCache(self.path, ttl=100).put("apple", "a fruit")
+
+        other = DictionaryCache(self.path, ttl=100)  # e.g. another worker, or after a restart
+        self.assertEqual(other.get("apple"), (True, "a fruit"))
+        self.assertEqual(other.stats()["disk_hits"], 1)
+        self.assertEqual(other.get("apple"), (True, "a fruit"))
+        self.assertEqual(other.stats()["memory_hits"], 1)
+
+        self.clock.now += 100
+        third = DictionaryCache(self.path, ttl=100)
+        self.assertEqual(third.get("apple"), (False, None))
+        self.assertEqual(third.purge_expired(), 1)
+
+    def test_unusable_disk_tier_falls_back_to_memory(self):
+        blocker = os.path.join(self._dir.name, "file")
+        with open(blocker, "w"):
+            pass
+        cache = DictionaryCache(os.path.join(blocker, "dictionary.sqlite3"))  # parent is a file
+
+        with self.assertLogs("assistant.features.dictionary_cache", "WARNING") as logs:
+            self.assertEqual(cache.get("apple"), (False, None))
+            cache.put("apple", "a fruit")
+            self.assertEqual(cache.get("apple"), (True, "a fruit"))
+            self.assertEqual(cache.purge_expired(), 0)
+        self.assertEqual(len(logs.records), 1)  # logged once, not on every lookup
+        self.assertGreaterEqual(cache.stats()["errors"], 2)
+
+    def test_disk_failure_during_use_never_changes_the_answer(self):
+        cache = DictionaryCache(self.path)
+        cache.put("apple", "a fruit")
+        cache._db().execute("DROP TABLE meanings")  # the file is damaged behind our back
+
+        with self.assertLogs("assistant.features.dictionary_cache", "WARNING"):
+            self.assertEqual(cache.get("apple"), (True, "a fruit"))   # memory tier
+            self.assertEqual(cache.get("banana"), (False, None))      # a miss, not an error
+            cache.put("banana", "a fruit too")
+        self.assertEqual(cache.get("banana"), (True, "a fruit too"))
+
+
+if __name__ == "__main__":
+    unittest.main()
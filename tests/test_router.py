@@ -0,0 +1,102 @@
+# =======================================================================
+# Router: priority order, keyword/probe skipping, unregister, async
+# =======================================================================
+# Every test builds its own Router, so the application's handlers (and
+# their order) do not matter here.
+# =======================================================================
+
+import asyncio
+import unittest
+
+from assistant.router import Message, Router
+
+
+def _message(text: str) -> Message:
+    return Message(text, text.lower().strip(), None, None)
+
+
+class RouterTests(unittest.TestCase):
+    def setUp(self):
+        self.router = Router()
+        self.ran = []  # names of the handlers that ran, in order
+
+    def _handler(self, name: str, reply=None):
+        def handler(msg):
+            self.ran.append(name)
+            return reply
+        return handler
+
+    def test_lower_priority_runs_first_and_first_answer_wins(self):
+        self.router.register("late", self._handler("late", "late"), priority=50)
+        self.router.register("early", self._handler("early"), priority=10)
+        self.router.register("middle", self._handler("middle", "middle"), priority=30)
+
+        self.assertEqual(self.router.names(), ["early", "middle", "late"])
+        self.assertEqual(self.router.dispatch(_message("hi")), ("middle", "middle"))
+        self.assertEqual(self.ran, ["early", "middle"])  # "late" never ran
+
+    def test_same_priority_keeps_registration_order(self):
+        self.router.register("a", self._handler("a"), priority=10)
+        self.router.register("b", self._handler("b"), priority=10)
+        self.assertEqual(self.router.names(), ["a", "b"])
+
+    def test_nobody_answers(self):
+        self.router.register("pass", self._handler("pass"))
+        self.assertEqual(self.router.dispatch(_message("hi")), (None, None))
+
+    def test_keywords_skip_handlers_for_other_first_words(self):
+        self.router.register("todo", self._handler("todo", "todo"), priority=10, keywords=("add", "show"))
+        self.router.register("any", self._handler("any", "any"), priority=20)
+
+        self.assertEqual(self.router.dispatch(_message("hello there")), ("any", "any"))
+        self.assertEqual(self.ran, ["any"])  # the todo handler was not even called
+        self.assertEqual(self.router.dispatch(_message("Show tasks")), ("todo", "todo"))
+
+    def test_false_probe_skips_the_handler(self):
+        has_digit = lambda msg: any(c.isdigit() for c in msg.text)  # noqa: E731
+        self.router.register("calc", self._handler("calc", "calc"), priority=10, probe=has_digit)
+        self.router.register("rest", self._handler("rest", "rest"), priority=20)
+
+        self.assertEqual(self.router.dispatch(_message("hello")), ("rest", "rest"))
+        self.assertEqual(self.ran, ["rest"])
+        self.assertEqual(self.router.dispatch(_message("2 + 2")), ("calc", "calc"))
+
+    def test_register_again_replaces_and_unregister_removes(self):
+        self.router.register("x", self._handler("old", "old"), priority=10, keywords=("go",))
+        self.router.register("x", self._handler("new", "new"), priority=10)
+        self.assertEqual(self.router.names(), ["x"])
+        self.assertEqual(self.router.dispatch(_message("hi")), ("x", "new"))
+
+        self.router.unregister("x")
+        self.assertEqual(self.router.names(), [])
+        self.assertEqual(self.router.dispatch(_message("go")), (None, None))
+
+    def test_dispatch_async_awaits_async_handlers(self):
+        async def slow(msg):
+            await asyncio.sleep(0)
+            self.ran.append("async")
+            return "async"
+
+        self.router.register("first", self._handler("first"), priority=10)
+        self.router.register("io", self._handler("sync", "sync"), priority=20, async_handler=slow)
+
+        self.assertEqual(asyncio.run(self.router.dispatch_async(_message("hi"))), ("io", "async"))
+        self.assertEqual(self.ran, ["first", "async"])  # handlers without an async version run inline
+        self.assertEqual(self.router.dispatch(_message("hi")), ("io", "sync"))
+
+    def test_instrumented_dispatch_observes_each_handler(self):
+        observed = []
+        self.router.register("pass", self._handler("pass"), priority=10)
+        self.router.register("answer", self._handler("answer", "yes"), priority=20)
+
+        self.router.instrument(lambda name, seconds, answered: observed.append((name, answered)))
+        self.assertEqual(self.router.dispatch(_message("hi")), ("answer", "yes"))
+        self.assertEqual(observed, [("pass", False), ("answer", True)])
+
+        self.router.instrument(None)
+        self.router.dispatch(_message("hi"))
+        self.assertEqual(len(observed), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+# =======================================================================
+# SingleFlight / AsyncSingleFlight: coalescing and error propagation
+# =======================================================================
+
+import asyncio
+import threading
+import unittest
+
+from assistant.features.singleflight import AsyncSingleFlight, SingleFlight
+
+
+class SingleFlightTests(unittest.TestCase):
+    def _run_concurrently(self, flight, key, fn, callers=10):
+        """Start `callers` threads on flight.do(key, fn) while fn is blocked; returns their outcomes."""
+        outcomes = [None] * callers
+        entered = threading.Event()
+        release = threading.Event()
+
+        def blocked():
+            entered.set()
+            release.wait(5)
+            return fn()
+
+        def call(i):
+            try:
+                outcomes[i] = ("ok", flight.do(key, blocked))
+            except Exception as exc:
+                outcomes[i] = ("error", exc)
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(callers)]
+        threads[0].start()
+        entered.wait(5)  # the leader is inside the call
+        for thread in threads[1:]:
+            thread.start()
+        while flight.coalesced < callers - 1:  # every follower is waiting
+            threading.Event().wait(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+        return outcomes
+
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight()
+        runs = []
+        outcomes = self._run_concurrently(flight, "apple", lambda: runs.append(1) or "a fruit")
+
+        self.assertEqual(outcomes, [("ok", "a fruit")] * 10)
+        self.assertEqual(len(runs), 1)
+        self.assertEqual(flight.stats(), {"calls": 1, "coalesced": 9})
+
+    def test_every_caller_gets_the_exception(self):
+        error = ValueError("API down")
+
+        def fail():
+            raise error
+
+        flight = SingleFlight()
+        outcomes = self._run_concurrently(flight, "apple", fail)
+        self.assertEqual(outcomes, [("error", error)] * 10)
+
+        # The failed call is forgotten: the next caller runs it again
+        self.assertEqual(flight.do("apple", lambda: "a fruit"), "a fruit")
+        self.assertEqual(flight.calls, 2)
+
+    def test_different_keys_do_not_wait_for_each_other(self):
+        flight = SingleFlight()
+        self.assertEqual(flight.do("a", lambda: flight.do("b", lambda: "inner")), "inner")
+        self.assertEqual(flight.stats(), {"calls": 2, "coalesced": 0})
+
+
+class AsyncSingleFlightTests(unittest.TestCase):
+    def test_concurrent_coroutines_share_one_task(self):
+        flight = AsyncSingleFlight()
+        runs = []
+
+        async def fetch(word):
+            runs.append(word)
+            await asyncio.sleep(0.01)
+            return word.upper()
+
+        async def main():
+            return await asyncio.gather(*(flight.do("k", fetch, "apple") for _ in range(10)))
+
+        self.assertEqual(asyncio.run(main()), ["APPLE"] * 10)
+        self.assertEqual(runs, ["apple"])
+        self.assertEqual(flight.stats(), {"calls": 1, "coalesced": 9})
+
+    def test_every_waiter_gets_the_exception(self):
+        flight = AsyncSingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("API down")
+
+        async def main():
+            return await asyncio.gather(*(flight.do("k", fail) for _ in range(5)), return_exceptions=True)
+
+        results = asyncio.run(main())
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+        self.assertIs(results[0], results[4])  # one shared call, one exception
+        self.assertEqual(flight._calls, {})
+
+    def test_cancelling_one_waiter_does_not_cancel_the_call(self):
+        flight = AsyncSingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        async def main():
+            first = asyncio.ensure_future(flight.do("k", fetch))
+            second = asyncio.ensure_future(flight.do("k", fetch))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second, first.cancelled()
+
+        self.assertEqual(asyncio.run(main()), ("done", True))
+        self.assertEqual(flight.calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+# =======================================================================
+# Todo storage: journal replay, torn writes, group commit, migrations,
+# SQLite limits
+# =======================================================================
+# Every test works in its own temporary directory. A "restart" is a new
+# TaskJournal (or backend) on the same files.
+# =======================================================================
+
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from assistant.features import todo
+from assistant.features.todo_journal import TaskJournal
+from assistant.features.todo_sqlite import SQLiteTaskBackend
+
+
+def _task(task_id: int, title: str, status: str = "pending") -> dict:
+    return {"id": task_id, "title": title, "status": status, "created_at": "2025-01-01T00:00:00"}
+
+
+class JournalTests(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.dir = self._dir.name
+        self.path = os.path.join(self.dir, "tasks.ndjson")
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def _write(self, journal: TaskJournal, *records):
+        for record in records:
+            journal.commit(journal.append(record))
+
+    def test_replay_after_restart(self):
+        journal = TaskJournal(self.path, window=0)
+        self.assertEqual(journal.load(), ([], 1))
+        self._write(
+            journal,
+            {"op": "add", "task": _task(1, "a")},
+            {"op": "add", "task": _task(2, "b")},
+            {"op": "status", "id": 1, "status": "done"},
+            {"op": "remove", "id": 2},
+        )
+        journal.close()
+
+        reopened = TaskJournal(self.path, window=0)
+        tasks, next_id = reopened.load()
+        self.assertEqual(tasks, [_task(1, "a", "done")])
+        self.assertEqual(next_id, 3)  # the removed id 2 is not handed out again
+        self.assertEqual(reopened.records, 4)
+
+    def test_torn_last_record_is_dropped(self):
+        journal = TaskJournal(self.path, window=0)
+        journal.load()
+        self._write(journal, {"op": "add", "task": _task(1, "a")})
+        journal.close()
+        with open(self.path + ".journal", "ab") as f:
+            f.write(b'{"op":"add","task":{"id":2,"ti')  # crash in the middle of a write
+
+        with self.assertLogs("assistant.features.todo_journal", "WARNING"):
+            tasks, next_id = TaskJournal(self.path, window=0).load()
+        self.assertEqual(tasks, [_task(1, "a")])
+        self.assertEqual(next_id, 2)
+        with open(self.path + ".journal", "rb") as f:
+            self.assertTrue(f.read().endswith(b"}\n"))  # new records are not glued to the torn one
+
+    def test_group_commit_batches_fsyncs(self):
+        journal = TaskJournal(self.path, window=0.05)
+        journal.load()
+        start = threading.Barrier(20)
+
+        def add(i):
+            start.wait()
+            journal.commit(journal.append({"op": "add", "task": _task(i, "task %d" % i)}))
+
+        threads = [threading.Thread(target=add, args=(i,)) for i in range(1, 21)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        journal.close()
+
+        stats = journal.stats()
+        self.assertEqual(stats["durable"], 20)
+        self.assertLess(stats["commits"], 20)
+        tasks, next_id = TaskJournal(self.path, window=0).load()
+        self.assertEqual(sorted(t["id"] for t in tasks), list(range(1, 21)))
+        self.assertEqual(next_id, 21)
+
+    def test_compaction_empties_the_journal(self):
+        journal = TaskJournal(self.path, window=0)
+        journal.load()
+        self._write(journal, {"op": "add", "task": _task(1, "a")}, {"op": "remove", "id": 1})
+        journal.compact([], 2)
+        self.assertEqual(os.path.getsize(self.path + ".journal"), 0)
+        journal.close()
+        self.assertEqual(TaskJournal(self.path, window=0).load(), ([], 2))
+
+    def test_legacy_file_is_merged_into_an_existing_snapshot(self):
+        TaskJournal(self.path, window=0).compact([_task(4, "a")], 5)
+        legacy = os.path.join(self.dir, "tasks.json")
+        with open(legacy, "w", encoding="utf-8") as f:
+            json.dump([_task(1, "A"), _task(2, "b")], f)
+
+        tasks, next_id = TaskJournal(self.path, window=0, legacy_path=legacy).load()
+        self.assertEqual([(t["id"], t["title"]) for t in tasks], [(4, "a"), (5, "b")])
+        self.assertEqual(next_id, 6)
+        self.assertFalse(os.path.exists(legacy))
+        self.assertTrue(os.path.exists(legacy + ".migrated"))
+
+
+class SQLiteImportTests(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.dir = self._dir.name
+        env = {"AVA_DATA_DIR": self.dir, "AVA_TODO_BACKEND": "sqlite"}
+        patcher = mock.patch.dict(os.environ, env)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def test_removed_tasks_stay_removed_after_restart(self):
+        TaskJournal(os.path.join(self.dir, todo.TODO_FILE), window=0).compact([_task(1, "a"), _task(2, "b")], 3)
+
+        backend = todo._create_backend()
+        self.assertEqual(len(backend), 2)
+        for task in backend.tasks():
+            backend.remove(task["id"])
+
+        reloaded = todo._create_backend()
+        self.assertEqual(len(reloaded), 0)  # the JSON file is not imported again
+        self.assertEqual(reloaded.add("c", "2025-01-01T00:00:00")["id"], 3)
+
+
+class SQLiteLimitsTests(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.backend = SQLiteTaskBackend(os.path.join(self._dir.name, "tasks.sqlite3"))
+        self.backend.add("a", "2025-01-01T00:00:00")
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def test_ids_past_sqlite_integer_are_not_found(self):
+        # 2**63 does not fit an SQLite INTEGER: binding it would raise OverflowError
+        for task_id in (2**63, 99999999999999999999, 0, -1):
+            self.assertIsNone(self.backend.remove(task_id))
+            self.assertIsNone(self.backend.set_status(task_id, "done"))
+        self.assertEqual(len(self.backend), 1)
+
+    def test_huge_cursor_and_offset_give_an_empty_page(self):
+        self.assertEqual(self.backend.page(after=2**63), ([], False))
+        self.assertEqual(self.backend.page(offset=99999999999999999999), ([], False))
+        self.assertEqual(self.backend.page(limit=2**64)[0][0]["title"], "a")
+
+    def test_todo_commands_answer_instead_of_failing(self):
+        todo.set_backend(self.backend)
+        self.addCleanup(todo.set_backend, None)
+        self.assertEqual(todo.mark_done(99999999999999999999), "Task not found")
+        self.assertEqual(todo.remove_task(99999999999999999999), "Task not found")
+        page = todo.get_tasks_page(after=99999999999999999999)
+        self.assertEqual(page, {"tasks": [], "next": None})
+
+
+if __name__ == "__main__":
+    unittest.main()